@@ -33,6 +33,9 @@ app.get("/health", (_req, res) => {
 // Serve only approved folders
 mount("/latest", path.join(ROOT, "latest"));
 mount("/series", path.join(ROOT, "series"));
+mount("/rollups", path.join(ROOT, "rollups"));
+mount("/tail", path.join(ROOT, "tail"));
+mount("/status", path.join(ROOT, "status"));
 mount("/configs", path.join(ROOT, "configs"));
 mount("/scripts", path.join(ROOT, "scripts"));
 mount("/prompts", path.join(ROOT, "prompts"));
@@ -6,7 +6,7 @@ import { resolveMetricValue } from "../../methods/statusLogic";
 import { metricStatus } from "../../types/alerts";
 import { reduceByDecimals, extractLatestValue } from "../../methods/utils";
 import { MetricConfigBasic } from "../../types/metric";
-import { fetchConfig, fetchLatest } from "../../methods/fetch";
+import { fetchConfig, fetchLatestEntry } from "../../methods/fetch";
 import { StatusIcon } from "../status-icons";
 import { useLayout } from "../../styles/StyleWrapper";
 
@@ -18,6 +18,7 @@ const Tile: React.FC<TileProps> = ({ to, metric, latestValue }) => {
     MetricConfigBasic | undefined
   >(metric);
   const [liveLatestValue, setLiveLatestValue] = React.useState<any>(latestValue);
+  const [isStale, setIsStale] = React.useState(false);
 
   React.useEffect(() => {
     if (!metricId) return;
@@ -26,9 +27,9 @@ const Tile: React.FC<TileProps> = ({ to, metric, latestValue }) => {
 
     (async () => {
       try {
-        const [m, latest] = await Promise.all([
+        const [m, { latest, stale }] = await Promise.all([
           fetchConfig(metricId, controller.signal),
-          fetchLatest(metricId, controller.signal),
+          fetchLatestEntry(metricId, controller.signal),
         ]);
 
         if (m && m.metric_id !== undefined) {
@@ -41,6 +42,7 @@ const Tile: React.FC<TileProps> = ({ to, metric, latestValue }) => {
           const v = extractLatestValue(latest);
           if (v !== null && typeof v !== "undefined") {
             setLiveLatestValue(v);
+            setIsStale(stale);
           }
         }
       } catch (e: any) {
@@ -54,10 +56,12 @@ const Tile: React.FC<TileProps> = ({ to, metric, latestValue }) => {
   }, [metricId]);
 
   const isEmpty = !liveMetric;
-  const { interpretedLatestValue, status } = resolveMetricValue(
+  const { interpretedLatestValue, status: valueStatus } = resolveMetricValue(
     liveMetric,
     liveLatestValue
   );
+  // A value that has not been refreshed on schedule is only shown as ok-but-stale
+  const status = isStale && valueStatus === "ok" ? "stale" : valueStatus;
 
   const { tilesCollapsed } = useLayout();
   const shouldCollapse = !isEmpty && tilesCollapsed && status === "ok";
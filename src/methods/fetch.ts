@@ -1,11 +1,12 @@
 // src/methods/fetch.ts
 import { MetricConfig } from "../types/metric";
-import { SeriesNode } from "../types/nodes";
+import { NumberPoint, SeriesNode, StringPoint } from "../types/nodes";
+import { metricStatus } from "../types/alerts";
 
 export async function fetchJson<T>(url: string, signal?: AbortSignal): Promise<T> {
   const res = await fetch(url, {
     signal,
-    cache: "no-store",
+    cache: "no-cache", // revalidate with ETag; unchanged files come back as 304
     headers: { Accept: "application/json" },
   });
 
@@ -35,4 +36,159 @@ export function fetchLatest(metricId: string, signal?: AbortSignal) {
     `/latest/${encodeURIComponent(metricId)}.json`,
     signal
   );
-}
\ No newline at end of file
+}
+
+export type LatestSnapshotEntry = {
+  point: NumberPoint | StringPoint;
+  status: metricStatus;
+  schedule?: string;
+  stale_after?: string | null;
+  stale: boolean;
+};
+
+export type LatestSnapshot = {
+  generated_at: string | null;
+  metrics: Record<string, LatestSnapshotEntry>;
+};
+
+// Tiles rendered together share one request for the snapshot
+let snapshotRequest: Promise<LatestSnapshot> | null = null;
+
+export function fetchLatestSnapshot(): Promise<LatestSnapshot> {
+  if (!snapshotRequest) {
+    snapshotRequest = fetchJson<LatestSnapshot>("/status/latest.json").finally(() => {
+      setTimeout(() => {
+        snapshotRequest = null;
+      }, 1000);
+    });
+  }
+  return snapshotRequest;
+}
+
+/**
+ * Latest point of one metric from the shared snapshot, with its staleness.
+ * Falls back to /latest/<id>.json when the metric is not in the snapshot.
+ */
+export async function fetchLatestEntry(
+  metricId: string,
+  signal?: AbortSignal
+): Promise<{ latest: SeriesNode; stale: boolean }> {
+  try {
+    const entry = (await fetchLatestSnapshot()).metrics[metricId];
+    if (entry) {
+      return { latest: { metric_id: metricId, points: [entry.point] } as SeriesNode, stale: entry.stale };
+    }
+  } catch {
+    // fall through to the per-metric file
+  }
+  return { latest: await fetchLatest(metricId, signal), stale: false };
+}
+
+/**
+ * Last points of a metric (at least its visual's nLatestPoints), kept by the
+ * runner in /tail/. Falls back to the full series for metrics without a tail yet.
+ */
+export function fetchTail(metricId: string, signal?: AbortSignal) {
+  return fetchJson<SeriesNode>(
+    `/tail/${encodeURIComponent(metricId)}.json`,
+    signal
+  ).catch((e) => {
+    if (e?.name === "AbortError") throw e;
+    return fetchSeries(metricId, signal);
+  });
+}
+
+export type RunStatus = "ok" | "error" | "retry" | "timeout" | "failed";
+
+export type RunRecord = {
+  id: number;
+  started: string;
+  ended: string | null;
+  duration_ms: number | null;
+  exit: number | null;
+  attempt: number;
+  status: RunStatus;
+  source: "scheduler" | "runner";
+  output?: string | null;
+};
+
+export type RunHistory = {
+  metric_id: string;
+  generated_at: string;
+  runs: RunRecord[];
+  failures: RunRecord[];
+};
+
+/**
+ * Recent runs of a metric and its last failures (with their output tail),
+ * published by the scheduler from its run history.
+ */
+export function fetchRuns(metricId: string, signal?: AbortSignal) {
+  return fetchJson<RunHistory>(
+    `/status/runs/${encodeURIComponent(metricId)}.json`,
+    signal
+  );
+}
+
+export type ScheduleJob = {
+  metric_id: string;
+  label: string;
+  schedule: string;
+  next_run: string;
+  last_run: string | null;
+  last_exit: number | null;
+  last_duration_ms: number | null;
+  running: boolean;
+  retry_at: string | null;
+  attempt: number;
+  priority: number;
+  phase_s: number | null;
+};
+
+export type Schedule = {
+  generated_at: string;
+  workers: { max: number; budget: number; under_pressure: boolean; max_starts_per_sec: number };
+  ready: {
+    depth: number;
+    depth_max: number;
+    oldest_wait_ms: number;
+    wait_p50_ms: number | null;
+    wait_max_ms: number | null;
+  };
+  jobs: ScheduleJob[];
+};
+
+/** The scheduler's current schedule, rewritten only when a job changed. */
+export function fetchSchedule(signal?: AbortSignal) {
+  return fetchJson<Schedule>("/status/schedule.json", signal);
+}
+
+export type RollupTier = "raw" | "5m" | "1h" | "1d";
+
+// Bucket width per tier, coarsest last
+const ROLLUP_TIER_MS: [RollupTier, number][] = [
+  ["raw", 0],
+  ["5m", 5 * 60 * 1000],
+  ["1h", 60 * 60 * 1000],
+  ["1d", 24 * 60 * 60 * 1000],
+];
+
+/**
+ * Finest tier that still draws a time range with at most maxPoints buckets.
+ * "raw" is only chosen when the metric runs often enough to fit as-is.
+ */
+export function pickRollupTier(rangeMs: number, maxPoints = 500, rawIntervalMs = 60 * 1000): RollupTier {
+  for (const [tier, bucketMs] of ROLLUP_TIER_MS) {
+    const width = tier === "raw" ? rawIntervalMs : bucketMs;
+    if (rangeMs / width <= maxPoints) return tier;
+  }
+  return "1d";
+}
+
+export function fetchRollup(metricId: string, tier: RollupTier, signal?: AbortSignal) {
+  if (tier === "raw") return fetchSeries(metricId, signal);
+  return fetchJson<SeriesNode>(
+    `/rollups/${encodeURIComponent(metricId)}/${tier}.json`,
+    signal
+  );
+}
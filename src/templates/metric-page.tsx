@@ -10,7 +10,7 @@ import TextContainer from "../styles/PageWrapper";
 import CodeBlock from "../components/CodeBlock";
 import Collapsible from "../components/Collapsible/Collapsible";
 import VisualLoose from "../components/Visuals/Visuals";
-import { fetchConfig, fetchSeries } from "../methods/fetch";
+import { fetchConfig, fetchRuns, fetchSeries, fetchTail, RunHistory, RunRecord } from "../methods/fetch";
 import { extractLatestValue } from "../methods/utils";
 import { StatusIcon } from "../components/status-icons";
 
@@ -33,7 +33,22 @@ type MetricPageContext = {
   metric_id: string;
 };
 
-type SectionType = "config" | "script" | "latest";
+type SectionType = "config" | "script" | "latest" | "runs";
+
+function formatDuration(ms: number | null): string {
+  if (ms == null) return "–";
+  return ms < 1000 ? `${ms} ms` : `${(ms / 1000).toFixed(1)} s`;
+}
+
+const RunRow: React.FC<{ run: RunRecord }> = ({ run }) => (
+  <tr>
+    <td>{new Date(run.started).toLocaleString()}</td>
+    <td>{run.status}</td>
+    <td>{run.exit ?? "–"}</td>
+    <td>{formatDuration(run.duration_ms)}</td>
+    <td>{run.attempt ? `retry ${run.attempt}` : ""}</td>
+  </tr>
+);
 
 const MetricPage: React.FC<PageProps<MetricPageData, MetricPageContext>> = ({ data }) => {
   const { metric, allMetricLatest, allMetricSeries, allScripts } = data;
@@ -65,7 +80,12 @@ const MetricPage: React.FC<PageProps<MetricPageData, MetricPageContext>> = ({ da
       try {
         const [cfg, series] = await Promise.all([
           fetchConfig(metricId, controller.signal),
-          fetchSeries(metricId, controller.signal),
+          // most visuals only show the latest points, so the tail is enough;
+          // the version visual dates each version from its first sighting in
+          // the whole history
+          metricNode.display?.visual?.type === "version"
+            ? fetchSeries(metricId, controller.signal)
+            : fetchTail(metricId, controller.signal),
         ]);
 
         // Update config (keep parent/name from baked node so existing joins keep working)
@@ -135,6 +155,21 @@ const MetricPage: React.FC<PageProps<MetricPageData, MetricPageContext>> = ({ da
     };
   }, [visibleSection, scriptFile?.publicURL]);
 
+  const [runHistory, setRunHistory] = React.useState<RunHistory | null>(null);
+  const [runsError, setRunsError] = React.useState<string | null>(null);
+
+  React.useEffect(() => {
+    if (visibleSection !== "runs") return;
+    const controller = new AbortController();
+    setRunsError(null);
+    fetchRuns(metricNode.metric_id, controller.signal)
+      .then(setRunHistory)
+      .catch((e: any) => {
+        if (e?.name !== "AbortError") setRunsError(e?.message ?? "Failed to load runs");
+      });
+    return () => controller.abort();
+  }, [visibleSection, metricNode.metric_id]);
+
   const visual = liveMetric.display?.visual;
   return (
     <StyleWrapper>
@@ -206,6 +241,48 @@ const MetricPage: React.FC<PageProps<MetricPageData, MetricPageContext>> = ({ da
           <p>No latest data found for this metric.</p>
         )}
       </Collapsible>
+
+      <Collapsible
+        id="section-runs"
+        title="Recent Runs"
+        open={visibleSection === "runs"}
+        onToggle={() => toggleVisibleSection("runs")}
+      >
+        {runsError ? (
+          <p>No run history yet ({runsError}).</p>
+        ) : runHistory == null ? (
+          <p>Loading runs…</p>
+        ) : (
+          <>
+            <table>
+              <thead>
+                <tr>
+                  <th>Started</th>
+                  <th>Status</th>
+                  <th>Exit</th>
+                  <th>Duration</th>
+                  <th />
+                </tr>
+              </thead>
+              <tbody>
+                {runHistory.runs.map((run) => (
+                  <RunRow key={run.id} run={run} />
+                ))}
+              </tbody>
+            </table>
+            {runHistory.failures.slice(0, 3).map((run) =>
+              run.output ? (
+                <React.Fragment key={run.id}>
+                  <p>
+                    Output of the {run.status} run at {new Date(run.started).toLocaleString()}:
+                  </p>
+                  <CodeBlock code={run.output} lang={undefined} />
+                </React.Fragment>
+              ) : null
+            )}
+          </>
+        )}
+      </Collapsible>
     </StyleWrapper>
   );
 };
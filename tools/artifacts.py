@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+artifacts.py
+
+Precompressed, ETag-stamped copies of the public JSON artifacts under
+content/latest, content/series, content/rollups, content/tail and content/status:
+
+  content/series/foo_bar_baz.json      as before (read by Gatsby and the JSON server)
+  content/series/foo_bar_baz.json.gz   compact JSON, gzip
+  content/series/foo_bar_baz.json.br   compact JSON, brotli (only if the brotli module is installed)
+
+Every publish records a content hash of the .json file in one manifest:
+
+  content/store/etags.json
+  {"series/foo_bar_baz.json": {"etag": "<hash>", "mtime_ns": ..., "bytes": ..., "gz": ..., "br": ...}}
+
+tools.static_server answers conditional and range requests from it. The
+manifest is updated under an flock, once per group commit, so concurrent
+runners never drop each other's entries.
+
+The full series files (content/series/) are rewritten on every append, so
+their siblings are not refreshed then: that would cost O(history) compression
+per point. `python3 -m tools.export_series` publishes them (publish_file).
+Until then a sibling older than its .json file is stale, and tools.static_server
+serves the plain file instead.
+
+Set DASH_PRECOMPRESS=0 to publish plain .json files only.
+
+Import:
+  from tools.artifacts import publish_json
+  publish_json(path, {"metric_id": "foo_bar_baz", "points": [...]})
+"""
+import fcntl
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tools.group_commit import active as active_group
+from tools.group_commit import write_atomic
+
+try:
+    import brotli
+except ImportError:  # optional: only .gz siblings are published
+    brotli = None
+
+ROOT = Path(__file__).resolve().parents[1]
+
+PRECOMPRESS = os.environ.get("DASH_PRECOMPRESS", "1") == "1"
+# Close to the best ratio for JSON at a fraction of the cost of gzip 9 / brotli 11
+GZIP_LEVEL = int(os.environ.get("DASH_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.environ.get("DASH_BROTLI_QUALITY", "5"))
+
+# content/ sub-directories whose .json files get siblings and manifest entries
+PUBLIC_DIRS = ("latest", "series", "rollups", "tail", "status")
+
+ENCODINGS = ("br", "gz")
+
+_HASH_CHARS = 20
+_READ_CHUNK_BYTES = 256 * 1024
+
+# root -> {manifest key -> entry}, waiting for the group commit to land
+_PENDING: Dict[Path, Dict[str, dict]] = {}
+
+
+def manifest_path(*, root: Path = ROOT) -> Path:
+    return root / "content" / "store" / "etags.json"
+
+
+def artifact_key(path: Path, *, root: Path = ROOT) -> Optional[str]:
+    """Manifest key ("series/foo.json") of a public artifact, or None."""
+    try:
+        rel = path.relative_to(root / "content")
+    except ValueError:
+        return None
+    if rel.parts[0] not in PUBLIC_DIRS or path.suffix != ".json":
+        return None
+    return rel.as_posix()
+
+
+def sibling_path(path: Path, encoding: str) -> Path:
+    return path.with_name(f"{path.name}.{encoding}")
+
+
+def compress(data: bytes) -> Dict[str, bytes]:
+    """Encoded variants of data; mtime=0 keeps gzip output stable across runs."""
+    out = {"gz": gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        out["br"] = brotli.compress(data, quality=BROTLI_QUALITY)
+    return out
+
+
+def _etag(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:_HASH_CHARS]
+
+
+def _note(path: Path, entry: dict, root: Path) -> None:
+    key = artifact_key(path, root=root)
+    if key is None:
+        return
+    group = active_group()
+    if group is None:
+        _update_manifest({key: entry}, root=root)
+        return
+    _PENDING.setdefault(root, {})[key] = entry
+    group.after_commit(f"etags:{root}", lambda: _flush_pending(root))
+
+
+def publish_json(
+    path: Path,
+    obj: object,
+    *,
+    indent: Optional[int] = 2,
+    root: Path = ROOT,
+    siblings: bool = True,
+) -> None:
+    """
+    Write obj to path (atomically, inside the active group commit if any) and
+    publish its compressed siblings and ETag. With siblings=False only the
+    file is written; publish_file() catches the siblings up later.
+    """
+    text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"), indent=indent)
+    data = text.encode("utf-8")
+    write_atomic(path, data)
+    if not siblings or not PRECOMPRESS or artifact_key(path, root=root) is None:
+        return
+
+    compact = data if indent is None else json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    entry = {"etag": _etag(data), "bytes": len(data)}
+    for encoding, blob in compress(compact).items():
+        write_atomic(sibling_path(path, encoding), blob)
+        entry[encoding] = len(blob)
+    _note(path, entry, root)
+
+
+def publish_file(path: Path, *, root: Path = ROOT) -> None:
+    """
+    Publish siblings and ETag for a file that was already written in place
+    (e.g. a streamed export). The file is compressed as-is, chunk by chunk.
+    """
+    if not PRECOMPRESS or artifact_key(path, root=root) is None:
+        return
+    digest = hashlib.sha256()
+    size = 0
+    entry: dict = {}
+    gz_tmp = sibling_path(path, "gz.tmp")
+    br_tmp = sibling_path(path, "br.tmp")
+    br = brotli.Compressor(quality=BROTLI_QUALITY) if brotli is not None else None
+    with path.open("rb") as src, gzip.GzipFile(gz_tmp, "wb", compresslevel=GZIP_LEVEL, mtime=0) as gz:
+        br_out = br_tmp.open("wb") if br is not None else None
+        try:
+            for chunk in iter(lambda: src.read(_READ_CHUNK_BYTES), b""):
+                digest.update(chunk)
+                size += len(chunk)
+                gz.write(chunk)
+                if br_out is not None:
+                    br_out.write(br.process(chunk))
+            if br_out is not None:
+                br_out.write(br.finish())
+        finally:
+            if br_out is not None:
+                br_out.close()
+    for encoding, tmp in (("gz", gz_tmp), ("br", br_tmp)):
+        if tmp.exists():
+            os.replace(tmp, sibling_path(path, encoding))
+            entry[encoding] = sibling_path(path, encoding).stat().st_size
+    entry.update(etag=digest.hexdigest()[:_HASH_CHARS], bytes=size)
+    _note(path, entry, root)
+
+
+def read_manifest(*, root: Path = ROOT) -> Dict[str, dict]:
+    try:
+        return json.loads(manifest_path(root=root).read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+
+def _flush_pending(root: Path) -> None:
+    entries = _PENDING.pop(root, {})
+    if entries:
+        _update_manifest(entries, root=root)
+
+
+def _update_manifest(entries: Dict[str, Optional[dict]], *, root: Path = ROOT) -> None:
+    """
+    Merge entries into the manifest (None removes a key). Runs after the files
+    are in place, so mtime_ns is the published file's.
+    """
+    path = manifest_path(root=root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.with_suffix(".lock").open("a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        manifest = read_manifest(root=root)
+        for key, entry in entries.items():
+            if entry is None:
+                manifest.pop(key, None)
+                continue
+            try:
+                entry["mtime_ns"] = (root / "content" / key).stat().st_mtime_ns
+            except FileNotFoundError:
+                manifest.pop(key, None)
+                continue
+            manifest[key] = entry
+        # Written directly: this runs after (or outside) the group commit and
+        # must land before the lock is released.
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(manifest, ensure_ascii=False, separators=(",", ":"), sort_keys=True), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+def remove_artifacts(paths: List[Path], *, root: Path = ROOT) -> List[Path]:
+    """Delete the siblings of paths and drop their manifest entries."""
+    deleted: List[Path] = []
+    gone: Dict[str, Optional[dict]] = {}
+    for path in paths:
+        for encoding in ENCODINGS:
+            sibling = sibling_path(path, encoding)
+            if sibling.exists():
+                sibling.unlink()
+                deleted.append(sibling)
+        key = artifact_key(path, root=root)
+        if key is not None:
+            gone[key] = None
+    if gone and manifest_path(root=root).exists():
+        _update_manifest(gone, root=root)
+    return deleted
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+config_watch.py
+
+Reports which metric configs in content/configs/ changed, so the scheduler
+can reload just those files instead of re-parsing the whole directory.
+
+Two modes:
+- inotify (Linux, via ctypes): the watcher exposes a file descriptor that
+  becomes readable when a config is written, renamed or deleted; changes are
+  seen within milliseconds and an idle directory costs nothing.
+- polling (fallback, or DASH_CONFIG_WATCH=poll): poll() stats the *.json files
+  and reports those whose mtime or size changed since the previous poll.
+
+Either way, changes() returns the metric_ids to reload, or None when the
+watcher lost track (queue overflow, directory replaced) and the caller should
+do a full scan.
+
+Import:
+  from tools.config_watch import ConfigWatcher
+  watcher = ConfigWatcher(Path("content/configs"))
+  changed = watcher.changes()   # {"foo_bar_baz", ...}, or None for "rescan everything"
+"""
+import ctypes
+import ctypes.util
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+WATCH_MODE = os.environ.get("DASH_CONFIG_WATCH", "auto")  # auto | inotify | poll
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+_LOST_TRACK = IN_Q_OVERFLOW | IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+_READ_BYTES = 64 * 1024
+
+
+def _load_libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1  # noqa: B018 - raises AttributeError when missing
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+def _metric_id(name: str) -> Optional[str]:
+    """metric_id for a config file name, or None for temp/hidden/other files."""
+    if name.startswith(".") or not name.endswith(".json"):
+        return None
+    return name[: -len(".json")]
+
+
+class ConfigWatcher:
+    def __init__(self, directory: Path, *, mode: str = WATCH_MODE) -> None:
+        self.directory = directory
+        self._fd: Optional[int] = None
+        self._signatures: Dict[str, Tuple[int, int]] = {}
+        if mode != "poll":
+            self._fd = self._open_inotify()
+            if self._fd is None and mode == "inotify":
+                raise OSError(f"inotify is not available for {directory}")
+        if self._fd is None:
+            self._signatures = self._stat_all()
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._fd is not None else "poll"
+
+    def fileno(self) -> Optional[int]:
+        """inotify descriptor to wait on, or None in polling mode."""
+        return self._fd
+
+    def _open_inotify(self) -> Optional[int]:
+        libc = _load_libc()
+        if libc is None:
+            return None
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, os.fsencode(str(self.directory)), _WATCH_MASK) < 0:
+            os.close(fd)
+            return None
+        return fd
+
+    def _stat_all(self) -> Dict[str, Tuple[int, int]]:
+        signatures: Dict[str, Tuple[int, int]] = {}
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return signatures
+        for entry in entries:
+            metric_id = _metric_id(entry.name)
+            if metric_id is None:
+                continue
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            signatures[metric_id] = (st.st_mtime_ns, st.st_size)
+        return signatures
+
+    def _read_inotify(self) -> Optional[Set[str]]:
+        changed: Set[str] = set()
+        lost = False
+        while True:
+            try:
+                buf = os.read(self._fd, _READ_BYTES)
+            except BlockingIOError:
+                break
+            if not buf:
+                break
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(buf):
+                _, mask, _, length = _EVENT_HEADER.unpack_from(buf, offset)
+                offset += _EVENT_HEADER.size
+                name = buf[offset : offset + length].split(b"\0", 1)[0].decode("utf-8", "surrogateescape")
+                offset += length
+                if mask & _LOST_TRACK:
+                    lost = True
+                    continue
+                metric_id = _metric_id(name)
+                if metric_id is not None:
+                    changed.add(metric_id)
+        if lost:
+            # The watch is gone (directory replaced) or events were dropped:
+            # start over and let the caller rescan everything.
+            os.close(self._fd)
+            self._fd = self._open_inotify()
+            if self._fd is None:
+                self._signatures = self._stat_all()
+            return None
+        return changed
+
+    def poll(self) -> Set[str]:
+        """Polling mode: metric_ids whose config appeared, changed or vanished."""
+        current = self._stat_all()
+        changed = {m for m in current.keys() | self._signatures.keys() if current.get(m) != self._signatures.get(m)}
+        self._signatures = current
+        return changed
+
+    def changes(self) -> Optional[Set[str]]:
+        """Changed metric_ids since the last call; None means "rescan everything"."""
+        if self._fd is not None:
+            return self._read_inotify()
+        return self.poll()
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
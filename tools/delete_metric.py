@@ -1,9 +1,26 @@
 #!/usr/bin/env python3
 import json
 import sys
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))  # also support `python tools/delete_metric.py`
+
+from tools.artifacts import ENCODINGS, remove_artifacts, sibling_path  # noqa: E402
+from tools.rollups import TIERS, tier_path  # noqa: E402
+from tools.run_history import RunHistory  # noqa: E402
+from tools.run_resources import ResourceLedger  # noqa: E402
+from tools.series_store import BACKENDS, get_backend  # noqa: E402
+from tools.state_index import state_path  # noqa: E402
+from tools.status_snapshot import remove_from_snapshot  # noqa: E402
+from tools.tail import tail_path  # noqa: E402
+
+PREVIEW_DAYS = 7
+PREVIEW_POINTS = 20
+
 
 def read_json(path: Path) -> Any:
     return json.loads(path.read_text(encoding="utf-8"))
@@ -22,7 +39,7 @@ def safe_unlink(path: Path) -> bool:
 
 def main() -> None:
     if len(sys.argv) != 2:
-        print("Usage: python delete_metric.py <metric_id>")
+        print("Usage: python3 tools/delete_metric.py <metric_id>  (or: python3 -m tools.delete_metric <metric_id>)")
         raise SystemExit(2)
 
     metric_id = sys.argv[1].strip()
@@ -30,22 +47,25 @@ def main() -> None:
         print("ERROR: metric_id is empty")
         raise SystemExit(2)
 
-    ROOT = Path(__file__).resolve().parents[1]
-    
     scripts_path = ROOT / "content" / "scripts" / f"{metric_id}.py"
     configs_path = ROOT / "content" / "configs" / f"{metric_id}.json"
     latest_path = ROOT / "content" / "latest" / f"{metric_id}.json"
     series_path = ROOT / "content" / "series" / f"{metric_id}.json"
 
-    # Load series first (if present) and confirm deletion if it has > 1 point
-    if series_path.exists():
+    # Inspect series first (if present) and confirm deletion if it has > 1 point
+    backend = get_backend(root=ROOT)
+    if backend.exists(metric_id):
         try:
-            series_obj = read_json(series_path)
-            points = series_obj.get("points", [])
-            if isinstance(points, list) and len(points) > 1:
+            n_points = backend.count(metric_id)
+            if n_points > 1:
+                # Only the most recent partition(s) need to be opened for a preview
+                since = datetime.now(timezone.utc) - timedelta(days=PREVIEW_DAYS)
+                recent = list(backend.read_points(metric_id, start=since))[-PREVIEW_POINTS:]
                 print("\n================ SERIES (will be deleted) ================\n")
-                print(series_path)
-                print(json.dumps(series_obj, ensure_ascii=False, indent=2))
+                for p in backend.paths(metric_id):
+                    print(p)
+                print(f"{n_points} points, most recent {len(recent)}:")
+                print(json.dumps(recent, ensure_ascii=False, indent=2))
 
                 if configs_path.exists():
                     try:
@@ -66,7 +86,7 @@ def main() -> None:
                     raise SystemExit(0)
 
         except json.JSONDecodeError as e:
-            print(f"WARN: Series file exists but is not valid JSON ({series_path}): {e}")
+            print(f"WARN: Series exists but is not valid JSON ({series_path}): {e}")
             ans = input(
                 f"Series file looks corrupted. Delete '{metric_id}' files anyway? yes/[No]: "
             ).strip().lower()
@@ -74,7 +94,7 @@ def main() -> None:
                 print("Aborted.")
                 raise SystemExit(0)
         except Exception as e:
-            print(f"WARN: Failed to inspect series file {series_path}: {e}")
+            print(f"WARN: Failed to inspect series for {metric_id}: {e}")
             ans = input(
                 f"Proceed to delete '{metric_id}' files anyway? yes/[No]: "
             ).strip().lower()
@@ -84,6 +104,28 @@ def main() -> None:
 
     # If no series file, or series has <= 1 point, proceed without interactive confirmation
     targets = [scripts_path, configs_path, latest_path, series_path]
+    # Files kept by non-default series backends (e.g. content/store/series/*.jsonl)
+    for backend_cls in BACKENDS.values():
+        for p in backend_cls(root=ROOT).paths(metric_id):
+            if p.exists() and p not in targets:
+                targets.append(p)
+    for tier in TIERS:
+        p = tier_path(metric_id, tier, root=ROOT)
+        if p.exists():
+            targets.append(p)
+    if state_path(metric_id, root=ROOT).exists():
+        targets.append(state_path(metric_id, root=ROOT))
+    if tail_path(metric_id, root=ROOT).exists():
+        targets.append(tail_path(metric_id, root=ROOT))
+    # Output of the last scheduled run (tools/scheduler.py)
+    output_path = ROOT / "content" / "store" / "output" / f"{metric_id}.txt"
+    if output_path.exists():
+        targets.append(output_path)
+    # Precompressed siblings (.json.gz / .json.br) of the public files
+    for p in list(targets):
+        for encoding in ENCODINGS:
+            if sibling_path(p, encoding).exists():
+                targets.append(sibling_path(p, encoding))
 
     print("\nDeleting files:")
     for p in targets:
@@ -98,6 +140,47 @@ def main() -> None:
             ok = ok and deleted
         else:
             print(f"  (not found) {p}")
+    remove_artifacts(targets, root=ROOT)
+    remove_from_snapshot([metric_id], root=ROOT)
+
+    # Backends without per-metric files (sqlite) delete rows instead
+    for backend_cls in BACKENDS.values():
+        store = backend_cls(root=ROOT)
+        if not store.paths(metric_id) and store.exists(metric_id):
+            try:
+                store.delete(metric_id)
+                print(f"- deleted '{metric_id}' rows from the {store.name} store")
+                deleted_any = True
+            except Exception as e:
+                print(f"ERROR: Failed to delete '{metric_id}' from the {store.name} store: {e}")
+                ok = False
+
+    # Run history rows and content/status/runs/<metric_id>.json
+    history = RunHistory(root=ROOT)
+    if history.path.exists():
+        try:
+            history.forget(metric_id)
+            print(f"- deleted '{metric_id}' runs from the run history")
+        except Exception as e:
+            print(f"ERROR: Failed to delete '{metric_id}' from the run history: {e}")
+            ok = False
+        finally:
+            history.close()
+
+    # Resource usage records in content/store/run_usage.jsonl
+    try:
+        dropped = ResourceLedger(root=ROOT).purge(metric_id)
+        if dropped:
+            print(f"- deleted {dropped} '{metric_id}' lines from the resource usage log")
+            deleted_any = True
+    except Exception as e:
+        print(f"ERROR: Failed to delete '{metric_id}' from the resource usage log: {e}")
+        ok = False
+
+    # Per-metric directories (rollups, partitions) left empty by the above
+    for d in {p.parent for p in targets}:
+        if d.name == metric_id and d.is_dir() and not any(d.iterdir()):
+            d.rmdir()
 
     if ok:
         if deleted_any:
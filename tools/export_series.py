@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+export_series.py
+
+Regenerates content/series/<metric_id>.json (the `{metric_id, points}` shape read
+by gatsby-node.js and fetchSeries) from the configured series backend, and with
+--latest also content/latest/<metric_id>.json for backends that keep latest
+values in their own store (sqlite). With the json backend, whose files are
+already in that shape, it only refreshes their .gz/.br siblings and ETags
+(the runner skips those on append; run this e.g. hourly from cron).
+Points are streamed, so memory use does not grow with history length.
+
+CLI:
+  python3 -m tools.export_series
+  python3 -m tools.export_series --metric foo_bar_baz
+  python3 -m tools.export_series --backend jsonl
+  python3 -m tools.export_series --since 30d --out /tmp/analysis
+  python3 -m tools.export_series --backend sqlite --latest
+
+Import:
+  from tools.export_series import export_series
+  export_series("foo_bar_baz")
+"""
+import argparse
+import json
+import os
+import sys
+import textwrap
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable, List
+
+from tools.artifacts import publish_file
+from tools.rollups import parse_duration
+from tools.series_store import ROOT, JsonSeriesBackend, SeriesBackend, get_backend, write_latest_file
+
+
+def write_series_json(path: Path, metric_id: str, points: Iterable[dict], *, root: Path = ROOT) -> int:
+    """
+    Stream points into path in the same layout the runner has always written,
+    then publish its compressed siblings. Returns the number of points written.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    n = 0
+    with tmp.open("w", encoding="utf-8") as f:
+        f.write("{\n")
+        f.write(f'  "metric_id":{json.dumps(metric_id, ensure_ascii=False)},\n')
+        f.write('  "points":[')
+        for point in points:
+            body = json.dumps(point, ensure_ascii=False, separators=(",", ":"), indent=2)
+            f.write(("," if n else "") + "\n" + textwrap.indent(body, "    "))
+            n += 1
+        f.write("\n  ]\n}" if n else "]\n}")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    publish_file(path, root=root)
+    return n
+
+
+def export_series(
+    metric_id: str,
+    *,
+    backend: SeriesBackend | None = None,
+    root: Path = ROOT,
+    start: datetime | None = None,
+    out_dir: Path | None = None,
+) -> int:
+    """
+    Write <out_dir>/<metric_id>.json (default: content/series/) with the points
+    from start onwards. Backends that partition by time only read the
+    partitions overlapping that range.
+    """
+    backend = backend or get_backend(root=root)
+    if out_dir is None:
+        if isinstance(backend, JsonSeriesBackend):
+            # Already the published format; only its siblings are behind.
+            path = root / "content" / "series" / f"{metric_id}.json"
+            if path.is_file():
+                publish_file(path, root=root)
+            return backend.count(metric_id)
+        out_dir = root / "content" / "series"
+    path = out_dir / f"{metric_id}.json"
+    return write_series_json(path, metric_id, backend.read_points(metric_id, start=start), root=root)
+
+
+def export_latest(*, backend: SeriesBackend | None = None, root: Path = ROOT) -> int:
+    """Regenerate content/latest/*.json from backends that keep latest values internally."""
+    backend = backend or get_backend(root=root)
+    n = 0
+    for metric_id, point in backend.iter_latest():
+        write_latest_file(metric_id, point, root=root)
+        n += 1
+    return n
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description="Export series JSON files from the series backend.")
+    ap.add_argument("--metric", help="Export only this metric_id.")
+    ap.add_argument("--backend", help="Series backend to read from (default: DASH_SERIES_BACKEND).")
+    ap.add_argument("--since", help="Only export points from this far back, e.g. '30d' or '12h'.")
+    ap.add_argument("--out", type=Path, help="Write to this directory instead of content/series/.")
+    ap.add_argument("--latest", action="store_true", help="Also regenerate content/latest/*.json.")
+    return ap
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = _build_arg_parser().parse_args(argv)
+    backend = get_backend(args.backend, root=ROOT)
+    metric_ids = [args.metric] if args.metric else backend.list_metric_ids()
+    start = None
+    if args.since:
+        start = datetime.now(timezone.utc) - timedelta(seconds=parse_duration(args.since))
+
+    failed = 0
+    for metric_id in metric_ids:
+        try:
+            n = export_series(metric_id, backend=backend, root=ROOT, start=start, out_dir=args.out)
+            print(f"{metric_id}: exported {n} points")
+        except Exception as e:
+            failed += 1
+            print(f"Error: export of '{metric_id}' failed: {e}", file=sys.stderr)
+
+    if args.latest:
+        print(f"latest: exported {export_latest(backend=backend, root=ROOT)} files")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
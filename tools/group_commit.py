@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+group_commit.py
+
+Group-commit writer for the runner's file writes. While a group is active
+(see group_commit()), atomic replaces and appends are staged in memory and
+committed together:
+
+1. every replace is written to its .tmp sibling, every append to its file
+2. data is made durable (see the durability levels below)
+3. the .tmp files are renamed over their targets
+4. each touched directory is fsync'd, so the renames survive a crash too
+
+Replaced files are all-or-nothing: a crash before step 3 leaves them
+untouched, a crash after it leaves them complete. Appends are not: they go
+straight into their target files in step 1, so a crash before step 3 can
+leave some of a group's appends in place (while its replaces are not), and
+the last line or row of an appended file torn. The series backends allow
+for that: iter_jsonl_points() skips a torn trailing line, the line-delimited
+writers cut it off before their next append (truncate_torn_line()), and the
+columnar backend truncates its columns to the last complete row.
+A series can then hold a point that latest/state do not show yet; the
+next run's writes bring them level again.
+
+Durability levels (DASH_WRITE_DURABILITY):
+- full:  fsync every file before its rename, then fsync directories (default)
+- batch: one syncfs per file system per group, then fsync directories.
+         syncfs flushes every dirty page on that file system, including other
+         processes' writes, so on a busy shared disk it can cost more than the
+         per-file fsyncs it replaces. Use it only when content/ is on its own
+         mount (or the host is otherwise quiet).
+- none:  no fsync at all; renames stay atomic but may be lost on power failure
+
+One sync per file system per group (batch) is opt-in because there is no
+call that syncs just a set of files; even with "full", a file staged several
+times in a group is synced once and each directory once per group.
+"""
+import ctypes
+import ctypes.util
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set, Union
+
+DURABILITY_LEVELS = ("full", "batch", "none")
+DURABILITY = os.environ.get("DASH_WRITE_DURABILITY", "full")
+
+_libc = None
+if hasattr(os, "sync"):
+    try:
+        _libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        _libc.syncfs  # noqa: B018 - raises AttributeError when unavailable
+    except (OSError, AttributeError):
+        _libc = None
+
+
+def _fsync_path(path: Path, flags: int = os.O_RDONLY) -> None:
+    fd = os.open(path, flags)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _syncfs(path: Path) -> None:
+    """Flush the whole file system holding path (falls back to fsync of path)."""
+    if _libc is None:
+        _fsync_path(path)
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        if _libc.syncfs(fd) != 0:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class GroupCommit:
+    def __init__(self, durability: str = DURABILITY) -> None:
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Invalid durability '{durability}': expected one of {list(DURABILITY_LEVELS)}")
+        self.durability = durability
+        self._replaces: Dict[Path, bytes] = {}
+        self._appends: Dict[Path, List[bytes]] = {}
+        self._after: Dict[str, Callable[[], None]] = {}
+
+    def __len__(self) -> int:
+        return len(self._replaces) + len(self._appends)
+
+    def replace(self, path: Path, data: bytes) -> None:
+        """Stage an atomic replace of path; the last staged content wins."""
+        self._replaces[path] = data
+
+    def append(self, path: Path, data: bytes) -> None:
+        self._appends.setdefault(path, []).append(data)
+
+    def staged(self, path: Path) -> Optional[bytes]:
+        """Content of a staged replace of path, if any (read-your-writes)."""
+        return self._replaces.get(path)
+
+    def pending_append_bytes(self, path: Path) -> int:
+        return sum(len(b) for b in self._appends.get(path, ()))
+
+    def after_commit(self, key: str, fn: Callable[[], None]) -> None:
+        """Run fn once after the staged files are in place (one call per key)."""
+        self._after.setdefault(key, fn)
+
+    def commit(self) -> None:
+        replaces, self._replaces = self._replaces, {}
+        appends, self._appends = self._appends, {}
+        after, self._after = self._after, {}
+        if replaces or appends:
+            self._commit_files(replaces, appends)
+        # Hooks write directly (typically under a lock), even if this group stays active
+        global _ACTIVE
+        saved, _ACTIVE = _ACTIVE, None
+        try:
+            for fn in after.values():
+                fn()
+        finally:
+            _ACTIVE = saved
+
+    def _commit_files(self, replaces: Dict[Path, bytes], appends: Dict[Path, List[bytes]]) -> None:
+
+        full = self.durability == "full"
+        dirs: Set[Path] = set()
+        devices: Dict[int, Path] = {}
+        tmps: List[tuple] = []
+
+        for path, chunks in appends.items():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            new = not path.exists()
+            with path.open("ab") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                f.flush()
+                if full:
+                    os.fsync(f.fileno())
+                devices.setdefault(os.fstat(f.fileno()).st_dev, path)
+            if new:
+                dirs.add(path.parent)
+
+        for path, data in replaces.items():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            with tmp.open("wb") as f:
+                f.write(data)
+                f.flush()
+                if full:
+                    os.fsync(f.fileno())
+                devices.setdefault(os.fstat(f.fileno()).st_dev, tmp)
+            tmps.append((tmp, path))
+            dirs.add(path.parent)
+
+        if self.durability == "batch":
+            for path in devices.values():
+                _syncfs(path)
+
+        for tmp, path in tmps:
+            os.replace(tmp, path)
+
+        if self.durability != "none":
+            for d in dirs:
+                _fsync_path(d)
+
+
+_ACTIVE: Optional[GroupCommit] = None
+
+
+def active() -> Optional[GroupCommit]:
+    return _ACTIVE
+
+
+def write_atomic(path: Path, data: Union[str, bytes]) -> None:
+    """Write data to path via tmp file + fsync + rename (staged inside a group commit)."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    if _ACTIVE is not None:
+        _ACTIVE.replace(path, data)
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def append_bytes(path: Path, data: bytes) -> None:
+    """Append data to path and fsync it (staged inside a group commit)."""
+    if _ACTIVE is not None:
+        _ACTIVE.append(path, data)
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("ab") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_text(path: Path) -> str:
+    """Read path, seeing a replace staged in the active group commit."""
+    staged = _ACTIVE.staged(path) if _ACTIVE is not None else None
+    if staged is not None:
+        return staged.decode("utf-8")
+    return path.read_text(encoding="utf-8")
+
+
+def flush_group() -> None:
+    """Commit staged writes now, before rewriting files they may target."""
+    if _ACTIVE is not None:
+        _ACTIVE.commit()
+
+
+@contextmanager
+def group_commit(durability: str = DURABILITY) -> Iterator[GroupCommit]:
+    """
+    Stage file writes until the outermost group exits. Nested groups join the
+    outer one. Writes staged before an exception are still committed: each
+    staged write is a complete result.
+    """
+    global _ACTIVE
+    if _ACTIVE is not None:
+        yield _ACTIVE
+        return
+    _ACTIVE = GroupCommit(durability)
+    try:
+        yield _ACTIVE
+    finally:
+        gc, _ACTIVE = _ACTIVE, None
+        gc.commit()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+host_load.py
+
+A cheap reading of how busy the host is, for the scheduler's adaptive
+concurrency: the 1-minute load average per CPU and, where the kernel has
+pressure stall information (Linux 4.20+, /proc/pressure/), the share of the
+last 10 seconds in which some task waited for CPU, memory or I/O.
+
+  HostLoad(load_per_cpu=0.35, cpu_psi=2.1, memory_psi=0.0, io_psi=0.4)
+
+A PSI field is None when /proc/pressure/ is not available.
+
+CLI:
+  python3 -m tools.host_load
+
+Import:
+  from tools.host_load import read_host_load
+  load = read_host_load()
+"""
+import argparse
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+PRESSURE_DIR = Path("/proc/pressure")
+
+
+@dataclass(frozen=True)
+class HostLoad:
+    load_per_cpu: float
+    cpu_psi: Optional[float] = None  # "some avg10", percent
+    memory_psi: Optional[float] = None
+    io_psi: Optional[float] = None
+
+    def describe(self) -> str:
+        parts = [f"load {self.load_per_cpu:.2f}/cpu"]
+        for name, value in (("cpu", self.cpu_psi), ("mem", self.memory_psi), ("io", self.io_psi)):
+            if value is not None:
+                parts.append(f"psi {name} {value:.1f}%")
+        return ", ".join(parts)
+
+
+def cpu_count() -> int:
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except (AttributeError, OSError):
+        return max(1, os.cpu_count() or 1)
+
+
+def read_pressure(resource: str) -> Optional[float]:
+    """ "some avg10" of /proc/pressure/<resource> (percent), or None."""
+    try:
+        text = (PRESSURE_DIR / resource).read_text(encoding="ascii")
+    except OSError:
+        return None
+    for line in text.splitlines():
+        fields = line.split()
+        if fields and fields[0] == "some":
+            for field_ in fields[1:]:
+                key, _, value = field_.partition("=")
+                if key == "avg10":
+                    try:
+                        return float(value)
+                    except ValueError:
+                        return None
+    return None
+
+
+def read_host_load() -> HostLoad:
+    try:
+        load1 = os.getloadavg()[0]
+    except OSError:
+        load1 = 0.0
+    return HostLoad(
+        load_per_cpu=load1 / cpu_count(),
+        cpu_psi=read_pressure("cpu"),
+        memory_psi=read_pressure("memory"),
+        io_psi=read_pressure("io"),
+    )
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    return argparse.ArgumentParser(description="Print the host load as the scheduler sees it.")
+
+
+def main(argv: List[str] | None = None) -> int:
+    _build_arg_parser().parse_args(argv)
+    load = read_host_load()
+    if load.cpu_psi is None:
+        print("note: /proc/pressure/ not available; using the load average only", file=sys.stderr)
+    print(load.describe())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+migrate_series.py
+
+Copies existing content/series/<metric_id>.json files into another series
+backend (default: jsonl). Legacy files are streamed point by point and are left
+in place; they remain the published files until tools.export_series rewrites them.
+
+CLI:
+  python3 -m tools.migrate_series
+  python3 -m tools.migrate_series --metric foo_bar_baz --to jsonl
+  python3 -m tools.migrate_series --force   # overwrite already-migrated metrics
+"""
+import argparse
+import sys
+from typing import List
+
+from tools.series_store import ROOT, JsonSeriesBackend, SeriesBackend, get_backend
+
+
+def migrate_series(
+    metric_id: str,
+    *,
+    target: SeriesBackend,
+    source: SeriesBackend | None = None,
+    force: bool = False,
+) -> int:
+    """
+    Stream every point of metric_id from source into target.
+    Returns the number of points migrated, or -1 if skipped.
+    """
+    source = source or JsonSeriesBackend(root=target.root)
+    if type(source) is type(target):
+        raise ValueError("Source and target backend are the same")
+
+    if target.exists(metric_id):
+        if not force:
+            return -1
+        target.delete(metric_id)
+
+    return target.append_many(metric_id, source.read_points(metric_id))
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description="Migrate legacy series JSON files to another backend.")
+    ap.add_argument("--metric", help="Migrate only this metric_id.")
+    ap.add_argument("--to", default="jsonl", help="Target series backend (default: jsonl).")
+    ap.add_argument("--force", action="store_true", help="Overwrite metrics already present in the target.")
+    return ap
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = _build_arg_parser().parse_args(argv)
+    source = JsonSeriesBackend(root=ROOT)
+    target = get_backend(args.to, root=ROOT)
+    metric_ids = [args.metric] if args.metric else source.list_metric_ids()
+
+    failed = 0
+    for metric_id in metric_ids:
+        try:
+            n = migrate_series(metric_id, target=target, source=source, force=args.force)
+            if n < 0:
+                print(f"{metric_id}: already in '{target.name}', skipped (use --force)")
+            else:
+                print(f"{metric_id}: migrated {n} points")
+        except Exception as e:
+            failed += 1
+            print(f"Error: migration of '{metric_id}' failed: {e}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+rollups.py
+
+Maintains downsampled tiers of numeric series data, updated incrementally as
+points arrive:
+
+- raw:  every point (the series backend itself)
+- 5m:   content/rollups/<metric_id>/5m.json
+- 1h:   content/rollups/<metric_id>/1h.json
+- 1d:   content/rollups/<metric_id>/1d.json
+
+Each bucket is stored as a chartable point whose `v` is the bucket mean:
+  {"t": <bucket start>, "v": <mean>, "vv": {"min", "max", "count", "last"}}
+
+Each tier keeps only the buckets inside its retention window, configured per
+metric with the optional config key `retention`, e.g. {"raw": "180d", "5m": "7d"}.
+
+CLI (rebuild tiers from the full series, e.g. after enabling rollups):
+  python3 -m tools.rollups --rebuild
+  python3 -m tools.rollups --rebuild --metric foo_bar_baz
+"""
+import argparse
+import json
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from tools.artifacts import publish_json, remove_artifacts
+from tools.series_store import ROOT, ColumnarSeriesBackend, get_backend, np, point_time, read_text
+
+# tier name -> bucket width in seconds
+TIERS: Dict[str, int] = {
+    "5m": 300,
+    "1h": 3600,
+    "1d": 24 * 3600,
+}
+
+RAW_TIER = "raw"
+TIER_NAMES = [RAW_TIER, *TIERS]
+
+# None = keep forever
+DEFAULT_RETENTION: Dict[str, Optional[str]] = {
+    RAW_TIER: None,
+    "5m": "7d",
+    "1h": "90d",
+    "1d": None,
+}
+
+ERROR_SENTINEL = -404.0
+
+DURATION_RE = re.compile(r"^(\d+)([hdwy])$")
+_DURATION_UNIT_SECONDS = {"h": 3600, "d": 24 * 3600, "w": 7 * 24 * 3600, "y": 365 * 24 * 3600}
+
+# Raw pruning rewrites the series, so it only happens once the oldest point is
+# this fraction of the retention window past the cutoff.
+RAW_PRUNE_SLACK = 0.1
+
+
+def parse_duration(text: str) -> int:
+    """Parse '12h', '7d', '4w' or '1y' into seconds."""
+    m = DURATION_RE.match(text)
+    if not m:
+        raise ValueError(f"Invalid duration '{text}': expected <int>[h|d|w|y]")
+    return int(m.group(1)) * _DURATION_UNIT_SECONDS[m.group(2)]
+
+
+def retention_seconds(config: dict) -> Dict[str, Optional[int]]:
+    """Resolve the per-tier retention of a metric config (None = unbounded)."""
+    merged = dict(DEFAULT_RETENTION)
+    custom = config.get("retention")
+    if isinstance(custom, dict):
+        merged.update({k: v for k, v in custom.items() if k in merged})
+    out: Dict[str, Optional[int]] = {}
+    for tier, text in merged.items():
+        try:
+            out[tier] = parse_duration(text) if isinstance(text, str) else None
+        except ValueError:
+            out[tier] = None
+    return out
+
+
+def _bucket_start(dt: datetime, bucket_s: int) -> str:
+    epoch = int(dt.timestamp())
+    return datetime.fromtimestamp(epoch - epoch % bucket_s, tz=timezone.utc).isoformat()
+
+
+def _numeric_value(point: dict) -> Optional[float]:
+    v = point.get("v")
+    # -404 is the runner's error sentinel, not a measurement
+    if isinstance(v, (int, float)) and float(v) != ERROR_SENTINEL:
+        return float(v)
+    return None
+
+
+def tier_path(metric_id: str, tier: str, *, root: Path = ROOT) -> Path:
+    return root / "content" / "rollups" / metric_id / f"{tier}.json"
+
+
+def _read_tier(path: Path, metric_id: str, tier: str) -> dict:
+    try:
+        return json.loads(read_text(path))
+    except Exception:
+        pass
+    return {"metric_id": metric_id, "tier": tier, "bucket_s": TIERS[tier], "points": []}
+
+
+def _fold(buckets: List[dict], start: str, value: float) -> None:
+    """Add value to the bucket starting at `start`, creating it if needed."""
+    for i in range(len(buckets) - 1, -1, -1):
+        b = buckets[i]
+        if b["t"] == start:
+            agg = b["vv"]
+            n = agg["count"]
+            b["v"] = (b["v"] * n + value) / (n + 1)
+            agg["count"] = n + 1
+            agg["min"] = min(agg["min"], value)
+            agg["max"] = max(agg["max"], value)
+            agg["last"] = value
+            return
+        if b["t"] < start:
+            break
+    else:
+        i = -1
+    new = {"t": start, "v": value, "vv": {"min": value, "max": value, "count": 1, "last": value}}
+    buckets.insert(i + 1, new)
+
+
+def _apply_retention(buckets: List[dict], keep_s: Optional[int], now: datetime) -> List[dict]:
+    if keep_s is None:
+        return buckets
+    cutoff = (now - timedelta(seconds=keep_s)).isoformat()
+    return [b for b in buckets if b["t"] >= cutoff]
+
+
+def update_rollups(
+    metric_id: str,
+    points: Iterable[dict],
+    *,
+    config: dict,
+    root: Path = ROOT,
+    now: Optional[datetime] = None,
+) -> None:
+    """
+    Fold points into every rollup tier of metric_id. Non-numeric points are ignored;
+    string metrics therefore never get rollup files.
+    """
+    values = []
+    for p in points:
+        v = _numeric_value(p)
+        if v is not None and "t" in p:
+            values.append((point_time(p), v))
+    if not values:
+        return
+
+    now = now or datetime.now(timezone.utc)
+    keep = retention_seconds(config)
+    for tier, bucket_s in TIERS.items():
+        path = tier_path(metric_id, tier, root=root)
+        data = _read_tier(path, metric_id, tier)
+        buckets = data.setdefault("points", [])
+        for dt, v in values:
+            _fold(buckets, _bucket_start(dt, bucket_s), v)
+        data["points"] = _apply_retention(buckets, keep[tier], now)
+        publish_json(path, data, indent=None, root=root)
+
+
+def prune_raw(metric_id: str, *, config: dict, root: Path = ROOT, now: Optional[datetime] = None) -> int:
+    """Drop raw series points older than the raw retention. Returns points removed."""
+    keep_s = retention_seconds(config)[RAW_TIER]
+    if keep_s is None:
+        return 0
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=keep_s)
+    slack = timedelta(seconds=keep_s * RAW_PRUNE_SLACK)
+    return get_backend(root=root).prune(metric_id, cutoff=cutoff, slack=slack)
+
+
+def _buckets_from_columns(t_us, values, bucket_s: int) -> List[dict]:
+    """Vectorised bucketing of time-ordered NumPy columns (columnar backend)."""
+    keep = ~np.isnan(values) & (values != ERROR_SENTINEL)
+    t_us, values = t_us[keep], values[keep]
+    if len(t_us) == 0:
+        return []
+    keys = t_us // (bucket_s * 1_000_000)
+    uniq, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+    mins = np.minimum.reduceat(values, starts)
+    maxs = np.maximum.reduceat(values, starts)
+    means = np.add.reduceat(values, starts) / counts
+    lasts = values[starts + counts - 1]
+    return [
+        {
+            "t": datetime.fromtimestamp(int(k) * bucket_s, tz=timezone.utc).isoformat(),
+            "v": float(mean),
+            "vv": {"min": float(lo), "max": float(hi), "count": int(c), "last": float(last)},
+        }
+        for k, mean, lo, hi, c, last in zip(uniq, means, mins, maxs, counts, lasts)
+    ]
+
+
+def rebuild_rollups(metric_id: str, *, config: dict, root: Path = ROOT) -> None:
+    paths = [tier_path(metric_id, tier, root=root) for tier in TIERS]
+    for path in paths:
+        if path.exists():
+            path.unlink()
+    remove_artifacts(paths, root=root)
+
+    backend = get_backend(root=root)
+    if isinstance(backend, ColumnarSeriesBackend) and np is not None:
+        t_us, values, _ = backend.read_columns(metric_id)
+        now = datetime.now(timezone.utc)
+        keep = retention_seconds(config)
+        for tier, bucket_s in TIERS.items():
+            buckets = _apply_retention(_buckets_from_columns(t_us, values, bucket_s), keep[tier], now)
+            if buckets:
+                data = {"metric_id": metric_id, "tier": tier, "bucket_s": bucket_s, "points": buckets}
+                publish_json(tier_path(metric_id, tier, root=root), data, indent=None, root=root)
+        return
+
+    update_rollups(metric_id, backend.read_points(metric_id), config=config, root=root)
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description="Maintain rollup tiers of series data.")
+    ap.add_argument("--rebuild", action="store_true", help="Recompute all tiers from the series backend.")
+    ap.add_argument("--metric", help="Only this metric_id.")
+    return ap
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = _build_arg_parser().parse_args(argv)
+    if not args.rebuild:
+        _build_arg_parser().print_help()
+        return 2
+
+    configs = ROOT / "content" / "configs"
+    metric_ids = [args.metric] if args.metric else sorted(p.stem for p in configs.glob("*.json"))
+    failed = 0
+    for metric_id in metric_ids:
+        try:
+            config = json.loads((configs / f"{metric_id}.json").read_text(encoding="utf-8"))
+            rebuild_rollups(metric_id, config=config, root=ROOT)
+            print(f"{metric_id}: rollups rebuilt")
+        except Exception as e:
+            failed += 1
+            print(f"Error: rollups for '{metric_id}' failed: {e}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+run_history.py
+
+History of metric runs: one row per execution, with start and end time,
+exit code, duration, retry attempt, outcome and the tail of its output.
+
+- content/store/runs.sqlite           (WAL) indexed on (metric_id, started),
+                                      with a second, partial index over failed
+                                      runs only, so "the last 50 failures of X"
+                                      reads 50 index entries however many
+                                      successful runs surround them
+- content/status/runs/<metric_id>.json   recent runs for the metric page
+  {
+    "metric_id": "foo_bar_baz", "generated_at": "<iso>",
+    "runs": [{"id": 812, "started": "<iso>", "ended": "<iso>", "duration_ms": 240, "exit": 0,
+              "attempt": 0, "status": "ok", "source": "scheduler"}, ...],
+    "failures": [{... same fields ..., "output": "<tail of stdout/stderr>"}, ...]
+  }
+
+Status is one of:
+  ok        exit 0 and a value was written
+  error     exit 0, but the script returned the error sentinel (-404)
+  retry     the run returned the error sentinel and was re-queued
+  timeout   stopped after the metric's timeout
+  failed    any other exit code, no point written, or the run could not be started
+
+The scheduler records every run it reaps. run_metrics records the runs it is
+started for directly (CLI, cron), which the scheduler never sees.
+Successful runs are kept DASH_RUN_HISTORY_DAYS, failures
+DASH_RUN_HISTORY_FAILURE_DAYS.
+
+CLI:
+  python3 -m tools.run_history --metric foo_bar_baz
+  python3 -m tools.run_history --metric foo_bar_baz --failures --limit 50
+  python3 -m tools.run_history --publish
+  python3 -m tools.run_history --prune
+
+Import:
+  from tools.run_history import RunHistory
+  history = RunHistory()
+  history.record("foo_bar_baz", started=t0, ended=t1, exit_code=0, status="ok", output="...")
+  history.failures("foo_bar_baz", limit=50)
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Set
+
+ROOT = Path(__file__).resolve().parents[1]
+
+RUN_HISTORY_DAYS = float(os.environ.get("DASH_RUN_HISTORY_DAYS", "30"))
+RUN_HISTORY_FAILURE_DAYS = float(os.environ.get("DASH_RUN_HISTORY_FAILURE_DAYS", "180"))
+# Output tail kept per run; successful runs only print their point
+OUTPUT_BYTES = int(os.environ.get("DASH_RUN_HISTORY_OUTPUT_BYTES", "4096"))
+OK_OUTPUT_BYTES = int(os.environ.get("DASH_RUN_HISTORY_OK_OUTPUT_BYTES", "256"))
+# Rows in content/status/runs/<metric_id>.json
+PUBLISH_RUNS = 50
+PUBLISH_FAILURES = 20
+PRUNE_INTERVAL_SECONDS = 3600
+
+# The runner's error sentinel (see tools.runner._is_error)
+ERROR_SENTINEL = -404.0
+
+STATUSES = ("ok", "error", "retry", "timeout", "failed")
+
+_COLUMNS = "id, started_us, ended_us, duration_ms, exit, attempt, status, source"
+
+
+def history_path(*, root: Path = ROOT) -> Path:
+    return root / "content" / "store" / "runs.sqlite"
+
+
+def runs_json_path(metric_id: str, *, root: Path = ROOT) -> Path:
+    return root / "content" / "status" / "runs" / f"{metric_id}.json"
+
+
+def is_error_value(value: object) -> bool:
+    try:
+        return float(value) == ERROR_SENTINEL  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return False
+
+
+def _us(dt: datetime) -> int:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1_000_000)
+
+
+def _iso_us(us: Optional[int]) -> Optional[str]:
+    if us is None:
+        return None
+    return datetime.fromtimestamp(us / 1_000_000, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _tail(output: Optional[str], limit: int) -> Optional[str]:
+    if not output or limit <= 0:
+        return None
+    return output[-limit:]
+
+
+class RunHistory:
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY,
+            metric_id TEXT NOT NULL,
+            started_us INTEGER NOT NULL,
+            ended_us INTEGER,
+            duration_ms INTEGER,
+            exit INTEGER,
+            attempt INTEGER NOT NULL DEFAULT 0,
+            status TEXT NOT NULL,
+            source TEXT NOT NULL,
+            output TEXT
+        );
+        CREATE INDEX IF NOT EXISTS runs_metric_started ON runs (metric_id, started_us);
+        CREATE INDEX IF NOT EXISTS runs_metric_failed ON runs (metric_id, started_us) WHERE status != 'ok';
+    """
+
+    def __init__(self, *, root: Path = ROOT) -> None:
+        self.root = root
+        self.path = history_path(root=root)
+        self._conn: Optional[sqlite3.Connection] = None
+        self.dirty: Set[str] = set()  # metrics whose runs/<metric_id>.json is out of date
+        self._last_prune_at = 0.0
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self.SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def record(
+        self,
+        metric_id: str,
+        *,
+        started: datetime,
+        ended: Optional[datetime],
+        exit_code: Optional[int],
+        status: str,
+        attempt: int = 0,
+        output: Optional[str] = None,
+        source: str = "scheduler",
+    ) -> int:
+        """Add one run; returns its id."""
+        started_us = _us(started)
+        ended_us = _us(ended) if ended is not None else None
+        duration_ms = (ended_us - started_us) // 1000 if ended_us is not None else None
+        limit = OK_OUTPUT_BYTES if status == "ok" else OUTPUT_BYTES
+        cur = self.conn.execute(
+            "INSERT INTO runs (metric_id, started_us, ended_us, duration_ms, exit, attempt, status, source, output)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (metric_id, started_us, ended_us, duration_ms, exit_code, attempt, status, source, _tail(output, limit)),
+        )
+        self.dirty.add(metric_id)
+        return int(cur.lastrowid)
+
+    @contextmanager
+    def batch(self) -> Iterator["RunHistory"]:
+        """Record several runs in one transaction."""
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def set_output(self, run_id: int, output: Optional[str]) -> None:
+        """Attach output that arrived after the run was recorded (e.g. a timed-out run, once reaped)."""
+        row = self.conn.execute("SELECT metric_id, status FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if row is None:
+            return
+        limit = OK_OUTPUT_BYTES if row[1] == "ok" else OUTPUT_BYTES
+        self.conn.execute("UPDATE runs SET output = ? WHERE id = ?", (_tail(output, limit), run_id))
+        self.dirty.add(row[0])
+
+    def _rows(self, sql: str, args: Iterable[object], *, with_output: bool) -> List[dict]:
+        keys = [c.strip() for c in _COLUMNS.split(",")] + (["output"] if with_output else [])
+        out = []
+        for row in self.conn.execute(sql, tuple(args)):
+            run = dict(zip(keys, row))
+            started_us, ended_us = run.pop("started_us"), run.pop("ended_us")
+            out.append({"id": run.pop("id"), "started": _iso_us(started_us), "ended": _iso_us(ended_us), **run})
+        return out
+
+    def recent(self, metric_id: str, *, limit: int = PUBLISH_RUNS, with_output: bool = False) -> List[dict]:
+        """Newest runs of a metric, newest first."""
+        if not self.path.exists():
+            return []
+        columns = _COLUMNS + (", output" if with_output else "")
+        return self._rows(
+            f"SELECT {columns} FROM runs WHERE metric_id = ? ORDER BY started_us DESC LIMIT ?",
+            (metric_id, limit),
+            with_output=with_output,
+        )
+
+    def failures(self, metric_id: str, *, limit: int = PUBLISH_FAILURES, with_output: bool = True) -> List[dict]:
+        """Newest runs that did not end "ok", newest first (served by the partial index)."""
+        if not self.path.exists():
+            return []
+        columns = _COLUMNS + (", output" if with_output else "")
+        return self._rows(
+            f"SELECT {columns} FROM runs WHERE metric_id = ? AND status != 'ok' ORDER BY started_us DESC LIMIT ?",
+            (metric_id, limit),
+            with_output=with_output,
+        )
+
+    def metric_ids(self) -> List[str]:
+        if not self.path.exists():
+            return []
+        return [r[0] for r in self.conn.execute("SELECT DISTINCT metric_id FROM runs ORDER BY metric_id")]
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Drop successful runs older than RUN_HISTORY_DAYS and failures older than RUN_HISTORY_FAILURE_DAYS."""
+        now = now if now is not None else time.time()
+        self._last_prune_at = now
+        if not self.path.exists():
+            return 0
+        ok_before = int((now - RUN_HISTORY_DAYS * 86400) * 1_000_000)
+        failed_before = int((now - RUN_HISTORY_FAILURE_DAYS * 86400) * 1_000_000)
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            n = conn.execute("DELETE FROM runs WHERE status = 'ok' AND started_us < ?", (ok_before,)).rowcount
+            n += conn.execute("DELETE FROM runs WHERE status != 'ok' AND started_us < ?", (failed_before,)).rowcount
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return n
+
+    def prune_if_due(self) -> int:
+        if time.time() - self._last_prune_at < PRUNE_INTERVAL_SECONDS:
+            return 0
+        return self.prune()
+
+    def forget(self, metric_id: str) -> None:
+        """Delete a removed metric's runs and its published file."""
+        self.dirty.discard(metric_id)
+        if self.path.exists():
+            self.conn.execute("DELETE FROM runs WHERE metric_id = ?", (metric_id,))
+        from tools.artifacts import remove_artifacts  # noqa: PLC0415 - keeps worker imports light
+
+        path = runs_json_path(metric_id, root=self.root)
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        remove_artifacts([path], root=self.root)
+
+    def to_json(self, metric_id: str) -> dict:
+        return {
+            "metric_id": metric_id,
+            "generated_at": _iso_us(int(time.time() * 1_000_000)),
+            "runs": self.recent(metric_id),
+            "failures": self.failures(metric_id),
+        }
+
+    def publish(self, metric_ids: Optional[Iterable[str]] = None) -> int:
+        """Write content/status/runs/<metric_id>.json for the given (default: changed) metrics."""
+        from tools.artifacts import publish_json  # noqa: PLC0415
+
+        targets = sorted(self.dirty if metric_ids is None else set(metric_ids))
+        for metric_id in targets:
+            publish_json(runs_json_path(metric_id, root=self.root), self.to_json(metric_id), indent=None, root=self.root)
+            self.dirty.discard(metric_id)
+        return len(targets)
+
+
+def _format_run(run: dict) -> str:
+    duration = "-" if run["duration_ms"] is None else f"{run['duration_ms']}ms"
+    attempt = f" attempt={run['attempt']}" if run["attempt"] else ""
+    return f"{run['started']}  {run['status']:<7} exit={run['exit']} {duration}{attempt} ({run['source']})"
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description="Show, publish or prune the history of metric runs.")
+    ap.add_argument("--metric", help="Metric to show runs of.")
+    ap.add_argument("--failures", action="store_true", help="Only runs that did not end ok, with their output.")
+    ap.add_argument("--limit", type=int, default=PUBLISH_RUNS, help="Number of runs to show (default: %(default)s).")
+    ap.add_argument("--json", action="store_true", help="Print JSON instead of one line per run.")
+    ap.add_argument("--publish", action="store_true", help="Rewrite content/status/runs/*.json for all metrics.")
+    ap.add_argument("--prune", action="store_true", help="Drop runs past their retention now.")
+    return ap
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = _build_arg_parser().parse_args(argv)
+    history = RunHistory(root=ROOT)
+    if args.prune:
+        print(f"pruned {history.prune()} runs")
+    if args.publish:
+        print(f"published runs of {history.publish(history.metric_ids())} metrics")
+    if not args.metric:
+        if not (args.prune or args.publish):
+            _build_arg_parser().print_help()
+            return 2
+        return 0
+
+    if not history.path.exists():
+        print(f"ERROR: no run history at {history.path}", file=sys.stderr)
+        return 1
+    if args.failures:
+        runs = history.failures(args.metric, limit=args.limit)
+    else:
+        runs = history.recent(args.metric, limit=args.limit)
+    if args.json:
+        print(json.dumps(runs, ensure_ascii=False, indent=2))
+        return 0
+    for run in runs:
+        print(_format_run(run))
+        if run.get("output"):
+            for line in run["output"].rstrip().splitlines():
+                print(f"    {line}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+run_log.py
+
+The scheduler's log: buffered, rotated, and written twice.
+
+- content/prompts/scheduler.txt    human-readable lines (shown on the /scheduler page)
+- content/status/scheduler.jsonl   one JSON record per event, cheap to tail over HTTP
+                                   {"t": "<iso>", "event": "finished", "msg": "...", "metric_id": "...", "exit": 0}
+
+Records are buffered in memory and written every DASH_LOG_FLUSH_SECONDS, when
+the buffer passes LOG_BUFFER_BYTES, and on shutdown. Both files are rotated
+when they grow past DASH_LOG_MAX_BYTES or their first record is older than
+DASH_LOG_ROTATE_SECONDS. Rotated files are gzipped into content/store/logs/,
+and the newest DASH_LOG_KEEP of each are kept.
+
+Child output (the runner's stdout and stderr) no longer goes to the shared
+log. It is captured per run into an OutputRing, which keeps the last
+DASH_JOB_OUTPUT_BYTES, and the scheduler saves it as
+content/store/output/<metric_id>.txt.
+
+Import:
+  from tools.run_log import EventLog, OutputRing
+  log = EventLog(text_path, jsonl_path)
+  log.write("[scheduler] finished foo_bar_baz exit=0", event="finished", metric_id="foo_bar_baz", exit=0)
+  log.flush()
+"""
+import gzip
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+
+LOG_MAX_BYTES = int(os.environ.get("DASH_LOG_MAX_BYTES", str(256 * 1024)))
+LOG_ROTATE_SECONDS = float(os.environ.get("DASH_LOG_ROTATE_SECONDS", str(24 * 3600)))
+LOG_KEEP = int(os.environ.get("DASH_LOG_KEEP", "7"))
+LOG_FLUSH_SECONDS = float(os.environ.get("DASH_LOG_FLUSH_SECONDS", "2"))
+LOG_BUFFER_BYTES = 64 * 1024
+JOB_OUTPUT_BYTES = int(os.environ.get("DASH_JOB_OUTPUT_BYTES", str(16 * 1024)))
+
+ARCHIVE_DIR = ROOT / "content" / "store" / "logs"
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _first_record_time(path: Path) -> Optional[float]:
+    """Timestamp that starts the file's first line, if any."""
+    try:
+        with path.open("r", encoding="utf-8", errors="replace") as f:
+            line = f.readline()
+    except OSError:
+        return None
+    try:
+        stamp = json.loads(line)["t"] if line.startswith("{") else line.split(" ", 1)[0]
+        return datetime.fromisoformat(stamp.replace("Z", "+00:00")).timestamp()
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+class _RotatingFile:
+    def __init__(self, path: Path, archive_dir: Path) -> None:
+        self.path = path
+        self.archive_dir = archive_dir
+        self.started_at: Optional[float] = None
+        self._checked = False
+
+    def _size(self) -> int:
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def append(self, data: str, now: float) -> None:
+        if not self._checked:
+            self._checked = True
+            if self._size():
+                self.started_at = _first_record_time(self.path) or now
+        if self.started_at is not None and (
+            self._size() + len(data) > LOG_MAX_BYTES or now - self.started_at > LOG_ROTATE_SECONDS
+        ):
+            self.rotate(now)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(data)
+        if self.started_at is None:
+            self.started_at = now
+
+    def rotate(self, now: float) -> None:
+        """Gzip the file into the archive dir, start a new one, drop old archives."""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.fromtimestamp(now, timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        archive = self.archive_dir / f"{self.path.name}.{stamp}.gz"
+        try:
+            with self.path.open("rb") as src, gzip.open(archive, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        self.started_at = None
+        archives = sorted(self.archive_dir.glob(f"{self.path.name}.*.gz"))
+        for old in archives[: max(0, len(archives) - LOG_KEEP)]:
+            old.unlink()
+
+
+class EventLog:
+    def __init__(self, text_path: Path, jsonl_path: Optional[Path] = None, *, archive_dir: Path = ARCHIVE_DIR) -> None:
+        self._text = _RotatingFile(text_path, archive_dir)
+        self._jsonl = _RotatingFile(jsonl_path, archive_dir) if jsonl_path is not None else None
+        self._lines: List[str] = []
+        self._records: List[str] = []
+        self._bytes = 0
+        self.flush_due: Optional[float] = None  # time.time() by which the buffer is written
+
+    def write(self, line: str, *, event: str = "log", **fields: object) -> None:
+        now = time.time()
+        ts = _iso(now)
+        text = f"{ts} {line.rstrip()}\n"
+        self._lines.append(text)
+        self._bytes += len(text)
+        if self._jsonl is not None:
+            msg = line.strip()
+            if msg.startswith("[scheduler] "):
+                msg = msg[len("[scheduler] ") :]
+            record = {"t": ts, "event": event, "msg": msg, **fields}
+            encoded = json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str) + "\n"
+            self._records.append(encoded)
+            self._bytes += len(encoded)
+        if self.flush_due is None:
+            self.flush_due = now + LOG_FLUSH_SECONDS
+        if self._bytes >= LOG_BUFFER_BYTES or LOG_FLUSH_SECONDS <= 0:
+            self.flush()
+
+    def flush_if_due(self) -> None:
+        if self.flush_due is not None and time.time() >= self.flush_due:
+            self.flush()
+
+    def flush(self) -> None:
+        lines, records = self._lines, self._records
+        self._lines, self._records, self._bytes, self.flush_due = [], [], 0, None
+        now = time.time()
+        if lines:
+            self._text.append("".join(lines), now)
+        if records and self._jsonl is not None:
+            self._jsonl.append("".join(records), now)
+
+
+class OutputRing:
+    """The last `limit` bytes written to a run's stdout/stderr."""
+
+    def __init__(self, limit: int = JOB_OUTPUT_BYTES) -> None:
+        self.limit = limit
+        self.buf = bytearray()
+        self.dropped = 0
+
+    def feed(self, data: bytes) -> None:
+        self.buf += data
+        extra = len(self.buf) - self.limit
+        if extra > 0:
+            del self.buf[:extra]
+            self.dropped += extra
+
+    def text(self) -> str:
+        text = self.buf.decode("utf-8", errors="replace")
+        if self.dropped:
+            # start at a line boundary and say what was cut
+            text = text.split("\n", 1)[-1]
+            text = f"[... {self.dropped} earlier bytes dropped ...]\n{text}"
+        return text
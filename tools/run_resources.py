@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+run_resources.py
+
+Resource usage of every scheduled run, as wait4() reports it for the run's
+process (and the processes it waited for): user/system CPU, peak RSS, block
+I/O and context switches. Used to find the most expensive probes.
+
+- content/store/run_usage.jsonl   one line per finished run, the newest
+                                  DASH_RUN_USAGE_MAX_LINES kept; appended in
+                                  batches every DASH_LOG_FLUSH_SECONDS, like
+                                  the scheduler log
+- content/status/resources.json   per-metric summary, published by the scheduler
+  {
+    "generated_at": "<iso>", "window_runs": 50,
+    "last_hour": {"runs": 120, "cpu_s": 14.2, "max_rss_kb": 81234, "io_blocks": 512, "ctx_switches": 9120},
+    "metrics": {
+      "foo_bar_baz": {
+        "runs": 50, "last": {"t": "<iso>", "exit": 0, "duration_ms": 812, "cpu_ms": 240, ...},
+        "cpu_ms": {"mean": 231.5, "max": 410}, "max_rss_kb": {"mean": 40211, "max": 40960},
+        "io_blocks": {"mean": 8.0, "max": 24}, "ctx_switches": {"mean": 91.2, "max": 130},
+        "last_hour": {"runs": 60, "cpu_s": 13.9, ...}
+      }
+    }
+  }
+
+Mean and max cover each metric's last DASH_RESOURCES_WINDOW_RUNS runs;
+"last_hour" totals cover every run of the last hour, however many.
+
+Pool runs are forked from a warm worker, so their peak RSS includes the
+worker's own footprint (the interpreter with tools.runner imported).
+
+Built-in meta-metrics chart the same numbers on the dashboard. They are
+ordinary metrics (dash_probes_cpu, dash_probes_memory, dash_probes_io,
+dash_probes_switches) whose scripts read resources.json; install them with
+--install-meta-metrics.
+
+CLI:
+  python3 -m tools.run_resources --top 10
+  python3 -m tools.run_resources --install-meta-metrics [--force]
+
+Import:
+  from tools.run_resources import ResourceLedger, usage_from_rusage, meta_metric
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+from tools.run_log import LOG_FLUSH_SECONDS
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Runs per metric that the summary covers
+RESOURCES_WINDOW_RUNS = int(os.environ.get("DASH_RESOURCES_WINDOW_RUNS", "50"))
+RUN_USAGE_MAX_LINES = int(os.environ.get("DASH_RUN_USAGE_MAX_LINES", "100000"))
+LAST_HOUR_SECONDS = 3600
+
+USAGE_KEYS = ("utime_ms", "stime_ms", "cpu_ms", "max_rss_kb", "inblock", "oublock", "nvcsw", "nivcsw")
+
+# Meta-metric property -> (label, unit, description, summary field, scale)
+META_METRICS: Dict[str, Tuple[str, str, str, str, float]] = {
+    "cpu": (
+        "Probe CPU time",
+        "s",
+        "CPU seconds used by all metric scripts in the last hour. The breakdown lists the most expensive metrics.",
+        "cpu_s",
+        1.0,
+    ),
+    "memory": (
+        "Probe peak memory",
+        "MB",
+        "Largest peak resident memory of any metric script run in the last hour.",
+        "max_rss_kb",
+        1 / 1024,
+    ),
+    "io": (
+        "Probe block I/O",
+        "blocks",
+        "Blocks read and written by all metric scripts in the last hour.",
+        "io_blocks",
+        1.0,
+    ),
+    "switches": (
+        "Probe context switches",
+        "switches",
+        "Voluntary and involuntary context switches of all metric scripts in the last hour.",
+        "ctx_switches",
+        1.0,
+    ),
+}
+META_TOP_N = 10
+
+
+def usage_path(*, root: Path = ROOT) -> Path:
+    return root / "content" / "store" / "run_usage.jsonl"
+
+
+def resources_path(*, root: Path = ROOT) -> Path:
+    return root / "content" / "status" / "resources.json"
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def usage_from_rusage(ru) -> Dict[str, int]:
+    """Usage record from a resource.struct_rusage (e.g. the third item of os.wait4())."""
+    utime_ms = int(ru.ru_utime * 1000)
+    stime_ms = int(ru.ru_stime * 1000)
+    return {
+        "utime_ms": utime_ms,
+        "stime_ms": stime_ms,
+        "cpu_ms": utime_ms + stime_ms,
+        "max_rss_kb": int(ru.ru_maxrss),  # Linux reports KiB
+        "inblock": int(ru.ru_inblock),
+        "oublock": int(ru.ru_oublock),
+        "nvcsw": int(ru.ru_nvcsw),
+        "nivcsw": int(ru.ru_nivcsw),
+    }
+
+
+def _hour_totals(records: List[dict]) -> dict:
+    return {
+        "runs": len(records),
+        "cpu_s": round(sum(r["cpu_ms"] for r in records) / 1000, 3),
+        "max_rss_kb": max((r["max_rss_kb"] for r in records), default=0),
+        "io_blocks": sum(r["inblock"] + r["oublock"] for r in records),
+        "ctx_switches": sum(r["nvcsw"] + r["nivcsw"] for r in records),
+    }
+
+
+def _mean_max(values: List[float]) -> dict:
+    if not values:
+        return {"mean": None, "max": None}
+    return {"mean": round(sum(values) / len(values), 1), "max": max(values)}
+
+
+class ResourceLedger:
+    """
+    Per-run usage records: the last RESOURCES_WINDOW_RUNS per metric, and
+    every run of the last hour per metric.
+    """
+
+    def __init__(self, *, root: Path = ROOT) -> None:
+        self.root = root
+        self.runs: Dict[str, Deque[dict]] = {}
+        self.hour: Dict[str, Deque[dict]] = {}
+        self.dirty = False
+        self.flush_due: Optional[float] = None  # time.time() by which _pending is appended
+        self._pending: List[str] = []
+        self._lines = 0
+
+    def load(self) -> None:
+        """Rebuild the per-metric windows from run_usage.jsonl."""
+        path = usage_path(root=self.root)
+        try:
+            f = path.open("r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        since = _iso(time.time() - LAST_HOUR_SECONDS)
+        with f:
+            for line in f:
+                self._lines += 1
+                try:
+                    record = json.loads(line)
+                    self._remember(record["metric_id"], record, since)
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+    def _remember(self, metric_id: str, record: dict, since: str) -> None:
+        window = self.runs.get(metric_id)
+        if window is None:
+            window = self.runs[metric_id] = deque(maxlen=RESOURCES_WINDOW_RUNS)
+        window.append(record)
+        if record["t"] >= since:
+            self.hour.setdefault(metric_id, deque()).append(record)
+
+    def _expire(self, since: str) -> None:
+        """Drop runs older than `since` from the last-hour windows."""
+        for metric_id, window in list(self.hour.items()):
+            while window and window[0]["t"] < since:
+                window.popleft()
+            if not window:
+                del self.hour[metric_id]
+
+    def record(self, metric_id: str, usage: Dict[str, int], *, exit_code: Optional[int], duration_ms: Optional[int]) -> None:
+        now = time.time()
+        record = {"metric_id": metric_id, "t": _iso(now), "exit": exit_code, "duration_ms": duration_ms}
+        record.update({key: int(usage.get(key, 0)) for key in USAGE_KEYS})
+        self._remember(metric_id, record, _iso(now - LAST_HOUR_SECONDS))
+        self.dirty = True
+
+        self._pending.append(json.dumps(record, separators=(",", ":")) + "\n")
+        if self.flush_due is None:
+            self.flush_due = now + LOG_FLUSH_SECONDS
+        if LOG_FLUSH_SECONDS <= 0:
+            self.flush()
+
+    def flush_if_due(self) -> None:
+        if self.flush_due is not None and time.time() >= self.flush_due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Append the buffered records to run_usage.jsonl."""
+        pending, self._pending, self.flush_due = self._pending, [], None
+        if not pending:
+            return
+        path = usage_path(root=self.root)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as f:
+            f.write("".join(pending))
+        self._lines += len(pending)
+        if self._lines > RUN_USAGE_MAX_LINES:
+            self._trim(path)
+
+    def _trim(self, path: Path) -> None:
+        """Keep the newest half of RUN_USAGE_MAX_LINES lines."""
+        keep = RUN_USAGE_MAX_LINES // 2
+        with path.open("r", encoding="utf-8") as f:
+            lines = deque(f, maxlen=keep)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text("".join(lines), encoding="utf-8")
+        os.replace(tmp, path)
+        self._lines = len(lines)
+
+    def forget(self, metric_id: str) -> None:
+        self.hour.pop(metric_id, None)
+        if self.runs.pop(metric_id, None) is not None:
+            self.dirty = True
+
+    def purge(self, metric_id: str) -> int:
+        """Forget a deleted metric and drop its lines from run_usage.jsonl; returns the lines dropped."""
+        self.forget(metric_id)
+        self._pending = [line for line in self._pending if json.loads(line)["metric_id"] != metric_id]
+        path = usage_path(root=self.root)
+        try:
+            f = path.open("r", encoding="utf-8")
+        except FileNotFoundError:
+            return 0
+        kept: List[str] = []
+        dropped = 0
+        with f:
+            for line in f:
+                try:
+                    mine = json.loads(line).get("metric_id") == metric_id
+                except (ValueError, AttributeError):
+                    mine = False
+                if mine:
+                    dropped += 1
+                else:
+                    kept.append(line)
+        if dropped:
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            tmp.write_text("".join(kept), encoding="utf-8")
+            os.replace(tmp, path)
+        self._lines = len(kept)
+        return dropped
+
+    def summary(self, now: Optional[float] = None) -> dict:
+        now = now or time.time()
+        self._expire(_iso(now - LAST_HOUR_SECONDS))
+        metrics: Dict[str, dict] = {}
+        hour_all: List[dict] = []
+        for metric_id, window in sorted(self.runs.items()):
+            records = list(window)
+            if not records:
+                continue
+            recent = list(self.hour.get(metric_id, ()))
+            hour_all.extend(recent)
+            last = {k: v for k, v in records[-1].items() if k != "metric_id"}
+            metrics[metric_id] = {
+                "runs": len(records),
+                "last": last,
+                "cpu_ms": _mean_max([r["cpu_ms"] for r in records]),
+                "max_rss_kb": _mean_max([r["max_rss_kb"] for r in records]),
+                "io_blocks": _mean_max([r["inblock"] + r["oublock"] for r in records]),
+                "ctx_switches": _mean_max([r["nvcsw"] + r["nivcsw"] for r in records]),
+                "last_hour": _hour_totals(recent),
+            }
+        return {
+            "generated_at": _iso(now),
+            "window_runs": RESOURCES_WINDOW_RUNS,
+            "last_hour": _hour_totals(hour_all),
+            "metrics": metrics,
+        }
+
+    def publish(self) -> None:
+        from tools.artifacts import publish_json  # noqa: PLC0415 - keeps worker imports light
+
+        self.dirty = False
+        publish_json(resources_path(root=self.root), self.summary(), indent=None, root=self.root)
+
+
+# -----------------------------
+# Meta-metrics
+# -----------------------------
+
+
+def read_resources(*, root: Path = ROOT) -> Optional[dict]:
+    try:
+        return json.loads(resources_path(root=root).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def meta_metric(prop: str, *, root: Path = ROOT) -> Tuple[float, Optional[Dict[str, float]], Optional[str]]:
+    """
+    (value, top metrics, meta) for the dash_probes_<prop> meta-metric, in the
+    runner's script return format. Returns the error sentinel when the
+    scheduler has not published resources.json yet.
+    """
+    _, _, _, field_name, scale = META_METRICS[prop]
+    resources = read_resources(root=root)
+    if resources is None:
+        return -404, None, "content/status/resources.json not found"
+    value = resources.get("last_hour", {}).get(field_name, 0) * scale
+    per_metric = {
+        metric_id: entry.get("last_hour", {}).get(field_name, 0) * scale
+        for metric_id, entry in resources.get("metrics", {}).items()
+    }
+    top = sorted(per_metric.items(), key=lambda item: item[1], reverse=True)[:META_TOP_N]
+    return round(value, 3), {k: round(v, 3) for k, v in top if v}, None
+
+
+def meta_metric_files(prop: str) -> Tuple[str, dict, str]:
+    """(metric_id, config, script source) of one built-in meta-metric."""
+    label, unit, description, _, _ = META_METRICS[prop]
+    metric_id = f"dash_probes_{prop}"
+    config = {
+        "label": label,
+        "metric_id": metric_id,
+        "type": "dash",
+        "component": "probes",
+        "property": prop,
+        "schedule": "hourly",
+        "description": description,
+        "unit": unit,
+        "tags": ["dash", "scheduler", "resources"],
+        "display": {"visual": {"type": "number", "nLatestPoints": 24}, "charts": ["line"]},
+        "catchup": "skip",
+    }
+    script = (
+        f'"""{description} Built-in meta-metric (tools/run_resources.py)."""\n'
+        "from tools.run_resources import meta_metric\n\n\n"
+        "def main():\n"
+        f'    return meta_metric("{prop}")\n'
+    )
+    return metric_id, config, script
+
+
+def install_meta_metrics(*, root: Path = ROOT, force: bool = False) -> List[str]:
+    """Write the meta-metrics' configs and scripts; existing ones are kept unless force."""
+    from tools.validate_config_json import validate_metric_definition  # noqa: PLC0415
+
+    written: List[str] = []
+    for prop in META_METRICS:
+        metric_id, config, script = meta_metric_files(prop)
+        errors = validate_metric_definition(config)
+        if errors:
+            raise ValueError(f"{metric_id}: {errors}")
+        config_path = root / "content" / "configs" / f"{metric_id}.json"
+        script_path = root / "content" / "scripts" / f"{metric_id}.py"
+        if not force and (config_path.exists() or script_path.exists()):
+            continue
+        script_path.parent.mkdir(parents=True, exist_ok=True)
+        script_path.write_text(script, encoding="utf-8")
+        config_path.parent.mkdir(parents=True, exist_ok=True)
+        config_path.write_text(json.dumps(config, indent=2) + "\n", encoding="utf-8")
+        written.append(metric_id)
+    return written
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description="Resource usage of scheduled metric runs.")
+    ap.add_argument("--top", type=int, default=0, help="Print the N metrics with the most CPU time per run.")
+    ap.add_argument("--install-meta-metrics", action="store_true", help="Add the dash_probes_* meta-metrics.")
+    ap.add_argument("--force", action="store_true", help="With --install-meta-metrics: overwrite existing files.")
+    return ap
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = _build_arg_parser().parse_args(argv)
+    if args.install_meta_metrics:
+        try:
+            written = install_meta_metrics(root=ROOT, force=args.force)
+        except Exception as e:
+            print(f"Error: installing meta-metrics failed: {e}", file=sys.stderr)
+            return 1
+        print(f"meta-metrics: installed {', '.join(written) if written else 'nothing (already present)'}")
+        return 0
+    if args.top <= 0:
+        _build_arg_parser().print_help()
+        return 2
+
+    ledger = ResourceLedger(root=ROOT)
+    ledger.load()
+    metrics = ledger.summary()["metrics"]
+    if not metrics:
+        print(f"Error: no runs recorded in {usage_path(root=ROOT)}", file=sys.stderr)
+        return 1
+    ranked = sorted(metrics.items(), key=lambda item: item[1]["cpu_ms"]["mean"] or 0, reverse=True)
+    print(f"{'metric':40} {'runs':>5} {'cpu ms':>9} {'rss MB':>8} {'io blk':>8} {'ctx sw':>8}")
+    for metric_id, entry in ranked[: args.top]:
+        print(
+            f"{metric_id:40} {entry['runs']:>5} {entry['cpu_ms']['mean']:>9.1f} "
+            f"{entry['max_rss_kb']['max'] / 1024:>8.1f} {entry['io_blocks']['mean']:>8.1f} "
+            f"{entry['ctx_switches']['mean']:>8.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,11 +4,16 @@ run_metrics.py
 
 Runs metric scripts under content.scripts, prints points, and writes:
 - content/latest/<metric_id>.json
-- content/series/<metric_id>.json (append)
+- content/series/<metric_id>.json (append; see tools/series_store.py for other backends)
+- content/rollups/<metric_id>/<tier>.json (see tools/rollups.py)
+- content/store/state/<metric_id>.json (see tools/state_index.py)
+- content/store/runs.sqlite, for runs not started by the scheduler (see tools/run_history.py)
 
 CLI:
   python3 run_metrics.py
   python3 run_metrics.py --metric foo_bar_baz
+  python3 run_metrics.py --parallel 8 --timeout 120
+  python3 run_metrics.py --metric foo_bar_baz --retries-left 2   # exits 75 on an error result
 
 Import:
   from run_metrics import run_metric, run_metrics
@@ -16,16 +21,27 @@ Import:
 """
 import argparse
 import importlib
+import importlib.util
 import json
+import multiprocessing
 import os
 import pkgutil
-import shutil
+import signal
+import sqlite3
 import time
-from datetime import datetime, timezone
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from multiprocessing.connection import wait
 from pathlib import Path
-from typing import TypedDict, Union
+from typing import Iterator, TypedDict, Union
 
 import content.scripts
+from tools.rollups import prune_raw, update_rollups
+from tools.run_history import RunHistory
+from tools.series_store import get_backend
+from tools.state_index import cached_config, read_state, write_state
+from tools.status_snapshot import make_entry, update_snapshot
+from tools.tail import TAIL_MIN_POINTS, update_tail
 
 
 Scalar = Union[str, bool, float, int]
@@ -52,55 +68,30 @@ Point = Union[StringPoint, NumericPoint]
 
 ROOT = Path(__file__).resolve().parents[1]
 
-# Retry config — env-overridable so the scheduler can tune without code changes
+# Retry config — env-overridable so the scheduler can tune without code changes.
+# These in-process retries only apply without --retries-left; the scheduler
+# passes --retries-left and re-queues the run itself (see tools/scheduler.py).
 _RUNNER_MAX_RETRIES = int(os.environ.get("DASH_RUNNER_MAX_RETRIES", "2"))
 _RUNNER_RETRY_DELAY = float(os.environ.get("DASH_RUNNER_RETRY_DELAY", "30"))
 
+# Exit code for "the script returned the error sentinel, retry me later" (EX_TEMPFAIL)
+EXIT_RETRY = 75
+
+# --parallel default, and the per-metric wall-clock limit in that mode (config "timeout" overrides)
+_RUNNER_PARALLEL = int(os.environ.get("DASH_RUNNER_PARALLEL", "0"))
+_RUNNER_TIMEOUT_SECONDS = float(os.environ.get("DASH_RUNNER_TIMEOUT_SECONDS", "300"))
+
 
 def _utc_timestamp_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
 def write_latest(metric_id: str, point: Point, *, root: Path = ROOT) -> None:
-    path = root / "content" / "latest" / f"{metric_id}.json"
-    tmp = path.with_suffix(path.suffix + ".tmp")
-    path.parent.mkdir(parents=True, exist_ok=True)
-
-    obj = {
-        "metric_id": metric_id,
-        "points": [point],
-    }
-
-    with tmp.open("w", encoding="utf-8") as f:
-        json.dump(obj, f, ensure_ascii=False, separators=(",", ":"), indent=2)
-        f.flush()
-        os.fsync(f.fileno())
-
-    os.replace(tmp, path)
+    get_backend(root=root).write_latest(metric_id, point)
 
 
 def append_series(metric_id: str, point: Point, *, root: Path = ROOT) -> None:
-    path = root / "content" / "series" / f"{metric_id}.json"
-    path.parent.mkdir(parents=True, exist_ok=True)
-
-    if not path.is_file():
-        shutil.copy(root / "content" / "latest" / f"{metric_id}.json", path)
-        return
-
-    tmp = path.with_suffix(path.suffix + ".tmp")
-
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    points = data.setdefault("points", [])
-    points.append(point)
-
-    with tmp.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, separators=(",", ":"), indent=2)
-        f.flush()
-        os.fsync(f.fileno())
-
-    os.replace(tmp, path)
+    get_backend(root=root).append(metric_id, point)
 
 
 def list_config_metric_ids(*, root: Path = ROOT) -> list[str]:
@@ -122,16 +113,16 @@ def resolve_covered_metrics(
     root: Path,
     package,
 ) -> tuple[list[str], list[str], list[str]]:
-    configs = list_config_metric_ids(root=root)
-    modules = list_script_metric_ids(package=package)
-
     if selected_metric:
-        if selected_metric not in configs:
+        # Check just this metric instead of listing both directories
+        if not (root / "content" / "configs" / f"{selected_metric}.json").is_file():
             raise FileNotFoundError(f'No config for metric "{selected_metric}"')
-        if selected_metric not in modules:
+        if importlib.util.find_spec(f"{package.__name__}.{selected_metric}") is None:
             raise FileNotFoundError(f'No script for metric "{selected_metric}"')
-        configs = [selected_metric]
-        modules = [selected_metric]
+        return [selected_metric], [], []
+
+    configs = list_config_metric_ids(root=root)
+    modules = list_script_metric_ids(package=package)
 
     uncovered_configs = [c for c in configs if c not in modules]
     uncovered_modules = [m for m in modules if m not in configs]
@@ -184,35 +175,41 @@ def _load_config(metric_id: str, *, root: Path = ROOT) -> dict:
 
 
 def _read_old_latest_value(metric_id: str, *, root: Path = ROOT) -> Scalar | None:
-    path = root / "content" / "latest" / f"{metric_id}.json"
-    if not path.exists():
-        return None
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-        points = data.get("points", [])
-        if not points:
-            return None
-        p = points[-1]
-        return p.get("v", p.get("s"))
+        p = get_backend(root=root).read_latest(metric_id)
     except Exception:
         return None
+    if not p:
+        return None
+    return p.get("v", p.get("s"))
 
 
-def _eval_is_critical(value: Scalar | None, alerts: list) -> bool:
+_ALERT_PRIORITY_ORDER = {"ok": 0, "info": 1, "warning": 2, "critical": 3}
+
+
+def _eval_status(value: Scalar | None, alerts: list) -> str:
+    """Highest triggered alert priority, or "ok" (same rules as statusLogic.tsx)."""
     if not isinstance(value, (int, float)) or isinstance(value, bool):
-        return False
+        return "ok"
+    status = "ok"
     for alert in alerts:
-        if not isinstance(alert, dict) or alert.get("priority") != "critical":
+        if not isinstance(alert, dict):
             continue
+        priority = alert.get("priority")
         threshold = alert.get("threshold")
         direction = alert.get("direction")
+        if priority not in _ALERT_PRIORITY_ORDER:
+            continue
         if not isinstance(threshold, (int, float)) or isinstance(threshold, bool):
             continue
-        if direction == "above" and value > threshold:
-            return True
-        if direction == "below" and value < threshold:
-            return True
-    return False
+        if (direction == "above" and value > threshold) or (direction == "below" and value < threshold):
+            if _ALERT_PRIORITY_ORDER[priority] > _ALERT_PRIORITY_ORDER[status]:
+                status = priority
+    return status
+
+
+def _eval_is_critical(value: Scalar | None, alerts: list) -> bool:
+    return _eval_status(value, alerts) == "critical"
 
 
 def _format_critical_status(value: Scalar, config: dict) -> str:
@@ -230,19 +227,24 @@ def _format_critical_status(value: Scalar, config: dict) -> str:
 def _maybe_notify_whatsapp(
     metric_id: str,
     new_point: Point,
-    old_value: Scalar | None,
+    was_critical: bool,
     *,
     root: Path = ROOT,
+    config: dict | None = None,
 ) -> None:
-    config = _load_config(metric_id, root=root)
+    if config is None:
+        config = _load_config(metric_id, root=root)
     if not config.get("notify_whatsapp"):
         return
     alerts = config.get("alerts", [])
     new_value = new_point.get("v", new_point.get("s"))
     if not _eval_is_critical(new_value, alerts):
         return
-    if _eval_is_critical(old_value, alerts):
+    if was_critical:
         return  # already critical — don't repeat
+    if "label" not in config or "meaningMap" not in config:
+        # cached config views only carry alerting keys; load the rest for the message
+        config = {**_load_config(metric_id, root=root), **config}
     label = config.get("label", metric_id)
     status_str = _format_critical_status(new_value, config)
     try:
@@ -256,15 +258,22 @@ def _maybe_notify_whatsapp(
         print(f"WhatsApp notification failed for {metric_id}: {exc}", file=os.sys.stderr)
 
 
-def run_metric(
+class RetryLater(Exception):
+    """Scripts returned the error sentinel and the caller retries them later."""
+
+    def __init__(self, metric_ids: list[str]) -> None:
+        super().__init__(", ".join(metric_ids))
+        self.metric_ids = metric_ids
+
+
+def collect_point(
     metric_id: str,
     *,
-    root: Path = ROOT,
     package_name: str = content.scripts.__name__,
     timestamp: str | None = None,
-    dry_run: bool = False,
-    print_points: bool = True,
+    retries: int = _RUNNER_MAX_RETRIES,
 ) -> Point:
+    """Run the metric script (with retries) and build its point; writes nothing."""
     _validate_metric_id(metric_id)
 
     ts = timestamp or _utc_timestamp_iso()
@@ -272,7 +281,7 @@ def run_metric(
 
     value, dictionary, meta = module.main()
 
-    for attempt in range(_RUNNER_MAX_RETRIES):
+    for attempt in range(retries):
         if not _is_error(value):
             break
         print(
@@ -283,25 +292,209 @@ def run_metric(
         time.sleep(_RUNNER_RETRY_DELAY)
         value, dictionary, meta = module.main()
 
-    point = _build_point(
+    return _build_point(
         timestamp=ts,
         value=value,
         dictionary=dictionary,
         meta=meta,
     )
 
+
+def commit_point(metric_id: str, point: Point, *, root: Path = ROOT, duration_ms: int = 0) -> None:
+    """Write a collected point: latest, tail, series, rollups, state and snapshot."""
+    value = point.get("v", point.get("s"))
+    state = read_state(metric_id, root=root)
+    config = cached_config(metric_id, state, root=root)
+    alerts = config.get("alerts", [])
+    if state is not None:
+        was_critical = state.get("status") == "critical"
+    else:
+        # no state entry yet (first run, or upgraded install): fall back to the latest file
+        was_critical = _eval_is_critical(_read_old_latest_value(metric_id, root=root), alerts)
+
+    write_latest(metric_id, point, root=root)
+    # before append_series: a missing tail is seeded from the series as it was
+    update_tail(metric_id, [point], size=config.get("tail_points", TAIL_MIN_POINTS), root=root)
+    append_series(metric_id, point, root=root)
+    update_rollups(metric_id, [point], config=config, root=root)
+    prune_raw(metric_id, config=config, root=root)
+    _maybe_notify_whatsapp(metric_id, point, was_critical, root=root, config=config)
+    status = _eval_status(value, alerts)
+    write_state(
+        metric_id,
+        {
+            "t": point["t"],
+            "value": value,
+            "status": status,
+            "config": config,
+        },
+        root=root,
+    )
+    update_snapshot(metric_id, make_entry(point, status=status, schedule=config.get("schedule")), root=root)
+    get_backend(root=root).record_run(
+        metric_id,
+        started_at=point["t"],
+        duration_ms=duration_ms,
+        status="error" if _is_error(value) else "ok",
+    )
+
+
+def run_metric(
+    metric_id: str,
+    *,
+    root: Path = ROOT,
+    package_name: str = content.scripts.__name__,
+    timestamp: str | None = None,
+    dry_run: bool = False,
+    print_points: bool = True,
+    retries_left: int | None = None,
+) -> Point:
+    """
+    Collect and write one point. With retries_left, the script runs once and an
+    error result raises RetryLater (writing nothing) while retries_left > 0.
+    """
+    started = time.monotonic()
+    point = collect_point(
+        metric_id,
+        package_name=package_name,
+        timestamp=timestamp,
+        retries=_RUNNER_MAX_RETRIES if retries_left is None else 0,
+    )
+    if retries_left and _is_error(point.get("v", point.get("s"))):
+        print(f"{metric_id} returned error, {retries_left} retries left", file=os.sys.stderr)
+        raise RetryLater([metric_id])
+
     if print_points:
         print(metric_id, json.dumps(point, indent=2))
 
     if not dry_run:
-        old_value = _read_old_latest_value(metric_id, root=root)
-        write_latest(metric_id, point, root=root)
-        append_series(metric_id, point, root=root)
-        _maybe_notify_whatsapp(metric_id, point, old_value, root=root)
+        commit_point(metric_id, point, root=root, duration_ms=int((time.monotonic() - started) * 1000))
 
     return point
 
 
+def metric_timeout(metric_id: str, *, root: Path = ROOT, default: float | None = None) -> float:
+    """Wall-clock limit for one run: the config's "timeout", else default."""
+    config = cached_config(metric_id, read_state(metric_id, root=root), root=root)
+    timeout = config.get("timeout")
+    if isinstance(timeout, (int, float)) and not isinstance(timeout, bool) and timeout > 0:
+        return float(timeout)
+    return default if default is not None else _RUNNER_TIMEOUT_SECONDS
+
+
+def _collect_child(conn, metric_id: str, package_name: str, timestamp: str | None) -> None:
+    """Body of a --parallel child: collect one point and send it to the parent."""
+    os.setpgid(0, 0)  # own process group, so a timeout also stops the script's children
+    try:
+        conn.send(("ok", collect_point(metric_id, package_name=package_name, timestamp=timestamp)))
+    except BaseException as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def _kill_group(proc) -> None:
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    proc.join()
+
+
+def collect_parallel(
+    metric_ids: list[str],
+    *,
+    workers: int,
+    root: Path = ROOT,
+    package_name: str = content.scripts.__name__,
+    timestamp: str | None = None,
+    timeout: float | None = None,
+) -> Iterator[tuple[str, Point | None, str | None, int]]:
+    """
+    Collect points in forked child processes, at most `workers` at a time.
+    Yields (metric_id, point, error, duration_ms) in completion order; a child
+    still running after its metric_timeout() is killed with its process group.
+    """
+    ctx = multiprocessing.get_context("fork")
+    pending = deque(metric_ids)
+    # parent end of the pipe -> (metric_id, process, started, deadline)
+    running: dict = {}
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                metric_id = pending.popleft()
+                recv_conn, send_conn = ctx.Pipe(duplex=False)
+                proc = ctx.Process(
+                    target=_collect_child,
+                    args=(send_conn, metric_id, package_name, timestamp),
+                    name=f"collect-{metric_id}",
+                )
+                proc.start()
+                send_conn.close()
+                started = time.monotonic()
+                running[recv_conn] = (metric_id, proc, started, started + metric_timeout(metric_id, root=root, default=timeout))
+
+            next_deadline = min(deadline for _, _, _, deadline in running.values())
+            ready = wait(list(running), timeout=max(0.0, next_deadline - time.monotonic()))
+            for conn in ready:
+                metric_id, proc, started, _ = running.pop(conn)
+                try:
+                    kind, payload = conn.recv()
+                except EOFError:
+                    proc.join()
+                    kind, payload = "error", f"child exited with code {proc.exitcode}"
+                conn.close()
+                proc.join()
+                duration_ms = int((time.monotonic() - started) * 1000)
+                if kind == "ok":
+                    yield metric_id, payload, None, duration_ms
+                else:
+                    yield metric_id, None, payload, duration_ms
+
+            now = time.monotonic()
+            for conn, (metric_id, proc, started, deadline) in list(running.items()):
+                if deadline <= now:
+                    del running[conn]
+                    _kill_group(proc)
+                    conn.close()
+                    yield metric_id, None, f"timed out after {deadline - started:.0f}s", int((now - started) * 1000)
+    finally:
+        for conn, (_, proc, _, _) in running.items():
+            _kill_group(proc)
+            conn.close()
+
+
+def _record_runs(runs: list[dict], *, root: Path = ROOT) -> None:
+    """Add runs the scheduler did not start to the run history, and publish them."""
+    if not runs:
+        return
+    history = RunHistory(root=root)
+    try:
+        with history.batch():
+            for run in runs:
+                history.record(**run, source="runner")
+        history.publish()
+    except (sqlite3.Error, OSError) as e:
+        print(f"Warning: could not record run history: {e}", file=os.sys.stderr)
+    finally:
+        history.close()
+
+
+def _run_record(metric_id: str, started: datetime, *, point: Point | None = None, error: str | None = None) -> dict:
+    if error is not None:
+        status = "failed"
+    else:
+        status = "error" if _is_error(point.get("v", point.get("s"))) else "ok"
+    return {
+        "metric_id": metric_id,
+        "started": started,
+        "ended": datetime.now(timezone.utc),
+        "exit_code": 0 if error is None else 1,
+        "status": status,
+        "output": error,
+    }
+
+
 def run_metrics(
     selected_metric: str | None = None,
     *,
@@ -310,7 +503,16 @@ def run_metrics(
     dry_run: bool = False,
     print_points: bool = True,
     timestamp: str | None = None,
+    parallel: int = 0,
+    timeout: float | None = None,
+    retries_left: int | None = None,
 ) -> dict[str, Point]:
+    """
+    Run the covered metrics (or just selected_metric) and write their points.
+    With retries_left, metrics whose script returned the error sentinel are
+    left unwritten and raised together as RetryLater after the others are written.
+    Without it (not started by the scheduler) the runs are added to the run history.
+    """
     covered, uncovered_configs, uncovered_modules = resolve_covered_metrics(
         selected_metric=selected_metric,
         root=root,
@@ -329,19 +531,67 @@ def run_metrics(
         )
 
     results: dict[str, Point] = {}
-    for metric_id in covered:
-        try:
-            results[metric_id] = run_metric(
-                metric_id,
+    # Run history, when the scheduler (which passes retries_left) does not keep it
+    runs: list[dict] | None = [] if retries_left is None and not dry_run else None
+    if parallel > 0:
+        # Children only run scripts; this process is the single writer.
+        with get_backend(root=root).batch():
+            for metric_id, point, error, duration_ms in collect_parallel(
+                covered,
+                workers=parallel,
                 root=root,
                 package_name=package.__name__,
                 timestamp=timestamp,
-                dry_run=dry_run,
-                print_points=print_points,
-            )
-        except Exception as e:
-            print(f"Error: metric '{metric_id}' failed: {e}", file=os.sys.stderr)
-
+                timeout=timeout,
+            ):
+                started = datetime.now(timezone.utc) - timedelta(milliseconds=duration_ms)
+                if error is not None:
+                    print(f"Error: metric '{metric_id}' failed: {error}", file=os.sys.stderr)
+                    if runs is not None:
+                        runs.append(_run_record(metric_id, started, error=error))
+                    continue
+                if print_points:
+                    print(metric_id, json.dumps(point, indent=2))
+                try:
+                    if not dry_run:
+                        commit_point(metric_id, point, root=root, duration_ms=duration_ms)
+                    results[metric_id] = point
+                    if runs is not None:
+                        runs.append(_run_record(metric_id, started, point=point))
+                except Exception as e:
+                    print(f"Error: metric '{metric_id}' failed: {e}", file=os.sys.stderr)
+                    if runs is not None:
+                        runs.append(_run_record(metric_id, started, error=str(e)))
+        _record_runs(runs or [], root=root)
+        return results
+
+    deferred: list[str] = []
+    with get_backend(root=root).batch():
+        for metric_id in covered:
+            started = datetime.now(timezone.utc)
+            try:
+                results[metric_id] = run_metric(
+                    metric_id,
+                    root=root,
+                    package_name=package.__name__,
+                    timestamp=timestamp,
+                    dry_run=dry_run,
+                    print_points=print_points,
+                    retries_left=retries_left,
+                )
+            except RetryLater:
+                deferred.append(metric_id)
+            except Exception as e:
+                print(f"Error: metric '{metric_id}' failed: {e}", file=os.sys.stderr)
+                if runs is not None:
+                    runs.append(_run_record(metric_id, started, error=str(e)))
+            else:
+                if runs is not None:
+                    runs.append(_run_record(metric_id, started, point=results[metric_id]))
+    _record_runs(runs or [], root=root)
+
+    if deferred:
+        raise RetryLater(deferred)
     return results
 
 
@@ -349,18 +599,49 @@ def _build_arg_parser() -> argparse.ArgumentParser:
     ap = argparse.ArgumentParser()
     ap.add_argument("--metric", help="Run only this metric_id.")
     ap.add_argument("--dry-run", action="store_true", help="Do not write latest/series files.")
+    ap.add_argument(
+        "--parallel",
+        type=int,
+        default=_RUNNER_PARALLEL,
+        metavar="N",
+        help="Run up to N metric scripts at once, each in its own process (default: 0, one after another in-process).",
+    )
+    ap.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help=f"With --parallel: stop a script after this long unless its config sets \"timeout\" (default: {_RUNNER_TIMEOUT_SECONDS:g}).",
+    )
+    ap.add_argument(
+        "--retries-left",
+        type=int,
+        default=None,
+        metavar="N",
+        help=f"Run each script once; on an error result with N > 0, write nothing and exit {EXIT_RETRY} so the caller retries.",
+    )
     return ap
 
 
 def main(argv: list[str] | None = None) -> int:
-    args = _build_arg_parser().parse_args(argv)
-    run_metrics(
-        selected_metric=args.metric,
-        root=ROOT,
-        package=content.scripts,
-        dry_run=args.dry_run,
-        print_points=True,
-    )
+    ap = _build_arg_parser()
+    args = ap.parse_args(argv)
+    if args.retries_left is not None and args.parallel > 0:
+        ap.error("--retries-left cannot be combined with --parallel")
+    try:
+        run_metrics(
+            selected_metric=args.metric,
+            root=ROOT,
+            package=content.scripts,
+            dry_run=args.dry_run,
+            print_points=True,
+            parallel=args.parallel,
+            timeout=args.timeout,
+            retries_left=args.retries_left,
+        )
+    except RetryLater as e:
+        print(f"Retry later: {e}", file=os.sys.stderr)
+        return EXIT_RETRY
     return 0
 
 
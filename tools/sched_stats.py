@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+sched_stats.py
+
+Runtime metrics of the scheduler itself, so it is visible whether the worker
+and start-rate settings keep up as metrics are added. Per job it records:
+
+- lateness_ms     start time minus the time the run was due (next_run or retry_at)
+- queue_wait_ms   time spent in the ready queue waiting for a worker slot
+- duration_ms     run time, as recorded in the schedule
+- runs by exit code, coalesced (skipped) runs, and starts held back by the
+  start-rate limiter ("rate"), host pressure ("pressure") or a full
+  concurrency budget ("slots")
+
+Histograms are rolling (the last DASH_SCHED_STATS_WINDOW_SECONDS, in
+STATS_SLOTS slices) in the JSON file and cumulative since startup in the
+OpenMetrics file, as Prometheus expects:
+
+  content/status/scheduler.json
+  {
+    "generated_at": "<iso>", "started_at": "<iso>", "window_seconds": 3600,
+    "gauges": {"running": 2, "ready": 0, ...},
+    "overall": {"lateness_ms": {"count": 12, "p50": 40, "p90": 250, "p99": 900, "max": 912,
+                                "buckets": {"10": 1, ..., "+Inf": 0}}, ...},
+    "deferred": {"rate": 3},
+    "jobs": {"foo_bar_baz": {"lateness_ms": {...}, "queue_wait_ms": {...}, "duration_ms": {...},
+                             "exits": {"0": 11, "124": 1}, "coalesced": 0, "deferred": {"rate": 1}}}
+  }
+
+  content/status/scheduler.prom   (OpenMetrics text, values in seconds)
+
+Import:
+  from tools.sched_stats import SchedulerStats
+  stats = SchedulerStats()
+  stats.observe("duration_ms", "foo_bar_baz", 812)
+  stats.count("exits", "foo_bar_baz", "0")
+  stats.publish({"running": 2})
+"""
+import os
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from tools.artifacts import publish_json
+from tools.group_commit import write_atomic
+
+ROOT = Path(__file__).resolve().parents[1]
+
+STATS_WINDOW_SECONDS = float(os.environ.get("DASH_SCHED_STATS_WINDOW_SECONDS", "3600"))
+STATS_SLOTS = 12
+
+# Upper bucket bounds in ms (+Inf is implicit)
+BUCKETS_MS: Tuple[float, ...] = (
+    10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 300000, 900000, 3600000,
+)
+
+HISTOGRAMS = ("lateness_ms", "queue_wait_ms", "duration_ms")
+COUNTERS = ("exits", "coalesced", "deferred")
+
+_PROM_PREFIX = "dash_scheduler"
+_PROM_HELP = {
+    "lateness_ms": "Start time minus due time of scheduled runs.",
+    "queue_wait_ms": "Time runs waited in the ready queue for a worker slot.",
+    "duration_ms": "Run time of finished runs.",
+    "exits": "Finished runs by exit code.",
+    "coalesced": "Due runs skipped because the previous run was still going.",
+    "deferred": "Starts held back, by reason (rate, pressure, slots).",
+}
+_PROM_NAMES = {
+    "lateness_ms": "lateness_seconds",
+    "queue_wait_ms": "queue_wait_seconds",
+    "duration_ms": "run_duration_seconds",
+    "exits": "runs",
+    "coalesced": "coalesced_runs",
+    "deferred": "deferred_starts",
+}
+_PROM_LABELS = {"exits": "exit", "deferred": "reason"}
+
+
+def status_json_path(*, root: Path = ROOT) -> Path:
+    return root / "content" / "status" / "scheduler.json"
+
+
+def status_prom_path(*, root: Path = ROOT) -> Path:
+    return root / "content" / "status" / "scheduler.prom"
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class Histogram:
+    """Fixed-bucket histogram over BUCKETS_MS."""
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max: Optional[float] = None
+
+    def observe(self, value: float) -> None:
+        value = max(0.0, float(value))
+        self.counts[bisect_left(BUCKETS_MS, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "Histogram") -> None:
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.sum += other.sum
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate, interpolating linearly inside the bucket (capped at the max seen)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = BUCKETS_MS[i - 1] if i > 0 else 0.0
+                upper = BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / n)
+            seen += n
+        return self.max
+
+    def summary(self) -> dict:
+        def ms(value: Optional[float]) -> Optional[float]:
+            return None if value is None else round(value, 1)
+
+        buckets = {str(bound): n for bound, n in zip(BUCKETS_MS, self.counts)}
+        buckets["+Inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "p50": ms(self.quantile(0.5)),
+            "p90": ms(self.quantile(0.9)),
+            "p99": ms(self.quantile(0.99)),
+            "max": ms(self.max),
+            "buckets": buckets,
+        }
+
+
+class RollingHistogram:
+    """The last STATS_WINDOW_SECONDS of observations, kept as STATS_SLOTS slices."""
+
+    def __init__(self) -> None:
+        self.slot_seconds = STATS_WINDOW_SECONDS / STATS_SLOTS
+        self.slots: Dict[int, Histogram] = {}
+
+    def observe(self, value: float, now: float) -> None:
+        slot = int(now // self.slot_seconds)
+        hist = self.slots.get(slot)
+        if hist is None:
+            hist = self.slots[slot] = Histogram()
+            for old in [s for s in self.slots if s <= slot - STATS_SLOTS]:
+                del self.slots[old]
+        hist.observe(value)
+
+    def window(self, now: float) -> Histogram:
+        first = int(now // self.slot_seconds) - STATS_SLOTS + 1
+        merged = Histogram()
+        for slot, hist in self.slots.items():
+            if slot >= first:
+                merged.merge(hist)
+        return merged
+
+
+class SchedulerStats:
+    def __init__(self) -> None:
+        self.started_at = time.time()
+        # (histogram name, metric_id) -> histograms
+        self.rolling: Dict[Tuple[str, str], RollingHistogram] = {}
+        self.totals: Dict[Tuple[str, str], Histogram] = {}
+        # (counter name, metric_id, label) -> count since startup
+        self.counters: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self.dirty = False
+
+    def observe(self, name: str, metric_id: str, value_ms: float) -> None:
+        key = (name, metric_id)
+        if key not in self.rolling:
+            self.rolling[key] = RollingHistogram()
+            self.totals[key] = Histogram()
+        self.rolling[key].observe(value_ms, time.time())
+        self.totals[key].observe(value_ms)
+        self.dirty = True
+
+    def count(self, name: str, metric_id: str, label: str = "") -> None:
+        self.counters[(name, metric_id, label)] += 1
+        self.dirty = True
+
+    def forget(self, metric_id: str) -> None:
+        """Drop a removed job's series."""
+        for key in [k for k in self.rolling if k[1] == metric_id]:
+            del self.rolling[key]
+            del self.totals[key]
+        for key in [k for k in self.counters if k[1] == metric_id]:
+            del self.counters[key]
+        self.dirty = True
+
+    def to_json(self, gauges: Dict[str, float], now: float) -> dict:
+        jobs: Dict[str, dict] = defaultdict(lambda: {"exits": {}, "coalesced": 0, "deferred": {}})
+        overall = {name: Histogram() for name in HISTOGRAMS}
+        for (name, metric_id), rolling in sorted(self.rolling.items()):
+            hist = rolling.window(now)
+            overall[name].merge(hist)
+            jobs[metric_id][name] = hist.summary()
+        deferred: Dict[str, int] = defaultdict(int)
+        for (name, metric_id, label), n in sorted(self.counters.items()):
+            job = jobs[metric_id]
+            if name == "coalesced":
+                job["coalesced"] += n
+            else:
+                job[name][label] = job[name].get(label, 0) + n
+            if name == "deferred":
+                deferred[label] += n
+        return {
+            "generated_at": _iso(now),
+            "started_at": _iso(self.started_at),
+            "window_seconds": STATS_WINDOW_SECONDS,
+            "gauges": gauges,
+            "overall": {name: hist.summary() for name, hist in overall.items()},
+            "deferred": dict(deferred),
+            "jobs": dict(sorted(jobs.items())),
+        }
+
+    def to_openmetrics(self, gauges: Dict[str, float]) -> str:
+        def labels(**kv: str) -> str:
+            parts = []
+            for k, v in kv.items():
+                escaped = str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+                parts.append(f'{k}="{escaped}"')
+            return "{" + ",".join(parts) + "}"
+
+        out: List[str] = []
+        for name in HISTOGRAMS:
+            metric = f"{_PROM_PREFIX}_{_PROM_NAMES[name]}"
+            out.append(f"# TYPE {metric} histogram")
+            out.append(f"# UNIT {metric} seconds")
+            out.append(f"# HELP {metric} {_PROM_HELP[name]}")
+            for (hist_name, metric_id), hist in sorted(self.totals.items()):
+                if hist_name != name:
+                    continue
+                cumulative = 0
+                for bound, n in zip(BUCKETS_MS, hist.counts):
+                    cumulative += n
+                    out.append(f"{metric}_bucket{labels(metric_id=metric_id, le=f'{bound / 1000:g}')} {cumulative}")
+                out.append(f"{metric}_bucket{labels(metric_id=metric_id, le='+Inf')} {hist.count}")
+                out.append(f"{metric}_count{labels(metric_id=metric_id)} {hist.count}")
+                out.append(f"{metric}_sum{labels(metric_id=metric_id)} {hist.sum / 1000:.6g}")
+        for name in COUNTERS:
+            metric = f"{_PROM_PREFIX}_{_PROM_NAMES[name]}"
+            out.append(f"# TYPE {metric} counter")
+            out.append(f"# HELP {metric} {_PROM_HELP[name]}")
+            for (counter, metric_id, label), n in sorted(self.counters.items()):
+                if counter != name:
+                    continue
+                kv = {"metric_id": metric_id}
+                if name in _PROM_LABELS:
+                    kv[_PROM_LABELS[name]] = label
+                out.append(f"{metric}_total{labels(**kv)} {n}")
+        for name, value in sorted(gauges.items()):
+            metric = f"{_PROM_PREFIX}_{name}"
+            out.append(f"# TYPE {metric} gauge")
+            out.append(f"{metric} {value:g}")
+        out.append("# EOF")
+        return "\n".join(out) + "\n"
+
+    def publish(self, gauges: Dict[str, float], *, root: Path = ROOT) -> None:
+        """Write content/status/scheduler.json and scheduler.prom."""
+        now = time.time()
+        self.dirty = False
+        publish_json(status_json_path(root=root), self.to_json(gauges, now), indent=None, root=root)
+        write_atomic(status_prom_path(root=root), self.to_openmetrics(gauges))
@@ -4,20 +4,50 @@ scheduler.py
 
 A low-complexity scheduler daemon for Dash metric scripts.
 
-- Reads configs from:   ROOT/content/configs/*.json
+- Reads configs from:   ROOT/content/configs/*.json (watched with inotify, see
+                        tools/config_watch.py; only changed files are re-read)
 - Spawns runner:        python ROOT/runner.py --metric <metric_id>
-- Stores schedule MD:   ROOT/content/prompts/orchestrator.md
-- Stores logs TXT:      ROOT/content/prompts/orchestrator.txt
+- Stores schedule MD:   ROOT/content/prompts/orchestrator.md, and the same
+                        schedule as JSON in ROOT/content/status/schedule.json
+- Stores logs TXT:      ROOT/content/prompts/orchestrator.txt, plus JSON lines in
+                        ROOT/content/status/scheduler.jsonl (buffered and rotated,
+                        see tools/run_log.py); each run's own output is kept
+                        in ROOT/content/store/output/<metric_id>.txt
 
 Key behavior:
 - Each metric has its own cadence (weekly..minutely).
 - Uses a min-heap on next_run (no expanded timetable).
-- Runs jobs in background as subprocesses with bounded concurrency.
+- Event-driven: sleeps in a selector until the next heap deadline, timeout or
+  housekeeping timer, a child exit (SIGCHLD, or a pool worker's pipe) or a
+  signal, so finished runs are reaped and their slots refilled immediately.
+- Runs jobs in background as subprocesses with bounded concurrency, forked from
+  a pool of warm runner workers (tools/worker_pool.py; DASH_SCHED_POOL=0 to
+  start a fresh interpreter per run).
 - Spreads process starts using:
-  - alignment to schedule boundaries
-  - stable per-metric jitter
+  - a stable per-metric phase within the interval, placed where the expected
+    concurrency (from recorded run durations) is lowest
   - a start-rate limiter (max starts per second)
+- Due runs wait in a ready queue for a free slot and start in order of config
+  "priority", currently-critical metrics first, then time waited.
 - Coalesces overlaps: if a metric is still running when due again, it skips that run.
+- Checkpoints job state to ROOT/content/store/scheduler_state.json and reloads
+  it on startup; runs missed while down are caught up once (config "catchup"),
+  spread over a few minutes.
+- Enforces a per-run timeout (config "timeout", else a fraction of the interval):
+  the run's process group gets SIGTERM, then SIGKILL after a grace period, and
+  the run is recorded with exit code 124 and gives up its worker slot at once.
+- Publishes its own metrics (lateness, ready-queue wait and duration
+  histograms, exit codes, coalesced runs, held-back starts) to
+  ROOT/content/status/scheduler.json and scheduler.prom (OpenMetrics), and
+  each run's CPU, peak memory, block I/O and context switches (wait4) to
+  ROOT/content/store/run_usage.jsonl, summarized per metric in
+  ROOT/content/status/resources.json (tools/run_resources.py).
+- Records every run (start, end, exit code, attempt, outcome, output tail) in
+  ROOT/content/store/runs.sqlite and publishes each metric's recent runs to
+  ROOT/content/status/runs/<metric_id>.json (tools/run_history.py).
+- Retries error results from the queue: the runner gets --retries-left and
+  exits 75 instead of sleeping; the run is re-queued with exponential backoff
+  and jitter, always before the metric's next regular run.
 
 Important:
 - This expects runner.py to support:  --metric <metric_id>
@@ -27,52 +57,152 @@ Important:
 import hashlib
 import heapq
 import json
+import math
 import os
+import random
+import selectors
 import signal
+import sqlite3
 import subprocess
 import sys
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 # -----------------------------
 # Config
 # -----------------------------
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))  # also support `python tools/scheduler.py`
+
+from tools.artifacts import publish_json  # noqa: E402
+from tools.config_watch import ConfigWatcher  # noqa: E402
+from tools.group_commit import write_atomic  # noqa: E402
+from tools.host_load import HostLoad, read_host_load  # noqa: E402
+from tools.run_history import RunHistory, is_error_value  # noqa: E402
+from tools.run_log import EventLog, OutputRing  # noqa: E402
+from tools.run_resources import ResourceLedger, usage_from_rusage  # noqa: E402
+from tools.sched_stats import SchedulerStats  # noqa: E402
+from tools.schedules import SCHEDULE_SECONDS  # noqa: E402
+from tools.state_index import read_state  # noqa: E402
+from tools.status_snapshot import SNAPSHOT_REFRESH_SECONDS, refresh_staleness  # noqa: E402
+from tools.worker_pool import PoolJob, WorkerPool  # noqa: E402
 
 CONFIG_DIR = ROOT / "content" / "configs"
 PROMPTS_DIR = ROOT / "content" / "prompts"
 SCHEDULE_MD_PATH = PROMPTS_DIR / "scheduler.md"
+# The same schedule as JSON, for the frontend and external tools
+SCHEDULE_JSON_PATH = ROOT / "content" / "status" / "schedule.json"
 LOG_TXT_PATH = PROMPTS_DIR / "scheduler.txt"
+LOG_JSONL_PATH = ROOT / "content" / "status" / "scheduler.jsonl"
+# Last output (stdout + stderr, tail) of each metric's most recent run
+OUTPUT_DIR = ROOT / "content" / "store" / "output"
+# Output tail included in the log record of a failed run
+OUTPUT_LOG_TAIL_BYTES = 1024
 RUNNER_PATH = ROOT / "tools" / "runner.py"
 
 # Concurrency controls
 MAX_WORKERS = int(os.environ.get("DASH_SCHED_MAX_WORKERS", "4"))
 MAX_STARTS_PER_SEC = int(os.environ.get("DASH_SCHED_MAX_STARTS_PER_SEC", "2"))
+
+# Adaptive concurrency: the budget of concurrent runs moves between
+# MIN_WORKERS and MAX_WORKERS with host load, re-read every ADAPT_SECONDS
+# (AIMD: halve under pressure, add one when calm). A running job uses its
+# recorded CPU share of the budget (CPU time / duration, at least
+# MIN_JOB_WEIGHT; 1 until measured), so I/O-bound scripts weigh less than
+# CPU-bound ones. DASH_SCHED_ADAPTIVE=0 keeps MAX_WORKERS fixed.
+ADAPTIVE = os.environ.get("DASH_SCHED_ADAPTIVE", "1") == "1"
+MIN_WORKERS = max(1, int(os.environ.get("DASH_SCHED_MIN_WORKERS", "1")))
+ADAPT_SECONDS = float(os.environ.get("DASH_SCHED_ADAPT_SECONDS", "10"))
+# Pressure: 1-minute load per CPU, or any PSI "some avg10" percentage
+# (tools/host_load.py), at or above its threshold. Calm: all below
+# CALM_FRACTION of their thresholds.
+LOAD_HIGH = float(os.environ.get("DASH_SCHED_LOAD_HIGH", "1.0"))
+PSI_HIGH = float(os.environ.get("DASH_SCHED_PSI_HIGH", "20"))
+CALM_FRACTION = 0.75
+MIN_JOB_WEIGHT = float(os.environ.get("DASH_SCHED_MIN_JOB_WEIGHT", "0.25"))
+# Smoothing of the per-job CPU share across runs (weight of the newest run)
+CPU_SHARE_ALPHA = 0.5
+# Under pressure, ready runs scoring below this wait (the score grows while
+# they wait, so deferred runs still start eventually; critical ones never wait).
+# Above the default priority 0, so unprioritised runs back off by default.
+PRESSURE_MIN_SCORE = float(os.environ.get("DASH_SCHED_PRESSURE_MIN_SCORE", "1"))
 MAX_JITTER_SECONDS = int(os.environ.get("DASH_SCHED_MAX_JITTER_SECONDS", "10"))
 
+# Phases: each job runs at a fixed offset within its interval, chosen when the
+# job is first seen to flatten expected concurrency (using known durations)
+# and kept in the state checkpoint. DASH_SCHED_PHASES=0 restores "interval
+# boundary + stable jitter of at most MAX_JITTER_SECONDS".
+PHASES_ENABLED = os.environ.get("DASH_SCHED_PHASES", "1") == "1"
+PHASE_CANDIDATES = int(os.environ.get("DASH_SCHED_PHASE_CANDIDATES", "120"))
+# Assumed run length for jobs without a recorded duration, and the minimum
+# footprint of any run (a process start is not free)
+DEFAULT_DURATION_SECONDS = float(os.environ.get("DASH_SCHED_DEFAULT_DURATION_SECONDS", "5"))
+MIN_PHASE_DURATION_SECONDS = 1.0
+
+# Timeouts: config "timeout" wins; otherwise this fraction of the schedule
+# interval, capped. A timed-out run gets SIGTERM, then SIGKILL after the grace.
+TIMEOUT_FRACTION = float(os.environ.get("DASH_SCHED_TIMEOUT_FRACTION", "0.8"))
+MAX_TIMEOUT_SECONDS = float(os.environ.get("DASH_SCHED_MAX_TIMEOUT_SECONDS", "3600"))
+KILL_GRACE_SECONDS = float(os.environ.get("DASH_SCHED_KILL_GRACE_SECONDS", "10"))
+
+# Exit code recorded for a run stopped by its timeout (as coreutils timeout(1))
+TIMEOUT_EXIT = 124
+
+# Retries of runs whose script returned the error sentinel (runner exit 75).
+# Backoff doubles per attempt from the base, with jitter, up to the cap.
+MAX_RETRIES = int(os.environ.get("DASH_SCHED_MAX_RETRIES", os.environ.get("DASH_RUNNER_MAX_RETRIES", "2")))
+RETRY_BASE_SECONDS = float(os.environ.get("DASH_SCHED_RETRY_BASE_SECONDS", os.environ.get("DASH_RUNNER_RETRY_DELAY", "30")))
+RETRY_MAX_SECONDS = float(os.environ.get("DASH_SCHED_RETRY_MAX_SECONDS", "600"))
+
+# Runner exit code for "error result, retry me" (tools.runner.EXIT_RETRY)
+RETRY_EXIT = 75
+
+# Ready queue: due runs wait here for a slot and start in order of
+#   config "priority" + CRITICAL_BOOST (metric currently critical) + seconds waited / AGING_SECONDS
+# so urgent metrics go first and nothing waits forever.
+CRITICAL_BOOST = float(os.environ.get("DASH_SCHED_CRITICAL_BOOST", "100"))
+AGING_SECONDS = float(os.environ.get("DASH_SCHED_PRIORITY_AGING_SECONDS", "60"))
+# Number of recent ready-queue waits kept for the schedule summary
+WAIT_SAMPLES = 200
+
+# Scheduler self-metrics (tools/sched_stats.py): content/status/scheduler.json
+# and scheduler.prom, rewritten at most this often while something changed
+STATS_PUBLISH_SECONDS = float(os.environ.get("DASH_SCHED_STATS_PUBLISH_SECONDS", "60"))
+
+# Job state checkpoint, reloaded on startup (warm restart)
+STATE_PATH = ROOT / "content" / "store" / "scheduler_state.json"
+STATE_CHECKPOINT_SECONDS = float(os.environ.get("DASH_SCHED_STATE_CHECKPOINT_SECONDS", "60"))
+STATE_VERSION = 1
+
+# Runs missed while the scheduler was down: config "catchup" is "once" (run
+# soon after startup) or "skip" (wait for the next boundary). Catch-up runs
+# are spread evenly over CATCHUP_SPREAD_SECONDS.
+CATCHUP_POLICIES = ("once", "skip")
+CATCHUP_DEFAULT_MIN_INTERVAL_SECONDS = int(os.environ.get("DASH_SCHED_CATCHUP_MIN_INTERVAL_SECONDS", "3600"))
+CATCHUP_SPREAD_SECONDS = float(os.environ.get("DASH_SCHED_CATCHUP_SPREAD_SECONDS", "300"))
+
 # Reload / housekeeping
+# Configs are watched with inotify (tools/config_watch.py); without it they are
+# stat()-polled every CONFIG_POLL_SECONDS. A full rescan runs every
+# CONFIG_RESCAN_SECONDS as a safety net.
 CONFIG_POLL_SECONDS = float(os.environ.get("DASH_SCHED_CONFIG_POLL_SECONDS", "30"))
+CONFIG_RESCAN_SECONDS = float(os.environ.get("DASH_SCHED_CONFIG_RESCAN_SECONDS", "3600"))
 SCHEDULE_MD_REFRESH_SECONDS = float(os.environ.get("DASH_SCHED_MD_REFRESH_SECONDS", "60"))
-LOOP_TICK_SECONDS = float(os.environ.get("DASH_SCHED_LOOP_TICK_SECONDS", "1.0"))
+# Longest the event loop sleeps without a timer, child exit or signal
+LOOP_TICK_SECONDS = float(os.environ.get("DASH_SCHED_LOOP_TICK_SECONDS", "60"))
 
 # If true, never actually spawn subprocesses (still writes schedule + logs planned runs)
 DRY_RUN = os.environ.get("DASH_SCHED_DRY_RUN", "0") == "1"
 
-SCHEDULE_SECONDS: Dict[str, int] = {
-    "weekly": 7 * 24 * 3600,
-    "bi-daily": 2 * 24 * 3600,
-    "daily": 24 * 3600,
-    "twice-daily": 12 * 3600,
-    "hourly": 3600,
-    "half-hourly": 1800,
-    "quarter-hourly": 900,
-    "five-minutely": 300,
-    "minutely": 60,
-}
+# Run jobs on pre-forked runner workers (tools/worker_pool.py) instead of a
+# fresh interpreter per run
+POOL_ENABLED = os.environ.get("DASH_SCHED_POOL", "1") == "1"
 
 # -----------------------------
 # Model
@@ -95,13 +225,13 @@ def load_json(path: Path) -> dict:
         return json.load(f)
 
 
-def metric_label(metric_id: str) -> str:
+def metric_label(metric_id: str, config: Optional[dict] = None) -> str:
     """
-    Read label from ROOT/content/configs/<metric_id>.json.
-    Fallback to metric_id if missing/unreadable (should be rare).
+    Label from the metric's config (read from ROOT/content/configs/<metric_id>.json
+    unless given). Fallback to metric_id if missing/unreadable (should be rare).
     """
     try:
-        obj = load_json(CONFIG_DIR / f"{metric_id}.json")
+        obj = config if config is not None else load_json(CONFIG_DIR / f"{metric_id}.json")
         lab = obj.get("label")
         return lab if isinstance(lab, str) and lab.strip() else metric_id
     except Exception:
@@ -143,16 +273,15 @@ def ensure_dirs() -> None:
     PROMPTS_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def append_log(line: str) -> None:
+EVENT_LOG = EventLog(LOG_TXT_PATH, LOG_JSONL_PATH)
+
+
+def append_log(line: str, event: str = "log", **fields: object) -> None:
     """
-    Plain text log file append, timestamped.
-    Interleaving from subprocess output is acceptable; this is an ops log.
+    Timestamped log line (scheduler.txt), and a JSON record of the event with
+    its fields (scheduler.jsonl). Buffered: see EVENT_LOG.flush().
     """
-    ensure_dirs()
-    ts = iso(now_utc())
-    LOG_TXT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with LOG_TXT_PATH.open("a", encoding="utf-8") as f:
-        f.write(f"{ts} {line.rstrip()}\n")
+    EVENT_LOG.write(line, event=event, **fields)
 
 
 def stable_jitter_seconds(metric_id: str, max_jitter: int) -> int:
@@ -168,16 +297,155 @@ def stable_jitter_seconds(metric_id: str, max_jitter: int) -> int:
     return n % (max_jitter + 1)
 
 
-def align_next_boundary(after: datetime, interval_s: int) -> datetime:
-    """
-    Align to the next interval boundary relative to Unix epoch.
-    This avoids drift and keeps 'five-minutely' etc. on clean boundaries.
-    """
+def next_phase_time(after: datetime, interval_s: int, phase_s: float) -> datetime:
+    """First time t > after with (t - phase_s) on an interval boundary (relative to Unix epoch)."""
     if interval_s <= 0:
         return after
-    epoch = int(after.timestamp())
-    next_epoch = ((epoch // interval_s) + 1) * interval_s
-    return datetime.fromtimestamp(next_epoch, tz=timezone.utc)
+    k = math.floor((after.timestamp() - phase_s) / interval_s) + 1
+    return datetime.fromtimestamp(k * interval_s + phase_s, tz=timezone.utc)
+
+
+class PhasePlanner:
+    """
+    Places job phases where the expected concurrency is lowest.
+
+    For each interval it places into, the planner keeps a histogram of the
+    expected busy seconds of all placed jobs, folded onto that interval with
+    PHASE_CANDIDATES buckets. A job that runs less often than the interval
+    counts with weight interval / its interval (it only meets some runs); one
+    that runs more often than a bucket is wide adds the same load everywhere
+    and is left out. A new job takes the least loaded window of buckets, with
+    ties going to the offset nearest its stable hash, so placement is
+    deterministic.
+    """
+
+    def __init__(self, placed: List[Tuple[int, float, float]]) -> None:
+        self._placed: List[Tuple[int, float, float]] = list(placed)  # (interval_s, phase_s, duration_s)
+        self._loads: Dict[int, List[float]] = {}
+
+    @staticmethod
+    def _buckets(interval_s: int) -> int:
+        return max(1, min(PHASE_CANDIDATES, interval_s))
+
+    def _add(self, load: List[float], interval_s: int, job: Tuple[int, float, float]) -> None:
+        other_interval, other_phase, duration_s = job
+        n = len(load)
+        width = interval_s / n
+        if other_interval >= interval_s:
+            weight, starts = interval_s / other_interval, [other_phase % interval_s]
+        elif other_interval < width:
+            return
+        else:
+            weight = 1.0
+            starts = [(other_phase + m * other_interval) % interval_s for m in range(math.ceil(interval_s / other_interval))]
+        duration_s = min(max(duration_s, MIN_PHASE_DURATION_SECONDS), interval_s)
+        for start in starts:
+            first = int(start // width)
+            for b in range(math.ceil(duration_s / width)):
+                load[(first + b) % n] += weight * min(width, duration_s - b * width)
+
+    def _load(self, interval_s: int) -> List[float]:
+        load = self._loads.get(interval_s)
+        if load is None:
+            load = self._loads[interval_s] = [0.0] * self._buckets(interval_s)
+            for job in self._placed:
+                self._add(load, interval_s, job)
+        return load
+
+    def place(self, metric_id: str, interval_s: int, duration_s: float) -> float:
+        """Phase (seconds into the interval) for a new job; the job counts as placed afterwards."""
+        if not PHASES_ENABLED or interval_s <= 0:
+            phase = float(stable_jitter_seconds(metric_id, MAX_JITTER_SECONDS))
+        else:
+            load = self._load(interval_s)
+            n = len(load)
+            width = interval_s / n
+            digest = hashlib.sha1(metric_id.encode("utf-8")).digest()
+            preferred = int.from_bytes(digest[:4], byteorder="big") % interval_s
+            span = math.ceil(min(max(duration_s, MIN_PHASE_DURATION_SECONDS), interval_s) / width)
+            home = int(preferred // width)
+            best_k, best_cost = home, None
+            for i in range(n):
+                k = (home + i) % n
+                cost = sum(load[(k + b) % n] for b in range(span))
+                if best_cost is None or cost < best_cost - 1e-9:
+                    best_k, best_cost = k, cost
+            phase = round(best_k * width + preferred % width, 3) % interval_s
+
+        job = (interval_s, phase, duration_s)
+        self._placed.append(job)
+        for other_interval, load in self._loads.items():
+            self._add(load, other_interval, job)
+        return phase
+
+
+def job_timeout_seconds(interval_s: int, configured: object = None) -> float:
+    """Wall-clock limit for one run: the config's "timeout", else a fraction of the interval."""
+    if isinstance(configured, (int, float)) and not isinstance(configured, bool) and configured > 0:
+        return float(configured)
+    return min(interval_s * TIMEOUT_FRACTION, MAX_TIMEOUT_SECONDS)
+
+
+def job_priority(configured: object) -> int:
+    """The config's "priority" (an int, higher starts first), else 0."""
+    if isinstance(configured, int) and not isinstance(configured, bool):
+        return configured
+    return 0
+
+
+def job_catchup(interval_s: int, configured: object) -> str:
+    """
+    The config's "catchup" policy for runs missed while the scheduler was down:
+    "once" or "skip". Defaults to "once" for hourly and slower schedules.
+    """
+    if configured in CATCHUP_POLICIES:
+        return str(configured)
+    return "once" if interval_s >= CATCHUP_DEFAULT_MIN_INTERVAL_SECONDS else "skip"
+
+
+def retry_delay_seconds(attempt: int) -> float:
+    """Backoff before retry number attempt+1: base * 2^attempt (capped), half of it jittered."""
+    delay = min(RETRY_BASE_SECONDS * (2 ** attempt), RETRY_MAX_SECONDS)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def job_weight(cpu_share: Optional[float]) -> float:
+    """Share of the concurrency budget a run takes (1 until its CPU use is known)."""
+    if cpu_share is None:
+        return 1.0
+    return min(float(MAX_WORKERS), max(MIN_JOB_WEIGHT, cpu_share))
+
+
+def reap_with_usage(proc: Union[subprocess.Popen, PoolJob]) -> Tuple[Optional[int], Optional[dict]]:
+    """
+    (exit code, resource usage) of a finished run, or (None, None) while it
+    runs. A direct child is reaped with wait4() so its usage is not lost;
+    pool jobs report theirs from the worker.
+    """
+    if isinstance(proc, PoolJob):
+        rc = proc.poll()
+        return rc, (proc.usage if rc is not None else None)
+    if proc.returncode is not None:
+        return proc.returncode, None
+    try:
+        pid, status, rusage = os.wait4(proc.pid, os.WNOHANG)
+    except ChildProcessError:
+        return proc.poll(), None
+    if pid == 0:
+        return None, None
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    return proc.returncode, usage_from_rusage(rusage)
+
+
+def signal_group(pid: int, sig: int) -> None:
+    """Send sig to the process group led by pid (falls back to the process itself)."""
+    try:
+        os.killpg(pid, sig)
+    except ProcessLookupError:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
 
 
 def human_interval(interval_s: int) -> str:
@@ -198,19 +466,49 @@ class Job:
     schedule: str
     interval_s: int
     next_run: datetime = field(default_factory=lambda: now_utc())
+    timeout_s: float = 0.0
+    priority: int = 0
+    catchup: str = "skip"
+    phase_s: Optional[float] = None  # offset within the interval; None until placed
+    label: str = ""  # from the config, kept for the schedule table
 
     # Runtime state
     last_run: Optional[datetime] = None
     last_exit: Optional[int] = None
     last_duration_ms: Optional[int] = None
+    last_cpu_ms: Optional[int] = None
+    cpu_share: Optional[float] = None  # smoothed CPU time / duration of recent runs
 
     # Process tracking
     running: bool = False
     pid: Optional[int] = None
     started_at: Optional[datetime] = None
+    deadline: Optional[float] = None  # time.monotonic() at which the run times out
+
+    # Retries of the current regular run
+    attempt: int = 0
+    retry_at: Optional[datetime] = None
+
+    # Time the last started run spent in the ready queue
+    last_wait_ms: Optional[int] = None
+
+
+# (schedule, config mtime, parsed config) as read from a config file
+ConfigEntry = Tuple[str, float, dict]
 
 
-# Heap items are (next_run_ts, metric_id)
+@dataclass
+class ReadyEntry:
+    job: "Job"
+    is_retry: bool
+    due_ts: float  # when the run was due (wall clock)
+    critical: bool  # the metric's last status, from content/store/state/
+    queued_ts: float = field(default_factory=time.time)
+    held: Set[str] = field(default_factory=set)  # why its start was held back: rate, pressure, slots
+
+
+# Heap items are (ts, metric_id), for a job's next_run or retry_at. Entries
+# that match neither any more are dropped when popped (lazy deletion).
 HeapItem = Tuple[float, str]
 
 
@@ -218,24 +516,68 @@ class Scheduler:
     def __init__(self) -> None:
         self.jobs: Dict[str, Job] = {}
         self.heap: List[HeapItem] = []
-        self.running_procs: Dict[str, subprocess.Popen] = {}
+        # Due runs waiting for a worker slot, by metric_id
+        self.ready: Dict[str, ReadyEntry] = {}
+        self.ready_waits_ms: deque = deque(maxlen=WAIT_SAMPLES)
+        self.ready_depth_max = 0
+        self.stats = SchedulerStats()
+        self.resources = ResourceLedger(root=ROOT)
+        self.history = RunHistory(root=ROOT)
+        # metric_id -> run history id of a timed-out run, until it is reaped
+        self._timeout_runs: Dict[str, int] = {}
+        self._last_stats_publish_at = 0.0
+        self.running_procs: Dict[str, Union[subprocess.Popen, PoolJob]] = {}
+        # Timed-out runs that were signalled but have not exited yet:
+        # metric_id -> (process, time.monotonic() at which to SIGKILL)
+        self.terminating: Dict[str, Tuple[Union[subprocess.Popen, PoolJob], float]] = {}
+        self.pool: Optional[WorkerPool] = WorkerPool(size=MAX_WORKERS) if POOL_ENABLED else None
 
         self._stop = False
 
         self._config_sig: Dict[str, float] = {}  # metric_id -> mtime
+        self.watcher: Optional[ConfigWatcher] = None
+        # Per-job entries of the state checkpoint read at startup
+        self._saved_jobs: Dict[str, dict] = {}
         self._last_config_scan_at = 0.0
         self._last_md_write_at = 0.0
+        self._md_dirty = True
+        # Last written schedule.md / schedule.json, without their timestamps
+        self._md_body: Optional[str] = None
+        self._feed_body: Optional[str] = None
+        self._state_dirty = False
+        self._last_state_write_at = 0.0
+
+        # Event loop state (see _open_events)
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._wakeup_r = -1
+        self._wakeup_w = -1
+        self._pool_fds: Dict[int, object] = {}
+        # Output pipes of directly spawned runs: fd -> (metric_id, process)
+        self._pipes: Dict[int, Tuple[str, subprocess.Popen]] = {}
+        self.outputs: Dict[str, OutputRing] = {}
+        self._last_snapshot_refresh_at = 0.0
 
         # start-rate limiter window
         self._starts_in_window = 0
         self._window_start = time.time()
 
+        # Adaptive concurrency (see adapt_concurrency)
+        self.concurrency_limit = float(MAX_WORKERS)
+        self.host_load: Optional[HostLoad] = None
+        self.under_pressure = False
+        self._last_adapt_at = 0.0
+
     def stop(self) -> None:
         self._stop = True
 
+    def _mark_changed(self) -> None:
+        """Job state changed: refresh schedule.md and the state checkpoint."""
+        self._md_dirty = True
+        self._state_dirty = True
+
     def install_signal_handlers(self) -> None:
         def _handle(sig: int, frame) -> None:
-            append_log(f"[scheduler] received signal {sig}, shutting down")
+            append_log(f"[scheduler] received signal {sig}, shutting down", event="signal", signal=sig)
             self.stop()
 
         signal.signal(signal.SIGINT, _handle)
@@ -245,78 +587,162 @@ class Scheduler:
     # Config loading / reloading
     # -----------------------------
 
-    def _scan_configs(self) -> Dict[str, Tuple[str, float]]:
+    def _read_config(self, p: Path) -> Optional[ConfigEntry]:
+        """
+        Return (schedule_str, mtime, config) for one config file, or None if
+        it is missing or invalid (invalid configs are logged).
         """
-        Return map: metric_id -> (schedule_str, mtime)
+        try:
+            st = p.stat()
+            mtime = st.st_mtime
+            with p.open("r", encoding="utf-8") as f:
+                obj = json.load(f)
+            sched = obj.get("schedule")
+            if sched not in SCHEDULE_SECONDS:
+                append_log(f"[scheduler] invalid schedule '{sched}' in {p.name}, skipping")
+                return None
+            return sched, mtime, obj
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            append_log(f"[scheduler] failed to read {p.name}: {e}")
+            return None
+
+    def _scan_configs(self) -> Dict[str, ConfigEntry]:
+        """
+        Return map: metric_id -> (schedule_str, mtime, config)
         Invalid configs are logged and skipped.
         """
-        found: Dict[str, Tuple[str, float]] = {}
+        found: Dict[str, ConfigEntry] = {}
         if not CONFIG_DIR.exists():
             append_log(f"[scheduler] config dir missing: {CONFIG_DIR}")
             return found
 
         for p in sorted(CONFIG_DIR.glob("*.json")):
-            metric_id = p.stem
-            try:
-                st = p.stat()
-                mtime = st.st_mtime
-                with p.open("r", encoding="utf-8") as f:
-                    obj = json.load(f)
-                sched = obj.get("schedule")
-                if sched not in SCHEDULE_SECONDS:
-                    append_log(f"[scheduler] invalid schedule '{sched}' in {p.name}, skipping")
-                    continue
-                found[metric_id] = (sched, mtime)
-            except Exception as e:
-                append_log(f"[scheduler] failed to read {p.name}: {e}")
+            entry = self._read_config(p)
+            if entry is not None:
+                found[p.stem] = entry
         return found
 
+    def _apply_config(self, metric_id: str, entry: Optional[ConfigEntry]) -> bool:
+        """
+        Add, update or (entry None) remove one job. Returns True when its
+        schedule changed, i.e. its next_run needs a new heap entry.
+        """
+        if entry is None:
+            self._config_sig.pop(metric_id, None)
+            if metric_id not in self.jobs:
+                return False
+            append_log(f"[scheduler] removed job: {metric_id}", event="job_removed", metric_id=metric_id)
+            self.jobs.pop(metric_id, None)
+            self.ready.pop(metric_id, None)
+            self.stats.forget(metric_id)
+            try:
+                self.resources.purge(metric_id)
+                (OUTPUT_DIR / f"{metric_id}.txt").unlink(missing_ok=True)
+            except OSError as e:
+                append_log(f"[scheduler] could not remove run output/usage of {metric_id}: {e}")
+            # if running, let it finish, but we won't reschedule it
+            return True
+
+        sched, mtime, obj = entry
+        prev = self._config_sig.get(metric_id)
+        if prev is not None and prev == mtime:
+            return False
+        self._config_sig[metric_id] = mtime
+        interval_s = SCHEDULE_SECONDS[sched]
+
+        if metric_id in self.jobs:
+            job = self.jobs[metric_id]
+            label = metric_label(metric_id, obj)
+            if label != job.label:
+                job.label = label
+                self._md_dirty = True
+            job.timeout_s = job_timeout_seconds(interval_s, obj.get("timeout"))
+            job.priority = job_priority(obj.get("priority"))
+            job.catchup = job_catchup(interval_s, obj.get("catchup"))
+            if job.schedule == sched and job.interval_s == interval_s:
+                return False  # mtime changed but schedule same; no scheduling change
+            append_log(
+                f"[scheduler] updated job: {metric_id} schedule {job.schedule}->{sched}",
+                event="job_updated",
+                metric_id=metric_id,
+                schedule=sched,
+            )
+            job.schedule = sched
+            job.interval_s = interval_s
+            # re-placed (and next_run recomputed) by _assign_phases()
+            job.phase_s = None
+            return True
+
+        job = Job(
+            metric_id=metric_id,
+            schedule=sched,
+            interval_s=interval_s,
+            timeout_s=job_timeout_seconds(interval_s, obj.get("timeout")),
+            priority=job_priority(obj.get("priority")),
+            catchup=job_catchup(interval_s, obj.get("catchup")),
+            label=metric_label(metric_id, obj),
+        )
+        saved = self._saved_jobs.get(metric_id) or {}
+        if saved.get("schedule") == sched and isinstance(saved.get("phase_s"), (int, float)):
+            # keep the phase from before the restart
+            job.phase_s = float(saved["phase_s"]) % interval_s
+            job.last_duration_ms = saved.get("last_duration_ms")
+        self.jobs[metric_id] = job
+        if job.phase_s is not None:
+            job.next_run = self._compute_next_run(metric_id, now_utc())
+        append_log(f"[scheduler] added job: {metric_id} schedule={sched}", event="job_added", metric_id=metric_id, schedule=sched)
+        return True
+
+    def _config_reload_interval(self) -> float:
+        # With inotify, the periodic full scan is only a safety net
+        if self.watcher is not None and self.watcher.mode == "inotify":
+            return CONFIG_RESCAN_SECONDS
+        return CONFIG_POLL_SECONDS
+
     def reload_configs_if_needed(self, force: bool = False) -> None:
         now = time.time()
-        if not force and (now - self._last_config_scan_at) < CONFIG_POLL_SECONDS:
+        if not force and (now - self._last_config_scan_at) < self._config_reload_interval():
             return
-
         self._last_config_scan_at = now
+
+        if not force and self.watcher is not None and self.watcher.mode == "poll":
+            # stat() every file, parse only the changed ones
+            self.reload_changed_configs(self.watcher.changes())
+            return
+
         found = self._scan_configs()
 
         # Detect changes/adds/removes
         changed = False
-
-        # removed
         for metric_id in list(self.jobs.keys()):
             if metric_id not in found:
-                changed = True
-                append_log(f"[scheduler] removed job: {metric_id}")
-                self.jobs.pop(metric_id, None)
-                # if running, let it finish, but we won't reschedule it
-
-        # add/change
-        for metric_id, (sched, mtime) in found.items():
-            prev = self._config_sig.get(metric_id)
-            if prev is None or prev != mtime:
-                self._config_sig[metric_id] = mtime
-                interval_s = SCHEDULE_SECONDS[sched]
-
-                if metric_id in self.jobs:
-                    job = self.jobs[metric_id]
-                    if job.schedule != sched or job.interval_s != interval_s:
-                        changed = True
-                        append_log(f"[scheduler] updated job: {metric_id} schedule {job.schedule}->{sched}")
-                        job.schedule = sched
-                        job.interval_s = interval_s
-                        # recompute next_run aligned from now
-                        job.next_run = self._compute_next_run(metric_id, now_utc())
-                    # else: mtime changed but schedule same; no scheduling change
-                else:
-                    changed = True
-                    job = Job(metric_id=metric_id, schedule=sched, interval_s=interval_s)
-                    job.next_run = self._compute_next_run(metric_id, now_utc())
-                    self.jobs[metric_id] = job
-                    append_log(f"[scheduler] added job: {metric_id} schedule={sched}")
+                changed |= self._apply_config(metric_id, None)
+        for metric_id, entry in found.items():
+            changed |= self._apply_config(metric_id, entry)
+        self._assign_phases()
 
         if changed or force:
             self._rebuild_heap()
 
+    def reload_changed_configs(self, changed: Optional[Set[str]]) -> None:
+        """
+        Reload just the given metric configs (None: full rescan). Old heap
+        entries of updated or removed jobs are dropped lazily when popped.
+        """
+        if changed is None:
+            append_log("[scheduler] config watcher lost track; rescanning")
+            self.reload_configs_if_needed(force=True)
+            return
+        updated = [m for m in sorted(changed) if self._apply_config(m, self._read_config(CONFIG_DIR / f"{m}.json"))]
+        self._assign_phases()
+        for metric_id in updated:
+            self._mark_changed()
+            job = self.jobs.get(metric_id)
+            if job is not None:
+                self._push_job(job)
+
     def _rebuild_heap(self) -> None:
         self.heap.clear()
         for metric_id, job in self.jobs.items():
@@ -324,14 +750,34 @@ class Scheduler:
             if job.next_run <= now_utc():
                 job.next_run = self._compute_next_run(metric_id, now_utc())
             heapq.heappush(self.heap, (job.next_run.timestamp(), metric_id))
+            if job.retry_at is not None:
+                heapq.heappush(self.heap, (job.retry_at.timestamp(), metric_id))
         append_log(f"[scheduler] heap rebuilt with {len(self.heap)} jobs")
+        self._state_dirty = True
         self.write_schedule_md(force=True)
 
     def _compute_next_run(self, metric_id: str, ref: datetime) -> datetime:
-        interval_s = self.jobs[metric_id].interval_s if metric_id in self.jobs else 60
-        base = align_next_boundary(ref, interval_s)
-        jitter = stable_jitter_seconds(metric_id, MAX_JITTER_SECONDS)
-        return base + timedelta(seconds=jitter)
+        job = self.jobs[metric_id]
+        return next_phase_time(ref, job.interval_s, job.phase_s or 0.0)
+
+    def _assign_phases(self) -> List[Job]:
+        """Place every job without a phase (in metric_id order) and set its next_run."""
+        unplaced = sorted(m for m, job in self.jobs.items() if job.phase_s is None)
+        if not unplaced:
+            return []
+        planner = PhasePlanner([
+            (job.interval_s, job.phase_s, (job.last_duration_ms or DEFAULT_DURATION_SECONDS * 1000) / 1000)
+            for job in self.jobs.values()
+            if job.phase_s is not None
+        ])
+        assigned = []
+        for metric_id in unplaced:
+            job = self.jobs[metric_id]
+            duration_s = (job.last_duration_ms or DEFAULT_DURATION_SECONDS * 1000) / 1000
+            job.phase_s = planner.place(metric_id, job.interval_s, duration_s)
+            job.next_run = self._compute_next_run(metric_id, now_utc())
+            assigned.append(job)
+        return assigned
 
     # -----------------------------
     # Process control
@@ -342,25 +788,83 @@ class Scheduler:
         if now - self._window_start >= 1.0:
             self._window_start = now
             self._starts_in_window = 0
-        return self._starts_in_window < MAX_STARTS_PER_SEC
+        return self._starts_in_window < self._starts_per_sec()
+
+    def _starts_per_sec(self) -> int:
+        """Start-rate limit, scaled down with the concurrency budget."""
+        return max(1, int(MAX_STARTS_PER_SEC * self.concurrency_limit / MAX_WORKERS))
+
+    def _running_weight(self) -> float:
+        return sum(job_weight(self.jobs[m].cpu_share) for m in self.running_procs if m in self.jobs)
+
+    def _has_room(self, job: Optional[Job] = None) -> bool:
+        """A worker is free and the budget fits job (any run, when job is None)."""
+        # A timed-out pool run keeps its worker until its process group is gone
+        busy = len(self.running_procs) + sum(isinstance(p, PoolJob) for p, _ in self.terminating.values())
+        if busy >= MAX_WORKERS:
+            return False
+        if not self.running_procs:
+            return True
+        need = job_weight(job.cpu_share) if job is not None else MIN_JOB_WEIGHT
+        return self._running_weight() + need <= self.concurrency_limit + 1e-9
+
+    def _deferred(self, entry: ReadyEntry, now_ts: float) -> bool:
+        """Under host pressure, low-scoring ready runs wait."""
+        return self.under_pressure and self._ready_score(entry, now_ts) < PRESSURE_MIN_SCORE
+
+    def adapt_concurrency(self, force: bool = False) -> None:
+        """
+        Every ADAPT_SECONDS, read the host load and adjust the concurrency
+        budget: halve it under pressure, add one when calm, else keep it.
+        """
+        now = time.time()
+        if not ADAPTIVE or (not force and now - self._last_adapt_at < ADAPT_SECONDS):
+            return
+        self._last_adapt_at = now
+        load = read_host_load()
+        self.host_load = load
+        psi = [v for v in (load.cpu_psi, load.memory_psi, load.io_psi) if v is not None]
+        level = max([load.load_per_cpu / LOAD_HIGH] + [v / PSI_HIGH for v in psi])
+
+        previous = self.concurrency_limit
+        was_under_pressure = self.under_pressure
+        self.under_pressure = level >= 1.0
+        if self.under_pressure:
+            self.concurrency_limit = max(float(MIN_WORKERS), previous / 2)
+        elif level < CALM_FRACTION:
+            self.concurrency_limit = min(float(MAX_WORKERS), previous + 1)
+        if self.concurrency_limit != previous or self.under_pressure != was_under_pressure:
+            self._md_dirty = True
+            append_log(
+                f"[scheduler] concurrency {previous:g} -> {self.concurrency_limit:g}"
+                f"{' (pressure)' if self.under_pressure else ''}: {load.describe()}",
+                event="concurrency",
+                limit=self.concurrency_limit,
+                pressure=self.under_pressure,
+                load_per_cpu=round(load.load_per_cpu, 3),
+                cpu_psi=load.cpu_psi,
+                memory_psi=load.memory_psi,
+                io_psi=load.io_psi,
+            )
 
     def _note_start(self) -> None:
         self._starts_in_window += 1
 
-    def _spawn_metric(self, metric_id: str) -> Optional[subprocess.Popen]:
+    def _spawn_metric(self, metric_id: str, retries_left: int = 0) -> Optional[Union[subprocess.Popen, PoolJob]]:
         """
-        Spawn tools.runner --metric <metric_id>. Output goes to scheduler.txt.
+        Spawn tools.runner --metric <metric_id> --retries-left <n>, on a pool
+        worker when the pool is enabled. Output is kept per run (see _take_output).
         """
         if not RUNNER_PATH.is_file():
             append_log(f"[scheduler] ERROR runner not found: {RUNNER_PATH}")
             return None
 
+        argv = ["--metric", metric_id, "--retries-left", str(retries_left)]
         cmd = [
             sys.executable,
             "-m",
             "tools.runner",
-            "--metric",
-            metric_id,
+            *argv,
         ]
 
         if DRY_RUN:
@@ -368,48 +872,133 @@ class Scheduler:
             return None
 
         ensure_dirs()
-        log_f = LOG_TXT_PATH.open("a", encoding="utf-8")
+        if self.pool is not None:
+            try:
+                return self.pool.submit(argv)
+            except Exception as e:
+                append_log(f"[scheduler] pool unavailable for {metric_id} ({e}); spawning directly")
 
         try:
             p = subprocess.Popen(
                 cmd,
                 cwd=str(ROOT),   # critical: repo root must be on sys.path
-                stdout=log_f,
-                stderr=log_f,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,  # into self.outputs[metric_id], see _read_pipe()
+                stderr=subprocess.STDOUT,
                 close_fds=True,
+                process_group=0,  # own group, so a timeout also stops the script's children
             )
-            return p
         except Exception as e:
-            append_log(f"[scheduler] ERROR failed to spawn {metric_id}: {e}")
+            append_log(f"[scheduler] ERROR failed to spawn {metric_id}: {e}", event="error", metric_id=metric_id)
+            return None
+        fd = p.stdout.fileno()
+        os.set_blocking(fd, False)
+        self.outputs[metric_id] = OutputRing()
+        self._pipes[fd] = (metric_id, p)
+        if self._selector is not None:
+            self._selector.register(fd, selectors.EVENT_READ)
+        return p
+
+    def _read_pipe(self, fd: int) -> None:
+        """Move a direct run's pending output into its ring buffer; close the pipe at EOF."""
+        metric_id, proc = self._pipes[fd]
+        ring = self.outputs.setdefault(metric_id, OutputRing())
+        try:
+            while chunk := os.read(fd, 65536):
+                ring.feed(chunk)
+        except BlockingIOError:
+            return
+        self._close_pipe(fd)
+
+    def _close_pipe(self, fd: int) -> None:
+        _, proc = self._pipes.pop(fd)
+        if self._selector is not None:
             try:
-                log_f.close()
-            except Exception:
+                self._selector.unregister(fd)
+            except (KeyError, ValueError):
                 pass
-            return None
+        proc.stdout.close()
+
+    def _take_output(self, metric_id: str, proc: Union[subprocess.Popen, PoolJob]) -> Optional[str]:
+        """Output of a finished run; a direct run's pipe is drained and closed."""
+        if isinstance(proc, PoolJob):
+            return proc.output
+        if proc.stdout is not None and not proc.stdout.closed:
+            fd = proc.stdout.fileno()
+            if fd in self._pipes:
+                self._read_pipe(fd)
+                if fd in self._pipes:
+                    self._close_pipe(fd)  # something the run started still holds it open
+        ring = self.outputs.pop(metric_id, None)
+        return ring.text() if ring is not None else None
+
+    def _save_output(self, metric_id: str, output: Optional[str]) -> None:
+        if output is None:
+            return
+        try:
+            write_atomic(OUTPUT_DIR / f"{metric_id}.txt", output)
+        except OSError as e:
+            append_log(f"[scheduler] could not save output of {metric_id}: {e}")
 
     def _reap_finished(self) -> None:
         """
         Check for completed subprocesses and update job state.
         """
+        if self.pool is not None:
+            self.pool.pump()
         for metric_id, proc in list(self.running_procs.items()):
-            rc = proc.poll()
+            rc, usage = reap_with_usage(proc)
             if rc is None:
                 continue
 
             self.running_procs.pop(metric_id, None)
+            self._mark_changed()
             job = self.jobs.get(metric_id)
             finished_at = now_utc()
+            started_at = job.started_at if job else None
 
             if job:
                 job.running = False
                 job.pid = None
+                job.deadline = None
                 job.last_exit = rc
+                self.stats.count("exits", metric_id, str(rc))
                 if job.started_at:
                     dur_ms = int((finished_at - job.started_at).total_seconds() * 1000)
                     job.last_duration_ms = dur_ms
+                    self.stats.observe("duration_ms", metric_id, dur_ms)
+                    if usage is not None:
+                        cpu_ms = usage["cpu_ms"]
+                        job.last_cpu_ms = cpu_ms
+                        share = cpu_ms / max(dur_ms, 1)
+                        job.cpu_share = share if job.cpu_share is None else (
+                            CPU_SHARE_ALPHA * share + (1 - CPU_SHARE_ALPHA) * job.cpu_share
+                        )
                 job.started_at = None
+            if usage is not None:
+                self._record_usage(metric_id, usage, rc)
+            output = self._take_output(metric_id, proc)
+            self._save_output(metric_id, output)
+            if started_at is not None:
+                self._record_run(
+                    metric_id,
+                    started=started_at,
+                    ended=finished_at,
+                    exit_code=rc,
+                    status=self._run_status(metric_id, rc, started_at),
+                    output=output,
+                )
+
+            if rc == RETRY_EXIT and job is not None:
+                self._schedule_retry(job, finished_at)
+                continue
 
-            append_log(f"[scheduler] finished {metric_id} exit={rc}")
+            fields: Dict[str, object] = {"metric_id": metric_id, "exit": rc}
+            if job is not None:
+                fields["duration_ms"] = job.last_duration_ms
+            if rc != 0 and output:
+                fields["output_tail"] = output[-OUTPUT_LOG_TAIL_BYTES:]
+            append_log(f"[scheduler] finished {metric_id} exit={rc}", event="finished", **fields)
 
             # Common failure if runner.py doesn't support --metric: exit code 2 from argparse.
             if rc == 2:
@@ -418,146 +1007,655 @@ class Scheduler:
                     f"runner.py may not support '--metric'. Add argparse handling in runner.py."
                 )
 
+    @staticmethod
+    def _run_status(metric_id: str, rc: int, started_at: datetime) -> str:
+        """Outcome of a reaped run for the run history (see tools/run_history.py)."""
+        if rc == 0:
+            # The runner also exits 0 when the script raised; then no point was written
+            state = read_state(metric_id, root=ROOT) or {}
+            try:
+                written = datetime.fromisoformat(str(state["t"]).replace("Z", "+00:00")) >= started_at
+            except (KeyError, ValueError, TypeError):
+                written = False
+            if not written:
+                return "failed"
+            return "error" if is_error_value(state.get("value")) else "ok"
+        if rc == RETRY_EXIT:
+            return "retry"
+        if rc == TIMEOUT_EXIT:
+            return "timeout"
+        return "failed"
+
+    def _record_run(self, metric_id: str, **run: object) -> Optional[int]:
+        job = self.jobs.get(metric_id)
+        try:
+            return self.history.record(metric_id, attempt=job.attempt if job else 0, **run)
+        except (sqlite3.Error, OSError) as e:
+            append_log(f"[scheduler] could not record run of {metric_id}: {e}")
+            return None
+
+    def _flush_resources(self, due_only: bool = False) -> None:
+        """Append buffered usage records to run_usage.jsonl (alongside the event log flush)."""
+        try:
+            if due_only:
+                self.resources.flush_if_due()
+            else:
+                self.resources.flush()
+        except OSError as e:
+            append_log(f"[scheduler] could not write resource usage: {e}")
+
+    def _record_usage(self, metric_id: str, usage: dict, rc: Optional[int]) -> None:
+        job = self.jobs.get(metric_id)
+        try:
+            self.resources.record(metric_id, usage, exit_code=rc, duration_ms=job.last_duration_ms if job else None)
+        except OSError as e:
+            append_log(f"[scheduler] could not record resource usage of {metric_id}: {e}")
+
+    def _enforce_timeouts(self) -> None:
+        """
+        SIGTERM the process group of every run past its deadline and free its
+        slot right away; SIGKILL groups still alive after KILL_GRACE_SECONDS.
+        A pool run whose child never reported its pid cannot be signalled:
+        its worker is killed instead and the run counts as lost.
+        """
+        now = time.monotonic()
+        for metric_id, proc in list(self.running_procs.items()):
+            job = self.jobs.get(metric_id)
+            if job is None or job.deadline is None or now < job.deadline:
+                continue
+            self.running_procs.pop(metric_id, None)
+            self._mark_changed()
+            if proc.pid is not None:
+                signal_group(proc.pid, signal.SIGTERM)
+            elif isinstance(proc, PoolJob) and self.pool is not None:
+                self.pool.abandon(proc)
+            self.terminating[metric_id] = (proc, now + KILL_GRACE_SECONDS)
+
+            job.running = False
+            job.pid = None
+            job.deadline = None
+            job.last_exit = TIMEOUT_EXIT
+            self.stats.count("exits", metric_id, str(TIMEOUT_EXIT))
+            if job.started_at:
+                ended = now_utc()
+                job.last_duration_ms = int((ended - job.started_at).total_seconds() * 1000)
+                self.stats.observe("duration_ms", metric_id, job.last_duration_ms)
+                run_id = self._record_run(
+                    metric_id, started=job.started_at, ended=ended, exit_code=TIMEOUT_EXIT, status="timeout"
+                )
+                if run_id is not None:
+                    self._timeout_runs[metric_id] = run_id  # its output arrives once reaped
+            job.started_at = None
+            append_log(
+                f"[scheduler] timeout {metric_id} after {job.timeout_s:g}s exit={TIMEOUT_EXIT}; sent SIGTERM",
+                event="timeout",
+                metric_id=metric_id,
+                timeout_s=job.timeout_s,
+                exit=TIMEOUT_EXIT,
+            )
+
+        for metric_id, (proc, kill_at) in list(self.terminating.items()):
+            rc, usage = reap_with_usage(proc)
+            if rc is not None:
+                self.terminating.pop(metric_id, None)
+                if usage is not None:
+                    self._record_usage(metric_id, usage, TIMEOUT_EXIT)
+                output = self._take_output(metric_id, proc)
+                self._save_output(metric_id, output)
+                run_id = self._timeout_runs.pop(metric_id, None)
+                if run_id is not None:
+                    try:
+                        self.history.set_output(run_id, output)
+                    except (sqlite3.Error, OSError) as e:
+                        append_log(f"[scheduler] could not record output of {metric_id}: {e}")
+            elif now >= kill_at:
+                if proc.pid is not None:
+                    signal_group(proc.pid, signal.SIGKILL)
+                append_log(
+                    f"[scheduler] {metric_id} ignored SIGTERM for {KILL_GRACE_SECONDS:g}s; sent SIGKILL",
+                    event="kill",
+                    metric_id=metric_id,
+                )
+                # reaped by a later poll(); keep it out of the slot count meanwhile
+                self.terminating[metric_id] = (proc, float("inf"))
+
+    def _schedule_retry(self, job: Job, ref: datetime) -> None:
+        """
+        Re-queue a run that exited with RETRY_EXIT. The backoff is squeezed to
+        at most half the time left before the next regular run, so the last
+        attempt (which writes the error point) still lands in this interval.
+        """
+        job.attempt += 1
+        delay = retry_delay_seconds(job.attempt - 1)
+        delay = min(delay, max(0.0, (job.next_run - ref).total_seconds() / 2))
+        job.retry_at = ref + timedelta(seconds=delay)
+        self._push_retry(job)
+        append_log(
+            f"[scheduler] finished {job.metric_id} exit={RETRY_EXIT}; "
+            f"retry {job.attempt}/{MAX_RETRIES} in {delay:.0f}s",
+            event="retry",
+            metric_id=job.metric_id,
+            exit=RETRY_EXIT,
+            attempt=job.attempt,
+            delay_s=round(delay, 1),
+        )
+
     # -----------------------------
     # Scheduling loop
     # -----------------------------
 
-    def _pop_due_jobs(self, ref: datetime) -> List[Job]:
-        due: List[Job] = []
-        ref_ts = ref.timestamp()
-
+    def _pop_due_job(self, ref_ts: float) -> Optional[Tuple[Job, bool]]:
+        """Next due (job, is_retry), or None; superseded heap entries are skipped."""
         while self.heap and self.heap[0][0] <= ref_ts:
-            _, metric_id = heapq.heappop(self.heap)
+            ts, metric_id = heapq.heappop(self.heap)
             job = self.jobs.get(metric_id)
             if job is None:
                 continue
-            due.append(job)
-
-        return due
+            if job.retry_at is not None and ts == job.retry_at.timestamp():
+                return job, True
+            if ts == job.next_run.timestamp():
+                return job, False
+        return None
 
     def _push_job(self, job: Job) -> None:
         heapq.heappush(self.heap, (job.next_run.timestamp(), job.metric_id))
 
+    def _push_retry(self, job: Job) -> None:
+        heapq.heappush(self.heap, (job.retry_at.timestamp(), job.metric_id))
+
     def _schedule_next(self, job: Job, ref: datetime) -> None:
         # Align from "ref" rather than last_run to avoid drift.
-        base = align_next_boundary(ref, job.interval_s)
-        jitter = stable_jitter_seconds(job.metric_id, MAX_JITTER_SECONDS)
-        job.next_run = base + timedelta(seconds=jitter)
+        job.next_run = next_phase_time(ref, job.interval_s, job.phase_s or 0.0)
+
+    def _ready_score(self, entry: ReadyEntry, now_ts: float) -> float:
+        boost = CRITICAL_BOOST if entry.critical else 0.0
+        return entry.job.priority + boost + max(0.0, now_ts - entry.due_ts) / AGING_SECONDS
+
+    def _collect_due_jobs(self) -> None:
+        """Move due heap entries to the ready queue (or coalesce them)."""
+        now_dt = now_utc()
+        while True:
+            due = self._pop_due_job(now_dt.timestamp())
+            if due is None:
+                break
+            job, is_retry = due
+
+            # Coalesce overlaps: if running (or still being stopped), skip this run.
+            if job.metric_id in self.running_procs or job.running or job.metric_id in self.terminating:
+                append_log(f"[scheduler] coalesce (still running): {job.metric_id}", event="coalesced", metric_id=job.metric_id)
+                self.stats.count("coalesced", job.metric_id)
+                if not is_retry:
+                    self._schedule_next(job, now_dt)
+                    self._push_job(job)
+                else:
+                    # The retry is dropped; don't let _rebuild_heap push it again
+                    job.retry_at = None
+                    job.attempt = 0
+                continue
+
+            queued = self.ready.get(job.metric_id)
+            if queued is not None:
+                # Already waiting: a regular run supersedes a queued retry
+                queued.is_retry = queued.is_retry and is_retry
+                continue
+            state = read_state(job.metric_id, root=ROOT) or {}
+            due_ts = (job.retry_at if is_retry else job.next_run).timestamp()
+            self.ready[job.metric_id] = ReadyEntry(job, is_retry, due_ts, state.get("status") == "critical")
+        self.ready_depth_max = max(self.ready_depth_max, len(self.ready))
+
+    def _start_ready_jobs(self) -> None:
+        """
+        Start the highest-scoring ready runs while the concurrency budget and
+        the start-rate limit allow. Runs start strictly in score order: a
+        heavy run at the head of the queue is not overtaken by lighter ones.
+        """
+        while self.ready:
+            now_dt = now_utc()
+            now_ts = now_dt.timestamp()
+            metric_id = max(self.ready, key=lambda m: self._ready_score(self.ready[m], now_ts))
+            entry = self.ready[metric_id]
+            job = entry.job
+            if self.jobs.get(metric_id) is not job:
+                del self.ready[metric_id]
+                continue  # removed (or re-added) while waiting
+            held = self._hold_reason(entry, now_ts)
+            if held is not None:
+                for waiting in self.ready.values():
+                    if held != "pressure" or self._deferred(waiting, now_ts):
+                        waiting.held.add(held)
+                break
+            del self.ready[metric_id]
+
+            job.last_wait_ms = int(max(0.0, now_ts - entry.due_ts) * 1000)
+            self.ready_waits_ms.append(job.last_wait_ms)
+            self.stats.observe("lateness_ms", metric_id, job.last_wait_ms)
+            self.stats.observe("queue_wait_ms", metric_id, max(0.0, now_ts - entry.queued_ts) * 1000)
+            for reason in sorted(entry.held):
+                self.stats.count("deferred", metric_id, reason)
+            self._launch(job, entry.is_retry, now_dt)
+
+    def _hold_reason(self, entry: ReadyEntry, now_ts: float) -> Optional[str]:
+        """Why the head of the ready queue cannot start now, or None."""
+        if self._deferred(entry, now_ts):
+            return "pressure"
+        if not self._has_room(entry.job):
+            return "slots"
+        if not self._rate_limit_allows_start():
+            return "rate"
+        return None
+
+    def _launch(self, job: Job, is_retry: bool, now_dt: datetime) -> None:
+        # A regular run supersedes any pending retry
+        self._note_start()
+        self._mark_changed()
+        if is_retry:
+            append_log(
+                f"[scheduler] starting {job.metric_id} ({job.schedule}, retry {job.attempt}/{MAX_RETRIES})",
+                event="started",
+                metric_id=job.metric_id,
+                attempt=job.attempt,
+                wait_ms=job.last_wait_ms,
+            )
+        else:
+            append_log(
+                f"[scheduler] starting {job.metric_id} ({job.schedule})",
+                event="started",
+                metric_id=job.metric_id,
+                attempt=0,
+                wait_ms=job.last_wait_ms,
+            )
+            job.attempt = 0
+        job.retry_at = None
+
+        job.last_run = now_dt
+        job.running = True
+        job.started_at = now_dt
+
+        proc = self._spawn_metric(job.metric_id, retries_left=MAX_RETRIES - job.attempt)
+        if proc is not None:
+            self.running_procs[job.metric_id] = proc
+            job.pid = proc.pid
+            job.deadline = time.monotonic() + job.timeout_s
+        else:
+            # Spawn failed; mark not running and record as exit=-1
+            job.running = False
+            job.pid = None
+            job.last_exit = -1
+            job.started_at = None
+            self.stats.count("exits", job.metric_id, "-1")
+            self._record_run(job.metric_id, started=now_dt, ended=now_dt, exit_code=-1, status="failed")
+
+        # Schedule next run (a retry keeps the regular next_run)
+        if not is_retry:
+            self._schedule_next(job, now_dt)
+            self._push_job(job)
+
+    def ready_summary(self) -> Dict[str, Optional[int]]:
+        """Ready-queue depth now and at most, and recent wait times (ms)."""
+        waits = sorted(self.ready_waits_ms)
+        now_ts = time.time()
+        return {
+            "depth": len(self.ready),
+            "depth_max": self.ready_depth_max,
+            "oldest_wait_ms": int(max((now_ts - e.due_ts for e in self.ready.values()), default=0) * 1000),
+            "wait_p50_ms": waits[len(waits) // 2] if waits else None,
+            "wait_max_ms": waits[-1] if waits else None,
+        }
+
+    # -----------------------------
+    # Event loop
+    # -----------------------------
+
+    def _open_events(self) -> None:
+        """
+        Wake the loop on signals: SIGCHLD (a directly spawned runner or a pool
+        worker exited), SIGTERM and SIGINT. Pool job exits arrive on the
+        workers' pipes, which are registered in _sync_pool_fds().
+        """
+        self._selector = selectors.DefaultSelector()
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_r, False)
+        os.set_blocking(self._wakeup_w, False)
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ)
+        signal.set_wakeup_fd(self._wakeup_w, warn_on_full_buffer=False)
+        signal.signal(signal.SIGCHLD, lambda sig, frame: None)  # only needs to wake the selector
+
+        try:
+            self.watcher = ConfigWatcher(CONFIG_DIR)
+        except OSError as e:
+            append_log(f"[scheduler] config watcher unavailable ({e}); polling")
+            self.watcher = ConfigWatcher(CONFIG_DIR, mode="poll")
+        if self.watcher.fileno() is not None:
+            self._selector.register(self.watcher.fileno(), selectors.EVENT_READ)
+        append_log(f"[scheduler] watching configs ({self.watcher.mode})")
+
+    def _close_events(self) -> None:
+        signal.set_wakeup_fd(-1)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        self._selector.close()
+        if self.watcher is not None:
+            self.watcher.close()
+        os.close(self._wakeup_r)
+        os.close(self._wakeup_w)
+
+    def _sync_pool_fds(self) -> None:
+        want = self.pool.fds() if self.pool is not None else {}
+        for fd, worker in list(self._pool_fds.items()):
+            if want.get(fd) is not worker:
+                self._selector.unregister(fd)
+                del self._pool_fds[fd]
+        for fd, worker in want.items():
+            if fd not in self._pool_fds:
+                self._selector.register(fd, selectors.EVENT_READ)
+                self._pool_fds[fd] = worker
+
+    def _seconds_until_next_event(self) -> float:
+        """Time until the earliest timer: due job, timeout, kill, pool start, reload, snapshot, md."""
+        now = time.time()
+        mono = time.monotonic()
+        waits = [
+            LOOP_TICK_SECONDS,
+            self._last_config_scan_at + self._config_reload_interval() - now,
+            self._last_snapshot_refresh_at + SNAPSHOT_REFRESH_SECONDS - now,
+        ]
+        if self._md_dirty:
+            waits.append(self._last_md_write_at + SCHEDULE_MD_REFRESH_SECONDS - now)
+        if self._state_dirty:
+            waits.append(self._last_state_write_at + STATE_CHECKPOINT_SECONDS - now)
+        if EVENT_LOG.flush_due is not None:
+            waits.append(EVENT_LOG.flush_due - now)
+        if self.resources.flush_due is not None:
+            waits.append(self.resources.flush_due - now)
+        if self.stats.dirty or self.resources.dirty or self.history.dirty:
+            waits.append(self._last_stats_publish_at + STATS_PUBLISH_SECONDS - now)
+        if self.heap:
+            waits.append(self.heap[0][0] - now)
+        if ADAPTIVE:
+            waits.append(self._last_adapt_at + ADAPT_SECONDS - now)
+        # With the budget used up, ready runs wait for an exit event rather than a timer
+        if self.ready:
+            head = max(self.ready.values(), key=lambda e: self._ready_score(e, now))
+            if self._deferred(head, now):
+                # until the best run has aged past PRESSURE_MIN_SCORE (or the next load reading)
+                waits.append((PRESSURE_MIN_SCORE - self._ready_score(head, now)) * AGING_SECONDS)
+            elif self._has_room(head.job):
+                start_ok_at = self._window_start + 1.0 if self._starts_in_window >= self._starts_per_sec() else now
+                waits.append(start_ok_at - now)
+        for metric_id in self.running_procs:
+            job = self.jobs.get(metric_id)
+            if job is not None and job.deadline is not None:
+                waits.append(job.deadline - mono)
+        for _, kill_at in self.terminating.values():
+            waits.append(kill_at - mono)
+        if self.pool is not None and (start_deadline := self.pool.start_deadline()) is not None:
+            waits.append(start_deadline - mono)
+        return max(0.0, min(waits))
+
+    def _wait_for_events(self, timeout: float) -> None:
+        self._sync_pool_fds()
+        for key, _ in self._selector.select(timeout):
+            if key.fd == self._wakeup_r:
+                try:
+                    while os.read(self._wakeup_r, 512):
+                        pass
+                except BlockingIOError:
+                    pass
+            elif key.fd in self._pipes:
+                self._read_pipe(key.fd)
+            elif self.watcher is not None and key.fd == self.watcher.fileno():
+                changed = self.watcher.changes()
+                if changed is None:
+                    # the watcher reopened its inotify descriptor (or fell back to polling)
+                    self._selector.unregister(key.fd)
+                    if self.watcher.fileno() is not None:
+                        self._selector.register(self.watcher.fileno(), selectors.EVENT_READ)
+                self.reload_changed_configs(changed)
+            # pool pipes are drained by pool.pump() in _reap_finished()
 
     def run_forever(self) -> None:
-        append_log(f"[scheduler] starting (max_workers={MAX_WORKERS}, max_starts_per_sec={MAX_STARTS_PER_SEC})")
+        append_log(
+            f"[scheduler] starting (max_workers={MAX_WORKERS}, max_starts_per_sec={MAX_STARTS_PER_SEC}, "
+            f"adaptive={'on' if ADAPTIVE else 'off'}, min_workers={MIN_WORKERS})",
+            event="start",
+        )
         append_log(f"[scheduler] configs={CONFIG_DIR} runner={RUNNER_PATH}")
         append_log(f"[scheduler] md={SCHEDULE_MD_PATH} log={LOG_TXT_PATH}")
 
+        self._open_events()
+        self.load_saved_jobs()
+        self.resources.load()
         self.reload_configs_if_needed(force=True)
+        self.restore_state()
+
+        try:
+            while not self._stop:
+                # Reload configs periodically
+                self.reload_configs_if_needed(force=False)
 
-        while not self._stop:
-            # Reload configs periodically
-            self.reload_configs_if_needed(force=False)
+                # Keep staleness in content/status/latest.json current
+                self.refresh_snapshot(force=False)
 
-            # Reap finished subprocesses
-            self._reap_finished()
+                # Reap finished runs, stop runs past their timeout, fill the freed slots
+                self.adapt_concurrency(force=False)
+                self._reap_finished()
+                self._enforce_timeouts()
+                self._collect_due_jobs()
+                self._start_ready_jobs()
 
-            # Decide sleep based on next due job
-            now_dt = now_utc()
-            next_ts = self.heap[0][0] if self.heap else None
-            if next_ts is None:
-                time.sleep(LOOP_TICK_SECONDS)
                 self.write_schedule_md(force=False)
-                continue
+                self.checkpoint_state(force=False)
+                self.publish_stats(force=False)
+                EVENT_LOG.flush_if_due()
+                self._flush_resources(due_only=True)
+                if self._stop:
+                    break
+
+                # Sleep until the next timer, a child exit or a signal
+                self._wait_for_events(self._seconds_until_next_event())
+        finally:
+            self._close_events()
 
-            # Sleep a bit, but stay responsive
-            sleep_s = max(0.0, next_ts - now_dt.timestamp())
-            time.sleep(min(sleep_s, LOOP_TICK_SECONDS))
+        # Shutdown: do not kill children by default; log and exit.
+        self.checkpoint_state(force=True)
+        self.write_schedule_md(force=True)
+        self.publish_stats(force=True)
+        self._flush_resources()
+        if self.pool is not None:
+            self.pool.close()  # workers exit once their current job is done
+        if self.running_procs:
+            append_log(f"[scheduler] exiting with {len(self.running_procs)} running processes still active")
+        append_log("[scheduler] stopped", event="stop")
+        EVENT_LOG.flush()
 
-            now_dt = now_utc()
+    # -----------------------------
+    # State checkpoint / warm restart
+    # -----------------------------
 
-            # Pull due jobs
-            due_jobs = self._pop_due_jobs(now_dt)
-            if not due_jobs:
-                self.write_schedule_md(force=False)
-                continue
+    def checkpoint_state(self, force: bool = False) -> None:
+        """Save job state to STATE_PATH when it changed, at most every STATE_CHECKPOINT_SECONDS."""
+        now = time.time()
+        if not force and (not self._state_dirty or (now - self._last_state_write_at) < STATE_CHECKPOINT_SECONDS):
+            return
+        self._last_state_write_at = now
+        self._state_dirty = False
+
+        jobs = {}
+        for metric_id, job in sorted(self.jobs.items()):
+            jobs[metric_id] = {
+                "schedule": job.schedule,
+                "next_run": iso(job.next_run),
+                "last_run": iso(job.last_run) if job.last_run else None,
+                "last_exit": job.last_exit,
+                "last_duration_ms": job.last_duration_ms,
+                "last_cpu_ms": job.last_cpu_ms,
+                "cpu_share": job.cpu_share,
+                "phase_s": job.phase_s,
+            }
+        state = {"version": STATE_VERSION, "saved_at": iso(now_utc()), "jobs": jobs}
+        try:
+            write_atomic(STATE_PATH, json.dumps(state, separators=(",", ":")))
+        except Exception as e:
+            append_log(f"[scheduler] state checkpoint failed: {e}")
 
-            # Start due jobs, respecting concurrency and start rate limit
-            for job in due_jobs:
-                # If removed between pop and now
-                if job.metric_id not in self.jobs:
-                    continue
+    def load_saved_jobs(self) -> None:
+        """Read the checkpoint's per-job entries (phases are reused as jobs are added)."""
+        try:
+            state = load_json(STATE_PATH)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            append_log(f"[scheduler] ignoring unreadable state {STATE_PATH.name}: {e}")
+            return
+        jobs = state.get("jobs") if state.get("version") == STATE_VERSION else None
+        self._saved_jobs = {m: j for m, j in (jobs or {}).items() if isinstance(j, dict)}
 
-                # Coalesce overlaps: if running, skip this run.
-                if job.metric_id in self.running_procs or job.running:
-                    append_log(f"[scheduler] coalesce (still running): {job.metric_id}")
-                    self._schedule_next(job, now_dt)
-                    self._push_job(job)
-                    continue
+    def restore_state(self) -> None:
+        """
+        Reload last_* fields from the checkpoint, and catch up on runs that
+        were due while the scheduler was down (per job catchup policy).
+        """
+        if not self._saved_jobs:
+            return
 
-                # Concurrency cap: if too many running, nudge by 1s and retry soon
-                if len(self.running_procs) >= MAX_WORKERS:
-                    job.next_run = now_dt + timedelta(seconds=1)
-                    self._push_job(job)
-                    continue
+        def parse(value: object) -> Optional[datetime]:
+            try:
+                return datetime.fromisoformat(str(value).replace("Z", "+00:00")) if value else None
+            except ValueError:
+                return None
 
-                # Start-rate cap
-                if not self._rate_limit_allows_start():
-                    job.next_run = now_dt + timedelta(seconds=1)
-                    self._push_job(job)
-                    continue
+        now_dt = now_utc()
+        missed: List[Tuple[datetime, Job]] = []
+        for metric_id, saved in self._saved_jobs.items():
+            job = self.jobs.get(metric_id)
+            if job is None:
+                continue
+            job.last_run = parse(saved.get("last_run"))
+            job.last_exit = saved.get("last_exit")
+            job.last_duration_ms = saved.get("last_duration_ms")
+            job.last_cpu_ms = saved.get("last_cpu_ms")
+            if isinstance(saved.get("cpu_share"), (int, float)):
+                job.cpu_share = float(saved["cpu_share"])
+            due = parse(saved.get("next_run"))
+            if due is not None and due <= now_dt and saved.get("schedule") == job.schedule and job.catchup == "once":
+                missed.append((due, job))
+
+        # Spread catch-up runs (most overdue first) instead of starting them all at once
+        missed.sort(key=lambda item: item[0])
+        step = CATCHUP_SPREAD_SECONDS / max(len(missed), 1)
+        for i, (due, job) in enumerate(missed):
+            at = now_dt + timedelta(seconds=1 + i * step)
+            if at < job.next_run:
+                job.next_run = at
+                append_log(
+                    f"[scheduler] catch-up {job.metric_id} (missed {iso(due)}) at {iso(at)}",
+                    event="catchup",
+                    metric_id=job.metric_id,
+                    missed=iso(due),
+                    at=iso(at),
+                )
 
-                # Launch
-                self._note_start()
-                append_log(f"[scheduler] starting {job.metric_id} ({job.schedule})")
+        append_log(f"[scheduler] restored state for {len(self._saved_jobs)} jobs, {len(missed)} missed")
+        self._rebuild_heap()
 
-                job.last_run = now_dt
-                job.running = True
-                job.started_at = now_dt
+    # -----------------------------
+    # Self-metrics
+    # -----------------------------
 
-                proc = self._spawn_metric(job.metric_id)
-                if proc is not None:
-                    self.running_procs[job.metric_id] = proc
-                    job.pid = proc.pid
-                else:
-                    # Spawn failed; mark not running and record as exit=-1
-                    job.running = False
-                    job.pid = None
-                    job.last_exit = -1
-                    job.started_at = None
-
-                # Schedule next run
-                self._schedule_next(job, now_dt)
-                self._push_job(job)
+    def publish_stats(self, force: bool = False) -> None:
+        """
+        Publish the scheduler's own metrics, the per-metric resource summary
+        and the recent runs of metrics that ran, when they changed, at most
+        every STATS_PUBLISH_SECONDS.
+        """
+        now = time.time()
+        dirty = self.stats.dirty or self.resources.dirty or bool(self.history.dirty)
+        if not force and (not dirty or (now - self._last_stats_publish_at) < STATS_PUBLISH_SECONDS):
+            return
+        self._last_stats_publish_at = now
+        gauges = {
+            "jobs": len(self.jobs),
+            "running": len(self.running_procs),
+            "terminating": len(self.terminating),
+            "ready": len(self.ready),
+            "concurrency_limit": self.concurrency_limit,
+            "under_pressure": int(self.under_pressure),
+        }
+        try:
+            self.stats.publish(gauges, root=ROOT)
+            self.resources.publish()
+            self.history.publish()
+            self.history.prune_if_due()
+        except Exception as e:
+            append_log(f"[scheduler] stats publish failed: {e}")
 
-            self.write_schedule_md(force=False)
+    # -----------------------------
+    # Latest snapshot
+    # -----------------------------
 
-        # Shutdown: do not kill children by default; log and exit.
-        if self.running_procs:
-            append_log(f"[scheduler] exiting with {len(self.running_procs)} running processes still active")
-        append_log("[scheduler] stopped")
+    def refresh_snapshot(self, force: bool = False) -> None:
+        now = time.time()
+        if not force and (now - self._last_snapshot_refresh_at) < SNAPSHOT_REFRESH_SECONDS:
+            return
+        self._last_snapshot_refresh_at = now
+        try:
+            refresh_staleness(root=ROOT, known=self.jobs.keys())
+        except Exception as e:
+            append_log(f"[scheduler] snapshot refresh failed: {e}")
 
     # -----------------------------
     # Markdown schedule
     # -----------------------------
 
     def write_schedule_md(self, force: bool = False) -> None:
+        """
+        Rewrite the schedule (scheduler.md and schedule.json) when something
+        changed, at most every SCHEDULE_MD_REFRESH_SECONDS. Rows come from the
+        jobs in memory (labels are cached from the configs), and a file whose
+        content is the same as last time, apart from its timestamp, is not
+        rewritten.
+        """
         now = time.time()
-        if not force and (now - self._last_md_write_at) < SCHEDULE_MD_REFRESH_SECONDS:
+        if not force and (not self._md_dirty or (now - self._last_md_write_at) < SCHEDULE_MD_REFRESH_SECONDS):
             return
         self._last_md_write_at = now
+        self._md_dirty = False
 
         ensure_dirs()
 
         now_dt = now_utc()
 
         lines: List[str] = []
-        lines.append("# Schedule")
-        lines.append("")
-        lines.append(f"Generated: {fmt_generated(now_dt)}")
-        lines.append("")
         lines.append(f"- Configs: `{CONFIG_DIR}`")
         lines.append(f"- Runner: `{RUNNER_PATH}`")
-        lines.append(f"- Max workers: `{MAX_WORKERS}`")
-        lines.append(f"- Max starts/sec: `{MAX_STARTS_PER_SEC}`")
-        lines.append(f"- Jitter (stable): `0..{MAX_JITTER_SECONDS}s`")
+        if ADAPTIVE:
+            load = self.host_load.describe() if self.host_load is not None else "not read yet"
+            lines.append(
+                f"- Workers: budget `{self.concurrency_limit:g}` of max `{MAX_WORKERS}` (adaptive, min `{MIN_WORKERS}`); "
+                f"host {load}{'; under pressure, deferring runs scoring below ' + format(PRESSURE_MIN_SCORE, 'g') if self.under_pressure else ''}"
+            )
+        else:
+            lines.append(f"- Max workers: `{MAX_WORKERS}`")
+        lines.append(f"- Max starts/sec: `{self._starts_per_sec()}`")
+        if PHASES_ENABLED:
+            lines.append("- Phases: spread over each interval by expected load (stable)")
+        else:
+            lines.append(f"- Jitter (stable): `0..{MAX_JITTER_SECONDS}s`")
         lines.append(f"- Overlap policy: `coalesce` (skip if still running)")
+        lines.append(
+            f"- Timeout: config `timeout`, else `{TIMEOUT_FRACTION:g}` x interval (max `{MAX_TIMEOUT_SECONDS:g}s`); "
+            f"exit `{TIMEOUT_EXIT}` = timed out"
+        )
+        ready = self.ready_summary()
+        lines.append(
+            f"- Ready queue: `{ready['depth']}` waiting (max `{ready['depth_max']}`), "
+            f"wait p50 `{ready['wait_p50_ms'] if ready['wait_p50_ms'] is not None else '-'}ms`, "
+            f"max `{ready['wait_max_ms'] if ready['wait_max_ms'] is not None else '-'}ms`; "
+            f"order: critical first, then `priority`, aged by wait"
+        )
+        lines.append(
+            f"- Retries: `{MAX_RETRIES}` per run, backoff from `{RETRY_BASE_SECONDS:g}s` (max `{RETRY_MAX_SECONDS:g}s`); "
+            f"exit `{RETRY_EXIT}` = retry pending"
+        )
         lines.append("")
 
         # Updated table schema (remove interval/running/pid; use label link instead of metric_id)
@@ -566,9 +1664,7 @@ class Scheduler:
 
         for metric_id in sorted(self.jobs.keys()):
             job = self.jobs[metric_id]
-
-            label = metric_label(metric_id)
-            metric_cell = f'<a href="/{metric_id}">{label}</a>'
+            metric_cell = f'<a href="/{metric_id}">{job.label or metric_id}</a>'
 
             lines.append(
                 f"| {metric_cell} | {job.schedule} | "
@@ -577,12 +1673,56 @@ class Scheduler:
                 f"{job.last_duration_ms if job.last_duration_ms is not None else '-'} |"
             )
 
-        tmp = SCHEDULE_MD_PATH.with_suffix(SCHEDULE_MD_PATH.suffix + ".tmp")
-        with tmp.open("w", encoding="utf-8") as f:
-            f.write("\n".join(lines) + "\n")
-            f.flush()
-            os.fsync(f.fileno())
-        os.replace(tmp, SCHEDULE_MD_PATH)
+        body = "\n".join(lines) + "\n"
+        if force or body != self._md_body:
+            header = f"# Schedule\n\nGenerated: {fmt_generated(now_dt)}\n\n"
+            try:
+                write_atomic(SCHEDULE_MD_PATH, header + body)
+                self._md_body = body
+            except OSError as e:
+                append_log(f"[scheduler] could not write {SCHEDULE_MD_PATH.name}: {e}")
+        self._write_schedule_feed(now_dt, force=force)
+
+    def _write_schedule_feed(self, now_dt: datetime, force: bool = False) -> None:
+        """content/status/schedule.json: the schedule table as data."""
+        jobs = [
+            {
+                "metric_id": metric_id,
+                "label": job.label or metric_id,
+                "schedule": job.schedule,
+                "next_run": iso(job.next_run),
+                "last_run": iso(job.last_run) if job.last_run else None,
+                "last_exit": job.last_exit,
+                "last_duration_ms": job.last_duration_ms,
+                "running": job.running,
+                "retry_at": iso(job.retry_at) if job.retry_at else None,
+                "attempt": job.attempt,
+                "priority": job.priority,
+                "phase_s": round(job.phase_s, 1) if job.phase_s is not None else None,
+            }
+            for metric_id, job in sorted(self.jobs.items())
+        ]
+        feed = {
+            "workers": {
+                "max": MAX_WORKERS,
+                "budget": self.concurrency_limit,
+                "under_pressure": self.under_pressure,
+                "max_starts_per_sec": self._starts_per_sec(),
+            },
+            "ready": self.ready_summary(),
+            "jobs": jobs,
+        }
+        # oldest_wait_ms moves with the clock; leave it out of the comparison
+        # so a non-empty ready queue alone does not rewrite the feed
+        ready_stable = {k: v for k, v in feed["ready"].items() if k != "oldest_wait_ms"}
+        body = json.dumps({**feed, "ready": ready_stable}, ensure_ascii=False, separators=(",", ":"))
+        if not force and body == self._feed_body:
+            return
+        try:
+            publish_json(SCHEDULE_JSON_PATH, {"generated_at": iso(now_dt), **feed}, indent=None, root=ROOT)
+            self._feed_body = body
+        except OSError as e:
+            append_log(f"[scheduler] could not write {SCHEDULE_JSON_PATH.name}: {e}")
 
 
 def main() -> int:
@@ -601,8 +1741,10 @@ def main() -> int:
         s.run_forever()
         return 0
     except Exception as e:
-        append_log(f"[scheduler] FATAL {e}")
+        append_log(f"[scheduler] FATAL {e}", event="fatal")
         return 1
+    finally:
+        EVENT_LOG.flush()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+schedules.py
+
+The schedule names a metric config may use and their interval in seconds,
+shared by the scheduler, the runner and the status snapshot.
+
+Import:
+  from tools.schedules import SCHEDULE_SECONDS, schedule_seconds
+"""
+from typing import Dict, Optional
+
+SCHEDULE_SECONDS: Dict[str, int] = {
+    "weekly": 7 * 24 * 3600,
+    "bi-daily": 2 * 24 * 3600,
+    "daily": 24 * 3600,
+    "twice-daily": 12 * 3600,
+    "hourly": 3600,
+    "half-hourly": 1800,
+    "quarter-hourly": 900,
+    "five-minutely": 300,
+    "minutely": 60,
+}
+
+
+def schedule_seconds(schedule: object) -> Optional[int]:
+    """Interval of a schedule name, or None when it is not a known schedule."""
+    return SCHEDULE_SECONDS.get(schedule) if isinstance(schedule, str) else None
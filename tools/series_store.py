@@ -0,0 +1,983 @@
+#!/usr/bin/env python3
+"""
+series_store.py
+
+Pluggable storage backends for metric series.
+
+Backends:
+- json:   content/series/<metric_id>.json  (legacy; whole file rewritten per point)
+- jsonl:  content/store/series/<metric_id>.jsonl  (append-only; one line per point)
+- partitioned: content/store/partitions/<metric_id>/<YYYY-MM>.jsonl + manifest.json
+         (monthly, or weekly <YYYY-Www> with DASH_SERIES_PARTITION=week)
+- columnar: content/store/columnar/<metric_id>/{t.i64,v.f64,sidecar.jsonl}
+         (fixed-width columns, memory-mappable with NumPy)
+- sqlite: content/store/dash.sqlite (WAL; also holds latest values and run metadata)
+
+The Gatsby site and the JSON server only read content/series/<metric_id>.json.
+Backends that keep their own on-disk format rely on tools.export_series to
+produce that `{metric_id, points}` shape.
+
+Select a backend with DASH_SERIES_BACKEND (default: json).
+
+Inside batch() every file write (latest, series, rollups, state) is staged and
+committed as one group; see tools.group_commit for the durability levels.
+
+Import:
+  from tools.series_store import get_backend
+  get_backend().append("foo_bar_baz", {"t": "...", "v": 1})
+"""
+import bisect
+import json
+import math
+import os
+import sqlite3
+import struct
+import sys
+from array import array
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+from tools.artifacts import publish_json
+from tools.group_commit import active as active_group
+from tools.group_commit import append_bytes, flush_group, group_commit, read_text, write_atomic
+
+try:
+    import numpy as np
+except ImportError:  # optional: columnar reads fall back to array.array
+    np = None
+
+ROOT = Path(__file__).resolve().parents[1]
+
+SERIES_BACKEND = os.environ.get("DASH_SERIES_BACKEND", "json")
+SQLITE_EXPORT_LATEST = os.environ.get("DASH_SQLITE_EXPORT_LATEST", "1") == "1"
+# "month" or "week"; only used by the partitioned backend
+SERIES_PARTITION = os.environ.get("DASH_SERIES_PARTITION", "month")
+
+_READ_CHUNK_BYTES = 64 * 1024
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _dump_point(point: dict) -> str:
+    return json.dumps(point, ensure_ascii=False, separators=(",", ":"))
+
+
+def point_time(point: dict) -> datetime:
+    dt = datetime.fromisoformat(point["t"])
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def in_range(point: dict, start: Optional[datetime], end: Optional[datetime]) -> bool:
+    t = point_time(point)
+    return (start is None or t >= start) and (end is None or t <= end)
+
+
+def latest_path(metric_id: str, *, root: Path = ROOT) -> Path:
+    return root / "content" / "latest" / f"{metric_id}.json"
+
+
+def write_latest_file(metric_id: str, point: dict, *, root: Path = ROOT) -> None:
+    """Publish content/latest/<metric_id>.json (read by the site and the tiles)."""
+    obj = {
+        "metric_id": metric_id,
+        "points": [point],
+    }
+    publish_json(latest_path(metric_id, root=root), obj, root=root)
+
+
+def read_latest_file(metric_id: str, *, root: Path = ROOT) -> Optional[dict]:
+    path = latest_path(metric_id, root=root)
+    try:
+        points = json.loads(read_text(path)).get("points", [])
+        return points[-1] if points else None
+    except Exception:
+        return None
+
+
+def iter_json_points(path: Path) -> Iterator[dict]:
+    """
+    Stream the items of the top-level "points" array of a legacy series file
+    without loading the whole document into memory.
+    """
+    decoder = json.JSONDecoder()
+    with path.open("r", encoding="utf-8") as f:
+        buf = ""
+        pos = -1
+        eof = False
+        while pos < 0:
+            chunk = f.read(_READ_CHUNK_BYTES)
+            if not chunk:
+                return
+            buf += chunk
+            key = buf.find('"points"')
+            if key >= 0:
+                pos = buf.find("[", key)
+        pos += 1
+
+        while True:
+            # skip whitespace and separators
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buf):
+                if eof:
+                    return
+                chunk = f.read(_READ_CHUNK_BYTES)
+                eof = not chunk
+                buf = buf[pos:] + chunk
+                pos = 0
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = f.read(_READ_CHUNK_BYTES)
+                eof = not chunk
+                buf = buf[pos:] + chunk
+                pos = 0
+                continue
+            yield obj
+            pos = end
+
+
+def truncate_torn_line(path: Path) -> None:
+    """
+    Cut a torn trailing line (crash mid-append) off a line-delimited file, so
+    the next append starts on a line of its own instead of being joined onto
+    the fragment (and then skipped with it). Appends already staged in the
+    active group were preceded by this check, so the file is left alone then.
+    """
+    group = active_group()
+    if group is not None and group.pending_append_bytes(path):
+        return
+    try:
+        f = path.open("r+b")
+    except FileNotFoundError:
+        return
+    with f:
+        end = f.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        f.seek(end - 1)
+        if f.read(1) == b"\n":
+            return
+        pos = end
+        while pos > 0:
+            step = min(_READ_CHUNK_BYTES, pos)
+            pos -= step
+            f.seek(pos)
+            nl = f.read(step).rfind(b"\n")
+            if nl >= 0:
+                f.truncate(pos + nl + 1)
+                return
+        f.truncate(0)
+
+
+def iter_jsonl_points(path: Path) -> Iterator[dict]:
+    """
+    Yield points from a line-delimited file. A torn trailing line (crash
+    mid-append) is skipped rather than failing the whole read.
+    """
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+class SeriesBackend:
+    """
+    Base class for series storage. Subclasses implement append/read/paths.
+    """
+
+    name = ""
+
+    def __init__(self, *, root: Path = ROOT) -> None:
+        self.root = root
+
+    @contextmanager
+    def batch(self) -> Iterator["SeriesBackend"]:
+        """Group the writes of several metrics (e.g. one run_metrics call)."""
+        with group_commit():
+            yield self
+
+    def write_latest(self, metric_id: str, point: dict) -> None:
+        write_latest_file(metric_id, point, root=self.root)
+
+    def read_latest(self, metric_id: str) -> Optional[dict]:
+        return read_latest_file(metric_id, root=self.root)
+
+    def iter_latest(self) -> Iterator[Tuple[str, dict]]:
+        """
+        (metric_id, point) pairs kept outside content/latest/. File backends
+        write content/latest/ directly, so there is nothing to export.
+        """
+        return iter(())
+
+    def record_run(self, metric_id: str, *, started_at: str, duration_ms: int, status: str) -> None:
+        """Run metadata is only kept by database backends; file backends ignore it."""
+
+    def append(self, metric_id: str, point: dict) -> None:
+        raise NotImplementedError
+
+    def append_many(self, metric_id: str, points: Iterable[dict]) -> int:
+        n = 0
+        for point in points:
+            self.append(metric_id, point)
+            n += 1
+        return n
+
+    def _iter_points(self, metric_id: str) -> Iterator[dict]:
+        raise NotImplementedError
+
+    def read_points(
+        self,
+        metric_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[dict]:
+        """Yield points in stored order, optionally limited to start <= t <= end."""
+        points = self._iter_points(metric_id)
+        if start is None and end is None:
+            return points
+        return (p for p in points if in_range(p, start, end))
+
+    def paths(self, metric_id: str) -> List[Path]:
+        """All on-disk files owned by this backend for metric_id."""
+        raise NotImplementedError
+
+    def exists(self, metric_id: str) -> bool:
+        return any(p.exists() for p in self.paths(metric_id))
+
+    def count(self, metric_id: str) -> int:
+        return sum(1 for _ in self.read_points(metric_id))
+
+    def list_metric_ids(self) -> List[str]:
+        raise NotImplementedError
+
+    def _rewrite(self, metric_id: str, keep: Callable[[dict], bool]) -> int:
+        """Rewrite the series keeping only points for which keep() is true."""
+        raise NotImplementedError
+
+    def prune(self, metric_id: str, *, cutoff: datetime, slack: timedelta = timedelta(0)) -> int:
+        """
+        Drop points older than cutoff. Only rewrites once the oldest point is
+        older than cutoff - slack, so callers may invoke this on every append.
+        Returns the number of points removed.
+        """
+        # The oldest point is already on disk (staged appends are newer), so
+        # the check needs no flush; only an actual rewrite commits the group.
+        first = next(self.read_points(metric_id), None)
+        if first is None or point_time(first) >= cutoff - slack:
+            return 0
+        flush_group()
+        return self._rewrite(metric_id, lambda p: point_time(p) >= cutoff)
+
+    def delete(self, metric_id: str) -> List[Path]:
+        deleted: List[Path] = []
+        for p in self.paths(metric_id):
+            if p.exists():
+                p.unlink()
+                deleted.append(p)
+        return deleted
+
+
+class JsonSeriesBackend(SeriesBackend):
+    """
+    Legacy format: one JSON document per metric, rewritten on every append.
+    """
+
+    name = "json"
+
+    def _path(self, metric_id: str) -> Path:
+        return self.root / "content" / "series" / f"{metric_id}.json"
+
+    def append(self, metric_id: str, point: dict) -> None:
+        path = self._path(metric_id)
+        try:
+            data = json.loads(read_text(path))
+        except FileNotFoundError:
+            data = {"metric_id": metric_id}
+
+        points = data.setdefault("points", [])
+        points.append(point)
+
+        # siblings come from tools.export_series, not from every append
+        publish_json(path, data, root=self.root, siblings=False)
+
+    def _iter_points(self, metric_id: str) -> Iterator[dict]:
+        path = self._path(metric_id)
+        if not path.is_file():
+            return iter(())
+        return iter_json_points(path)
+
+    def _rewrite(self, metric_id: str, keep: Callable[[dict], bool]) -> int:
+        path = self._path(metric_id)
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        points = data.get("points", [])
+        kept = [p for p in points if keep(p)]
+        data["points"] = kept
+        publish_json(path, data, root=self.root, siblings=False)
+        return len(points) - len(kept)
+
+    def paths(self, metric_id: str) -> List[Path]:
+        return [self._path(metric_id)]
+
+    def list_metric_ids(self) -> List[str]:
+        return sorted(p.stem for p in (self.root / "content" / "series").glob("*.json"))
+
+
+class JsonlSeriesBackend(SeriesBackend):
+    """
+    Append-only format: one compact JSON line per point. Appends are O(1).
+    """
+
+    name = "jsonl"
+
+    def _path(self, metric_id: str) -> Path:
+        return self.root / "content" / "store" / "series" / f"{metric_id}.jsonl"
+
+    def append(self, metric_id: str, point: dict) -> None:
+        self.append_many(metric_id, [point])
+
+    def append_many(self, metric_id: str, points: Iterable[dict]) -> int:
+        lines = [_dump_point(point) + "\n" for point in points]
+        if lines:
+            path = self._path(metric_id)
+            truncate_torn_line(path)
+            append_bytes(path, "".join(lines).encode("utf-8"))
+        return len(lines)
+
+    def _iter_points(self, metric_id: str) -> Iterator[dict]:
+        path = self._path(metric_id)
+        if not path.is_file():
+            return iter(())
+        return iter_jsonl_points(path)
+
+    def _rewrite(self, metric_id: str, keep: Callable[[dict], bool]) -> int:
+        path = self._path(metric_id)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        dropped = 0
+        with tmp.open("w", encoding="utf-8") as f:
+            for point in iter_jsonl_points(path):
+                if keep(point):
+                    f.write(_dump_point(point) + "\n")
+                else:
+                    dropped += 1
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        return dropped
+
+    def paths(self, metric_id: str) -> List[Path]:
+        return [self._path(metric_id)]
+
+    def list_metric_ids(self) -> List[str]:
+        return sorted(p.stem for p in (self.root / "content" / "store" / "series").glob("*.jsonl"))
+
+
+class PartitionedSeriesBackend(SeriesBackend):
+    """
+    Time-partitioned format: one JSONL file per month (or ISO week) plus a small
+    manifest with each partition's time range, point count and byte size.
+    Appends only touch the active partition; range reads only open partitions
+    whose range overlaps the request.
+    """
+
+    name = "partitioned"
+
+    def _dir(self, metric_id: str) -> Path:
+        return self.root / "content" / "store" / "partitions" / metric_id
+
+    def _manifest_path(self, metric_id: str) -> Path:
+        return self._dir(metric_id) / "manifest.json"
+
+    @staticmethod
+    def partition_key(dt: datetime, granularity: str = SERIES_PARTITION) -> str:
+        dt = dt.astimezone(timezone.utc)
+        if granularity == "week":
+            iso = dt.isocalendar()
+            return f"{iso.year:04d}-W{iso.week:02d}"
+        return f"{dt.year:04d}-{dt.month:02d}"
+
+    def read_manifest(self, metric_id: str) -> dict:
+        try:
+            return json.loads(read_text(self._manifest_path(metric_id)))
+        except Exception:
+            pass
+        return {"metric_id": metric_id, "granularity": SERIES_PARTITION, "partitions": []}
+
+    def _write_manifest(self, metric_id: str, manifest: dict) -> None:
+        manifest["partitions"].sort(key=lambda e: e["key"])
+        write_atomic(self._manifest_path(metric_id), json.dumps(manifest, ensure_ascii=False, indent=2))
+
+    @staticmethod
+    def _entry(manifest: dict, key: str) -> dict:
+        for e in manifest["partitions"]:
+            if e["key"] == key:
+                return e
+        e = {"key": key, "start": None, "end": None, "count": 0, "bytes": 0}
+        manifest["partitions"].append(e)
+        return e
+
+    @staticmethod
+    def _note(entry: dict, point: dict, nbytes: int) -> None:
+        t = point["t"]
+        if entry["start"] is None or point_time(point) < datetime.fromisoformat(entry["start"]):
+            entry["start"] = t
+        if entry["end"] is None or point_time(point) > datetime.fromisoformat(entry["end"]):
+            entry["end"] = t
+        entry["count"] += 1
+        entry["bytes"] += nbytes
+
+    def append(self, metric_id: str, point: dict) -> None:
+        self.append_many(metric_id, [point])
+
+    def append_many(self, metric_id: str, points: Iterable[dict]) -> int:
+        manifest = self.read_manifest(metric_id)
+        granularity = manifest.get("granularity", SERIES_PARTITION)
+        d = self._dir(metric_id)
+
+        n = 0
+        chunks: Dict[str, List[bytes]] = {}
+        for point in points:
+            key = self.partition_key(point_time(point), granularity)
+            line = (_dump_point(point) + "\n").encode("utf-8")
+            chunks.setdefault(key, []).append(line)
+            self._note(self._entry(manifest, key), point, len(line))
+            n += 1
+        # Partition files first, manifest last: a crash in between only leaves
+        # points the manifest does not count yet.
+        for key, lines in chunks.items():
+            truncate_torn_line(d / f"{key}.jsonl")
+            append_bytes(d / f"{key}.jsonl", b"".join(lines))
+
+        if n:
+            self._write_manifest(metric_id, manifest)
+        return n
+
+    def _overlapping(self, metric_id: str, start: Optional[datetime], end: Optional[datetime]) -> List[dict]:
+        out = []
+        for e in self.read_manifest(metric_id)["partitions"]:
+            if e["count"] == 0:
+                continue
+            if start is not None and datetime.fromisoformat(e["end"]) < start:
+                continue
+            if end is not None and datetime.fromisoformat(e["start"]) > end:
+                continue
+            out.append(e)
+        return out
+
+    def read_points(
+        self,
+        metric_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[dict]:
+        d = self._dir(metric_id)
+        for e in self._overlapping(metric_id, start, end):
+            path = d / f"{e['key']}.jsonl"
+            if not path.is_file():
+                continue
+            for point in iter_jsonl_points(path):
+                if (start is None and end is None) or in_range(point, start, end):
+                    yield point
+
+    def count(self, metric_id: str) -> int:
+        return sum(e["count"] for e in self.read_manifest(metric_id)["partitions"])
+
+    def prune(self, metric_id: str, *, cutoff: datetime, slack: timedelta = timedelta(0)) -> int:
+        # Same tests as the loop below, on the manifest alone: flush (and
+        # rewrite) only when some partition has expired points
+        if not any(
+            e["count"]
+            and (datetime.fromisoformat(e["end"]) < cutoff or datetime.fromisoformat(e["start"]) < cutoff - slack)
+            for e in self.read_manifest(metric_id)["partitions"]
+        ):
+            return 0
+        flush_group()
+        manifest = self.read_manifest(metric_id)
+        d = self._dir(metric_id)
+        dropped = 0
+        kept = []
+        for e in manifest["partitions"]:
+            path = d / f"{e['key']}.jsonl"
+            if e["count"] and datetime.fromisoformat(e["end"]) < cutoff:
+                # whole partition expired
+                if path.exists():
+                    path.unlink()
+                dropped += e["count"]
+                continue
+            if e["count"] and datetime.fromisoformat(e["start"]) < cutoff - slack:
+                tmp = path.with_suffix(path.suffix + ".tmp")
+                fresh = {"key": e["key"], "start": None, "end": None, "count": 0, "bytes": 0}
+                with tmp.open("w", encoding="utf-8") as f:
+                    for point in iter_jsonl_points(path):
+                        if point_time(point) >= cutoff:
+                            line = _dump_point(point) + "\n"
+                            f.write(line)
+                            self._note(fresh, point, len(line.encode("utf-8")))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, path)
+                dropped += e["count"] - fresh["count"]
+                e = fresh
+            kept.append(e)
+        if dropped:
+            manifest["partitions"] = kept
+            self._write_manifest(metric_id, manifest)
+        return dropped
+
+    def paths(self, metric_id: str) -> List[Path]:
+        d = self._dir(metric_id)
+        if not d.is_dir():
+            return [self._manifest_path(metric_id)]
+        return sorted(d.iterdir())
+
+    def delete(self, metric_id: str) -> List[Path]:
+        deleted = super().delete(metric_id)
+        d = self._dir(metric_id)
+        if d.is_dir() and not any(d.iterdir()):
+            d.rmdir()
+        return deleted
+
+    def list_metric_ids(self) -> List[str]:
+        base = self.root / "content" / "store" / "partitions"
+        return sorted(p.name for p in base.glob("*") if (p / "manifest.json").is_file())
+
+
+class ColumnarSeriesBackend(SeriesBackend):
+    """
+    Columnar binary format for numeric metrics:
+
+    - t.i64        little-endian int64 epoch microseconds, one per point
+    - v.f64        little-endian float64 value, one per point (NaN for string points)
+    - sidecar.jsonl  sparse extras keyed by row index: {"i": 12, "vv": {...}, "meta": "..."}
+    - meta.json    {"v": "int"} or {"v": "float"}: the type of the first value;
+                   rows of the other type are marked in the sidecar ("vt")
+
+    The two columns can be memory-mapped as NumPy arrays (read_columns) without
+    any parsing. NumPy is optional; without it columns load into array.array.
+    Rows are expected in time order, which is what the runner produces.
+    """
+
+    name = "columnar"
+
+    T_FILE = "t.i64"
+    V_FILE = "v.f64"
+    SIDECAR_FILE = "sidecar.jsonl"
+    META_FILE = "meta.json"
+
+    def _dir(self, metric_id: str) -> Path:
+        return self.root / "content" / "store" / "columnar" / metric_id
+
+    @staticmethod
+    def _to_us(point: dict) -> int:
+        return (point_time(point) - _EPOCH) // timedelta(microseconds=1)
+
+    @staticmethod
+    def _from_us(us: int) -> str:
+        return (_EPOCH + timedelta(microseconds=int(us))).isoformat()
+
+    def _rows_in(self, d: Path) -> int:
+        try:
+            n_t = (d / self.T_FILE).stat().st_size // 8
+            n_v = (d / self.V_FILE).stat().st_size // 8
+        except FileNotFoundError:
+            return 0
+        return min(n_t, n_v)
+
+    def _rows(self, metric_id: str) -> int:
+        return self._rows_in(self._dir(metric_id))
+
+    def _value_type(self, d: Path, rows: int) -> Optional[str]:
+        """"int" or "float" for unmarked rows; None before the first value."""
+        try:
+            return json.loads(read_text(d / self.META_FILE)).get("v") or "float"
+        except FileNotFoundError:
+            return "float" if rows else None  # columns written before meta.json held floats
+        except ValueError:
+            return "float"
+
+    def _append_rows(self, d: Path, points: Iterable[dict]) -> int:
+        t_path, v_path, s_path = d / self.T_FILE, d / self.V_FILE, d / self.SIDECAR_FILE
+        group = active_group()
+        pending = group.pending_append_bytes(t_path) // 8 if group is not None else 0
+        i = self._rows_in(d)
+        if not pending:
+            # Truncate columns to the last complete row (after a crash mid-append)
+            for path in (t_path, v_path):
+                if path.exists() and path.stat().st_size != i * 8:
+                    os.truncate(path, i * 8)
+        i += pending
+        vtype = self._value_type(d, i)
+        new_vtype = vtype is None
+
+        n = 0
+        t_buf, v_buf, sidecar = bytearray(), bytearray(), []
+        for point in points:
+            v = point.get("v")
+            extra = {k: val for k, val in point.items() if k not in ("t", "v")}
+            if isinstance(v, bool) or not isinstance(v, (int, float)):
+                if v is not None:
+                    extra["v"] = v  # keep bools (and anything odd) exact
+                value = math.nan
+            else:
+                value = float(v)
+                kind = "int" if isinstance(v, int) else "float"
+                if kind == "int" and int(value) != v:
+                    extra["v"] = v  # beyond float64's exact integers
+                if vtype is None:
+                    vtype = kind
+                elif kind != vtype:
+                    extra["vt"] = kind
+            if extra:
+                sidecar.append(_dump_point({"i": i + n, **extra}) + "\n")
+            v_buf += struct.pack("<d", value)
+            t_buf += struct.pack("<q", self._to_us(point))
+            n += 1
+        if n:
+            if new_vtype and vtype is not None:
+                write_atomic(d / self.META_FILE, json.dumps({"v": vtype}))
+            # Sidecar and values before times: a row only counts once its time is written
+            if sidecar:
+                truncate_torn_line(s_path)
+                append_bytes(s_path, "".join(sidecar).encode("utf-8"))
+            append_bytes(v_path, bytes(v_buf))
+            append_bytes(t_path, bytes(t_buf))
+        return n
+
+    def append(self, metric_id: str, point: dict) -> None:
+        self._append_rows(self._dir(metric_id), [point])
+
+    def append_many(self, metric_id: str, points: Iterable[dict]) -> int:
+        return self._append_rows(self._dir(metric_id), points)
+
+    def read_columns(
+        self,
+        metric_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Tuple[object, object, int]:
+        """
+        Return (t_us, v, offset): memory-mapped int64/float64 arrays (NumPy) or
+        array.array copies, sliced to [start, end], and the row index of t_us[0].
+        """
+        n = self._rows(metric_id)
+        d = self._dir(metric_id)
+        if n == 0:
+            t_col, v_col = (np.empty(0, "<i8"), np.empty(0, "<f8")) if np is not None else (array("q"), array("d"))
+        elif np is not None:
+            t_col = np.memmap(d / self.T_FILE, dtype="<i8", mode="r", shape=(n,))
+            v_col = np.memmap(d / self.V_FILE, dtype="<f8", mode="r", shape=(n,))
+        else:
+            t_col, v_col = array("q"), array("d")
+            with (d / self.T_FILE).open("rb") as f:
+                t_col.frombytes(f.read(n * 8))
+            with (d / self.V_FILE).open("rb") as f:
+                v_col.frombytes(f.read(n * 8))
+            if sys.byteorder != "little":
+                t_col.byteswap()
+                v_col.byteswap()
+
+        lo, hi = 0, n
+        if start is not None:
+            us = (start - _EPOCH) // timedelta(microseconds=1)
+            lo = int(np.searchsorted(t_col, us, "left")) if np is not None else bisect.bisect_left(t_col, us)
+        if end is not None:
+            us = (end - _EPOCH) // timedelta(microseconds=1)
+            hi = int(np.searchsorted(t_col, us, "right")) if np is not None else bisect.bisect_right(t_col, us)
+        return t_col[lo:hi], v_col[lo:hi], lo
+
+    def _sidecar(self, metric_id: str) -> Dict[int, dict]:
+        path = self._dir(metric_id) / self.SIDECAR_FILE
+        out: Dict[int, dict] = {}
+        if path.is_file():
+            for extra in iter_jsonl_points(path):
+                out[extra.pop("i")] = extra
+        return out
+
+    def read_points(
+        self,
+        metric_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[dict]:
+        t_col, v_col, offset = self.read_columns(metric_id, start, end)
+        extras = self._sidecar(metric_id)
+        vtype = self._value_type(self._dir(metric_id), len(t_col))
+        for j in range(len(t_col)):
+            point = {"t": self._from_us(t_col[j])}
+            extra = dict(extras.get(offset + j, {}))
+            kind = extra.pop("vt", vtype)
+            value = float(v_col[j])
+            if not math.isnan(value):
+                point["v"] = int(value) if kind == "int" else value
+            point.update(extra)
+            yield point
+
+    def count(self, metric_id: str) -> int:
+        return self._rows(metric_id)
+
+    def prune(self, metric_id: str, *, cutoff: datetime, slack: timedelta = timedelta(0)) -> int:
+        t_col, _, _ = self.read_columns(metric_id)
+        if len(t_col) == 0 or int(t_col[0]) >= ((cutoff - slack) - _EPOCH) // timedelta(microseconds=1):
+            return 0
+        del t_col
+        flush_group()
+        dropped = self._rows(metric_id)
+
+        # Build the kept rows in a sibling directory, then swap the files in
+        d = self._dir(metric_id)
+        tmp = d.with_name(d.name + ".tmp")
+        tmp.mkdir(exist_ok=True)
+        for name in (self.T_FILE, self.V_FILE, self.SIDECAR_FILE, self.META_FILE):
+            (tmp / name).unlink(missing_ok=True)
+        with group_commit():
+            dropped -= self._append_rows(tmp, self.read_points(metric_id, start=cutoff))
+        flush_group()
+        for name in (self.META_FILE, self.SIDECAR_FILE, self.V_FILE, self.T_FILE):
+            if (tmp / name).exists():
+                os.replace(tmp / name, d / name)
+            else:
+                (d / name).unlink(missing_ok=True)
+        tmp.rmdir()
+        return dropped
+
+    def paths(self, metric_id: str) -> List[Path]:
+        d = self._dir(metric_id)
+        return [d / self.T_FILE, d / self.V_FILE, d / self.SIDECAR_FILE, d / self.META_FILE]
+
+    def delete(self, metric_id: str) -> List[Path]:
+        deleted = super().delete(metric_id)
+        d = self._dir(metric_id)
+        if d.is_dir() and not any(d.iterdir()):
+            d.rmdir()
+        return deleted
+
+    def list_metric_ids(self) -> List[str]:
+        base = self.root / "content" / "store" / "columnar"
+        return sorted(p.name for p in base.glob("*") if (p / self.T_FILE).is_file())
+
+
+class SqliteSeriesBackend(SeriesBackend):
+    """
+    One SQLite database (WAL mode) for latest values, series points and run
+    metadata: content/store/dash.sqlite. Points are indexed on (metric_id, t)
+    with t in epoch microseconds.
+
+    Inside batch() writes are staged and committed in one transaction. The static files the site
+    reads are produced by tools.export_series; latest files of the metrics
+    written in a batch are exported when the batch commits (DASH_SQLITE_EXPORT_LATEST=0
+    to disable).
+    """
+
+    name = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS points (
+            metric_id TEXT NOT NULL,
+            t INTEGER NOT NULL,
+            point TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS points_metric_t ON points (metric_id, t);
+        CREATE TABLE IF NOT EXISTS latest (
+            metric_id TEXT PRIMARY KEY,
+            t INTEGER NOT NULL,
+            point TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS runs (
+            metric_id TEXT NOT NULL,
+            started_at TEXT NOT NULL,
+            duration_ms INTEGER,
+            status TEXT
+        );
+        CREATE INDEX IF NOT EXISTS runs_metric_started ON runs (metric_id, started_at);
+    """
+
+    def __init__(self, *, root: Path = ROOT) -> None:
+        super().__init__(root=root)
+        self.path = root / "content" / "store" / "dash.sqlite"
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending: Optional[List[Tuple[str, List[tuple]]]] = None
+        self._touched_latest: Dict[str, dict] = {}
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self.SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _us(dt: datetime) -> int:
+        return (dt - _EPOCH) // timedelta(microseconds=1)
+
+    def _write(self, sql: str, rows: List[tuple]) -> int:
+        if self._pending is not None:
+            self._pending.append((sql, rows))
+            return len(rows)
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cur = conn.executemany(sql, rows)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return cur.rowcount
+
+    @contextmanager
+    def batch(self) -> Iterator["SqliteSeriesBackend"]:
+        """
+        Stage writes in memory and commit them in a single transaction on exit,
+        so the write lock is never held while metric scripts run. Exported
+        latest files join the batch's group commit.
+        """
+        if self._pending is not None:
+            yield self
+            return
+        self._pending = []
+        with group_commit():
+            try:
+                yield self
+            finally:
+                pending, self._pending = self._pending, None
+                if pending:
+                    conn = self.conn
+                    conn.execute("BEGIN IMMEDIATE")
+                    try:
+                        for sql, rows in pending:
+                            conn.executemany(sql, rows)
+                    except BaseException:
+                        conn.execute("ROLLBACK")
+                        self._touched_latest.clear()
+                        raise
+                    conn.execute("COMMIT")
+                if SQLITE_EXPORT_LATEST:
+                    for metric_id, point in self._touched_latest.items():
+                        write_latest_file(metric_id, point, root=self.root)
+                self._touched_latest.clear()
+
+    def write_latest(self, metric_id: str, point: dict) -> None:
+        self._write(
+            "INSERT OR REPLACE INTO latest (metric_id, t, point) VALUES (?, ?, ?)",
+            [(metric_id, self._us(point_time(point)), _dump_point(point))],
+        )
+        self._touched_latest[metric_id] = point
+        if self._pending is None and SQLITE_EXPORT_LATEST:
+            write_latest_file(metric_id, point, root=self.root)
+            self._touched_latest.clear()
+
+    def read_latest(self, metric_id: str) -> Optional[dict]:
+        if not self.path.exists():
+            return None
+        row = self.conn.execute("SELECT point FROM latest WHERE metric_id = ?", (metric_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter_latest(self) -> Iterator[Tuple[str, dict]]:
+        if not self.path.exists():
+            return
+        for metric_id, point in self.conn.execute("SELECT metric_id, point FROM latest ORDER BY metric_id"):
+            yield metric_id, json.loads(point)
+
+    def record_run(self, metric_id: str, *, started_at: str, duration_ms: int, status: str) -> None:
+        self._write(
+            "INSERT INTO runs (metric_id, started_at, duration_ms, status) VALUES (?, ?, ?, ?)",
+            [(metric_id, started_at, duration_ms, status)],
+        )
+
+    def append(self, metric_id: str, point: dict) -> None:
+        self.append_many(metric_id, [point])
+
+    def append_many(self, metric_id: str, points: Iterable[dict]) -> int:
+        rows = [(metric_id, self._us(point_time(p)), _dump_point(p)) for p in points]
+        return self._write("INSERT INTO points (metric_id, t, point) VALUES (?, ?, ?)", rows)
+
+    def read_points(
+        self,
+        metric_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[dict]:
+        if not self.path.exists():
+            return
+        sql = "SELECT point FROM points WHERE metric_id = ?"
+        args: list = [metric_id]
+        if start is not None:
+            sql += " AND t >= ?"
+            args.append(self._us(start))
+        if end is not None:
+            sql += " AND t <= ?"
+            args.append(self._us(end))
+        for (point,) in self.conn.execute(sql + " ORDER BY t, rowid", args):
+            yield json.loads(point)
+
+    def count(self, metric_id: str) -> int:
+        if not self.path.exists():
+            return 0
+        return self.conn.execute("SELECT COUNT(*) FROM points WHERE metric_id = ?", (metric_id,)).fetchone()[0]
+
+    def exists(self, metric_id: str) -> bool:
+        if not self.path.exists():
+            return False
+        row = self.conn.execute(
+            "SELECT 1 FROM points WHERE metric_id = ? UNION ALL SELECT 1 FROM latest WHERE metric_id = ? LIMIT 1",
+            (metric_id, metric_id),
+        ).fetchone()
+        return row is not None
+
+    def prune(self, metric_id: str, *, cutoff: datetime, slack: timedelta = timedelta(0)) -> int:
+        # Deleting by index range is cheap, so slack is not needed here.
+        return self._write("DELETE FROM points WHERE metric_id = ? AND t < ?", [(metric_id, self._us(cutoff))])
+
+    def paths(self, metric_id: str) -> List[Path]:
+        # Shared database file: never owned by a single metric.
+        return []
+
+    def delete(self, metric_id: str) -> List[Path]:
+        for table in ("points", "latest", "runs"):
+            self._write(f"DELETE FROM {table} WHERE metric_id = ?", [(metric_id,)])
+        return []
+
+    def list_metric_ids(self) -> List[str]:
+        if not self.path.exists():
+            return []
+        return [r[0] for r in self.conn.execute("SELECT DISTINCT metric_id FROM points ORDER BY metric_id")]
+
+
+BACKENDS: Dict[str, Type[SeriesBackend]] = {
+    JsonSeriesBackend.name: JsonSeriesBackend,
+    JsonlSeriesBackend.name: JsonlSeriesBackend,
+    PartitionedSeriesBackend.name: PartitionedSeriesBackend,
+    ColumnarSeriesBackend.name: ColumnarSeriesBackend,
+    SqliteSeriesBackend.name: SqliteSeriesBackend,
+}
+
+_INSTANCES: Dict[Tuple[str, Path], SeriesBackend] = {}
+
+
+def get_backend(name: Optional[str] = None, *, root: Path = ROOT) -> SeriesBackend:
+    name = name or SERIES_BACKEND
+    try:
+        cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown series backend '{name}': expected one of {sorted(BACKENDS)}")
+    # One instance per (backend, root) so batch() spans every write of a run
+    key = (name, root)
+    if key not in _INSTANCES:
+        _INSTANCES[key] = cls(root=root)
+    return _INSTANCES[key]
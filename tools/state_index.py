@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+state_index.py
+
+Compact per-metric state kept next to the series store, so the runner (and the
+scheduler) can find a metric's last value and alert state without parsing its
+latest file or config:
+
+  content/store/state/<metric_id>.json
+  {
+    "metric_id": "foo_bar_baz",
+    "t": "<timestamp of last point>",
+    "value": 12.5,
+    "status": "ok" | "info" | "warning" | "critical",
+    "config": {"v": 3, "mtime_ns": ..., "alerts": [...], "schedule": "hourly", "tail_points": 50, ...}
+  }
+
+"config" caches the few config keys the runner needs (and values derived from
+the config), keyed by the config file's mtime, so an unchanged config costs one
+stat() instead of a parse. "v" is bumped whenever the cached view changes shape.
+
+Import:
+  from tools.state_index import read_state, write_state
+"""
+import json
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from tools.series_store import ROOT, read_text, write_atomic
+from tools.tail import tail_size
+
+# Config keys cached in the state entry
+CONFIG_KEYS = ("alerts", "notify_whatsapp", "retention", "schedule", "timeout")
+
+# Version of the cached config view; entries with another version are rebuilt
+CONFIG_VIEW_VERSION = 4
+
+
+def state_path(metric_id: str, *, root: Path = ROOT) -> Path:
+    return root / "content" / "store" / "state" / f"{metric_id}.json"
+
+
+def read_state(metric_id: str, *, root: Path = ROOT) -> Optional[dict]:
+    path = state_path(metric_id, root=root)
+    try:
+        return json.loads(read_text(path))
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Treat a corrupt entry like a missing one; the next write replaces it.
+        return None
+
+
+def write_state(metric_id: str, state: dict, *, root: Path = ROOT) -> None:
+    state = {"metric_id": metric_id, **state}
+    write_atomic(state_path(metric_id, root=root), json.dumps(state, ensure_ascii=False, separators=(",", ":")))
+
+
+def iter_states(*, root: Path = ROOT) -> Iterator[Tuple[str, dict]]:
+    for path in sorted((root / "content" / "store" / "state").glob("*.json")):
+        state = read_state(path.stem, root=root)
+        if state is not None:
+            yield path.stem, state
+
+
+def cached_config(metric_id: str, state: Optional[dict], *, root: Path = ROOT) -> Dict[str, object]:
+    """
+    Return the CONFIG_KEYS subset of the metric config (plus derived values
+    and "mtime_ns"), reusing the copy in state while the config file is unchanged.
+    """
+    path = root / "content" / "configs" / f"{metric_id}.json"
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return {}
+
+    cached = (state or {}).get("config")
+    if isinstance(cached, dict) and cached.get("mtime_ns") == mtime_ns and cached.get("v") == CONFIG_VIEW_VERSION:
+        return cached
+
+    try:
+        full = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}  # not cached: retried on the next run
+    view: Dict[str, object] = {k: full[k] for k in CONFIG_KEYS if k in full}
+    view["tail_points"] = tail_size(full)
+    view["mtime_ns"] = mtime_ns
+    view["v"] = CONFIG_VIEW_VERSION
+    return view
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+static_server.py
+
+Small static file server for the dashboard's JSON folders, a drop-in for
+json-server.js that understands the precompressed artifacts written by
+tools.artifacts:
+
+- serves only the approved folders (/latest, /series, /rollups, /tail,
+  /status, /configs, /scripts, /prompts, /tools)
+- picks the .br / .gz sibling of a file when the client accepts it and the
+  sibling is current
+- strong ETags from content/store/etags.json (weak size/mtime ETags otherwise)
+- conditional GET (If-None-Match / If-Modified-Since -> 304)
+- single byte ranges (Range / If-Range -> 206, 416)
+
+Responses carry "Cache-Control: no-cache", so browsers revalidate instead of
+re-downloading unchanged files.
+
+CLI:
+  python3 -m tools.static_server
+  python3 -m tools.static_server --port 7000 --root /srv/content
+
+Uses the same environment as json-server.js: JSON_PORT, JSON_ROOT.
+"""
+import argparse
+import json
+import mimetypes
+import os
+import re
+import sys
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from tools.artifacts import sibling_path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+PORT = int(os.environ.get("JSON_PORT", "7000"))
+CONTENT_ROOT = Path(os.environ.get("JSON_ROOT", str(ROOT / "content")))
+
+# Folders served from the content root (plus tools/ from the repo root)
+APPROVED_DIRS = ("latest", "series", "rollups", "tail", "status", "configs", "scripts", "prompts")
+
+CACHE_CONTROL = "no-cache"
+
+# Content-Encoding token -> sibling suffix, in order of preference
+_ENCODINGS: List[Tuple[str, str]] = [("br", "br"), ("gzip", "gz")]
+
+# OpenMetrics text published by the scheduler (content/status/scheduler.prom)
+mimetypes.add_type("application/openmetrics-text; version=1.0.0; charset=utf-8", ".prom")
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_COPY_CHUNK_BYTES = 64 * 1024
+
+
+class EtagManifest:
+    """content/store/etags.json, reloaded whenever the file changes."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._mtime_ns: Optional[int] = None
+        self._entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        try:
+            mtime_ns = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            if mtime_ns != self._mtime_ns:
+                try:
+                    self._entries = json.loads(self.path.read_text(encoding="utf-8"))
+                except Exception:
+                    self._entries = {}
+                self._mtime_ns = mtime_ns
+            return self._entries.get(key)
+
+
+def _accepted_encodings(header: str) -> List[str]:
+    accepted = []
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q=") and q[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        if token.strip():
+            accepted.append(token.strip().lower())
+    return accepted
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single "bytes=a-b" range into an inclusive (start, end).
+    Returns None for unsupported forms (served as a full 200) and raises
+    ValueError when the range cannot be satisfied.
+    """
+    m = _RANGE_RE.match(header.strip())
+    if not m or m.group(1) == m.group(2) == "":
+        return None
+    first, last = m.group(1), m.group(2)
+    if first == "":
+        n = int(last)
+        if n == 0:
+            raise ValueError("empty suffix range")
+        return max(size - n, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError("range not satisfiable")
+    return start, end
+
+
+class StaticHandler(BaseHTTPRequestHandler):
+    server_version = "DashStatic/1.0"
+    content_root: Path = CONTENT_ROOT
+    tools_root: Path = ROOT / "tools"
+    manifest: EtagManifest
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - stdlib signature
+        sys.stderr.write(f"[static] {self.address_string()} {format % args}\n")
+
+    def do_GET(self) -> None:
+        self._serve(send_body=True)
+
+    def do_HEAD(self) -> None:
+        self._serve(send_body=False)
+
+    # ---- resolution ------------------------------------------------------
+
+    def _resolve(self, url_path: str) -> Optional[Path]:
+        parts = [p for p in unquote(url_path).split("/") if p]
+        if len(parts) < 2 or any(p in (".", "..") or p.startswith(".") for p in parts):
+            return None
+        if parts[0] == "tools":
+            base = self.tools_root
+        elif parts[0] in APPROVED_DIRS:
+            base = self.content_root / parts[0]
+        else:
+            return None
+        path = base.joinpath(*parts[1:])
+        return path if path.is_file() else None
+
+    def _pick_encoding(self, path: Path, mtime_ns: int) -> Tuple[Path, Optional[str], Optional[str]]:
+        """(file to send, Content-Encoding, sibling suffix) for this request."""
+        accepted = _accepted_encodings(self.headers.get("Accept-Encoding", ""))
+        for token, suffix in _ENCODINGS:
+            if token not in accepted:
+                continue
+            sibling = sibling_path(path, suffix)
+            try:
+                # A sibling older than its source is stale (e.g. mid-update)
+                if sibling.stat().st_mtime_ns >= mtime_ns:
+                    return sibling, token, suffix
+            except FileNotFoundError:
+                continue
+        return path, None, None
+
+    def _etag(self, path: Path, st: os.stat_result, suffix: Optional[str]) -> str:
+        try:
+            key = path.relative_to(self.content_root).as_posix()
+        except ValueError:
+            key = None
+        entry = self.manifest.get(key) if key else None
+        if entry and entry.get("mtime_ns") == st.st_mtime_ns and entry.get("bytes") == st.st_size:
+            return f'"{entry["etag"]}-{suffix}"' if suffix else f'"{entry["etag"]}"'
+        tag = f"{st.st_size:x}-{st.st_mtime_ns:x}"
+        return f'W/"{tag}-{suffix}"' if suffix else f'W/"{tag}"'
+
+    # ---- responses -------------------------------------------------------
+
+    def _not_found(self, send_body: bool) -> None:
+        body = json.dumps({"error": "Not found"}).encode("utf-8")
+        self.send_response(HTTPStatus.NOT_FOUND)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _not_modified(self, etag: str, inm: Optional[str], ims: Optional[str], mtime: float) -> bool:
+        if inm is not None:
+            tags = [t.strip() for t in inm.split(",")]
+            weak = etag[2:] if etag.startswith("W/") else etag
+            return "*" in tags or any((t[2:] if t.startswith("W/") else t) == weak for t in tags)
+        if ims is not None:
+            try:
+                return int(mtime) <= parsedate_to_datetime(ims).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _serve(self, send_body: bool) -> None:
+        url_path = urlsplit(self.path).path
+        if url_path == "/health":
+            body = b"ok"
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+            return
+
+        path = self._resolve(url_path)
+        if path is None:
+            self._not_found(send_body)
+            return
+
+        source_st = path.stat()
+        body_path, encoding, suffix = self._pick_encoding(path, source_st.st_mtime_ns)
+        st = body_path.stat()
+        etag = self._etag(path, source_st, suffix)
+        last_modified = formatdate(source_st.st_mtime, usegmt=True)
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+        def common_headers() -> None:
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.send_header("Cache-Control", CACHE_CONTROL)
+            self.send_header("Vary", "Accept-Encoding")
+            self.send_header("Accept-Ranges", "bytes")
+
+        if self._not_modified(etag, self.headers.get("If-None-Match"), self.headers.get("If-Modified-Since"), source_st.st_mtime):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            common_headers()
+            self.end_headers()
+            return
+
+        size = st.st_size
+        span = None
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if range_header and (if_range is None or (if_range == etag and not etag.startswith("W/"))):
+            try:
+                span = _parse_range(range_header, size)
+            except ValueError:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                common_headers()
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+        start, end = span if span is not None else (0, size - 1)
+        length = end - start + 1 if size else 0
+        self.send_response(HTTPStatus.PARTIAL_CONTENT if span is not None else HTTPStatus.OK)
+        common_headers()
+        self.send_header("Content-Type", content_type)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if span is not None:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("Content-Length", str(length))
+        self.end_headers()
+        if not send_body or length == 0:
+            return
+        with body_path.open("rb") as f:
+            f.seek(start)
+            remaining = length
+            while remaining > 0:
+                chunk = f.read(min(_COPY_CHUNK_BYTES, remaining))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+
+
+def make_server(host: str, port: int, content_root: Path) -> ThreadingHTTPServer:
+    handler = type(
+        "BoundStaticHandler",
+        (StaticHandler,),
+        {"content_root": content_root, "manifest": EtagManifest(content_root / "store" / "etags.json")},
+    )
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description="Serve the dashboard JSON folders with precompression, ETags and ranges.")
+    ap.add_argument("--host", default="0.0.0.0", help="Bind address (default: 0.0.0.0).")
+    ap.add_argument("--port", type=int, default=PORT, help="Port (default: JSON_PORT or 7000).")
+    ap.add_argument("--root", type=Path, default=CONTENT_ROOT, help="Content root (default: JSON_ROOT or content/).")
+    return ap
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = _build_arg_parser().parse_args(argv)
+    for name in APPROVED_DIRS:
+        if not (args.root / name).exists():
+            print(f"[static] WARNING: {args.root / name} does not exist", file=sys.stderr)
+    server = make_server(args.host, args.port, args.root)
+    print(f"[static] listening on {args.host}:{args.port}")
+    print(f"[static] root = {args.root}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
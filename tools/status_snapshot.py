@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+status_snapshot.py
+
+One consolidated snapshot of every metric's latest point, so the homepage can
+refresh all tiles with a single request:
+
+  content/status/latest.json
+  {
+    "generated_at": "<iso>",
+    "metrics": {
+      "foo_bar_baz": {
+        "point": {"t": "...", "v": 12.5},
+        "status": "ok" | "info" | "warning" | "critical",
+        "schedule": "minutely",
+        "stale_after": "<iso>",
+        "stale": false
+      }
+    }
+  }
+
+A metric is stale once its last point is older than DASH_STALE_FACTOR
+intervals of its schedule plus DASH_STALE_GRACE_SECONDS.
+
+The runner updates its metrics' entries after each batch; the scheduler
+refreshes the "stale" flags every DASH_SNAPSHOT_REFRESH_SECONDS. Both
+read-modify-write under an flock and swap the file in atomically.
+
+CLI (rebuild from content/latest/ and the configs):
+  python3 -m tools.status_snapshot --rebuild
+
+Import:
+  from tools.status_snapshot import update_snapshot
+"""
+import argparse
+import fcntl
+import json
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from tools.artifacts import publish_json
+from tools.group_commit import active as active_group
+from tools.schedules import schedule_seconds
+from tools.series_store import ROOT, point_time, read_latest_file
+
+STALE_FACTOR = float(os.environ.get("DASH_STALE_FACTOR", "2"))
+STALE_GRACE_SECONDS = int(os.environ.get("DASH_STALE_GRACE_SECONDS", "120"))
+SNAPSHOT_REFRESH_SECONDS = float(os.environ.get("DASH_SNAPSHOT_REFRESH_SECONDS", "60"))
+
+# root -> {metric_id -> entry}, waiting for the group commit to land
+_PENDING: Dict[Path, Dict[str, dict]] = {}
+
+
+def snapshot_path(*, root: Path = ROOT) -> Path:
+    return root / "content" / "status" / "latest.json"
+
+
+def _now_iso(now: datetime) -> str:
+    return now.astimezone(timezone.utc).isoformat()
+
+
+def stale_after(point: dict, schedule: object) -> Optional[str]:
+    interval_s = schedule_seconds(schedule)
+    if interval_s is None or "t" not in point:
+        return None
+    limit = point_time(point) + timedelta(seconds=interval_s * STALE_FACTOR + STALE_GRACE_SECONDS)
+    return limit.isoformat()
+
+
+def make_entry(point: dict, *, status: str, schedule: object, now: Optional[datetime] = None) -> dict:
+    now = now or datetime.now(timezone.utc)
+    after = stale_after(point, schedule)
+    return {
+        "point": point,
+        "status": status,
+        "schedule": schedule,
+        "stale_after": after,
+        "stale": after is not None and datetime.fromisoformat(after) < now,
+    }
+
+
+def read_snapshot(*, root: Path = ROOT) -> dict:
+    try:
+        data = json.loads(snapshot_path(root=root).read_text(encoding="utf-8"))
+        if isinstance(data.get("metrics"), dict):
+            return data
+    except Exception:
+        pass
+    return {"generated_at": None, "metrics": {}}
+
+
+@contextmanager
+def _locked(root: Path) -> Iterator[dict]:
+    """Read the snapshot under an exclusive lock; write it back on exit."""
+    path = snapshot_path(root=root)
+    # The lock file lives outside the served content/status/ folder
+    lock_path = root / "content" / "store" / "status_latest.lock"
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with lock_path.open("a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        snapshot = read_snapshot(root=root)
+        yield snapshot
+        if snapshot.pop("_dirty", True):
+            snapshot["generated_at"] = _now_iso(datetime.now(timezone.utc))
+            publish_json(path, snapshot, indent=None, root=root)
+
+
+def _apply(entries: Dict[str, Optional[dict]], root: Path) -> None:
+    with _locked(root) as snapshot:
+        metrics = snapshot["metrics"]
+        for metric_id, entry in entries.items():
+            if entry is None:
+                metrics.pop(metric_id, None)
+                continue
+            old = metrics.get(metric_id)
+            # Never replace a newer point (two runs of one metric finishing out of order)
+            if old and old.get("point", {}).get("t", "") > entry["point"].get("t", ""):
+                continue
+            metrics[metric_id] = entry
+
+
+def _flush_pending(root: Path) -> None:
+    entries = _PENDING.pop(root, {})
+    if entries:
+        _apply(entries, root)
+
+
+def update_snapshot(metric_id: str, entry: dict, *, root: Path = ROOT) -> None:
+    """
+    Set metric_id's entry. Inside a group commit the snapshot is written once,
+    after the batch's files are in place.
+    """
+    group = active_group()
+    if group is None:
+        _apply({metric_id: entry}, root)
+        return
+    _PENDING.setdefault(root, {})[metric_id] = entry
+    group.after_commit(f"snapshot:{root}", lambda: _flush_pending(root))
+
+
+def remove_from_snapshot(metric_ids: Iterable[str], *, root: Path = ROOT) -> None:
+    if snapshot_path(root=root).exists():
+        _apply({metric_id: None for metric_id in metric_ids}, root)
+
+
+def refresh_staleness(*, root: Path = ROOT, known: Optional[Iterable[str]] = None, now: Optional[datetime] = None) -> int:
+    """
+    Recompute the "stale" flags and drop metrics not in known (when given).
+    The file is only rewritten when something changed. Returns the stale count.
+    """
+    if not snapshot_path(root=root).exists():
+        return 0
+    now = now or datetime.now(timezone.utc)
+    keep = set(known) if known is not None else None
+    with _locked(root) as snapshot:
+        metrics = snapshot["metrics"]
+        changed = False
+        if keep is not None:
+            for metric_id in [m for m in metrics if m not in keep]:
+                del metrics[metric_id]
+                changed = True
+        n_stale = 0
+        for entry in metrics.values():
+            after = entry.get("stale_after")
+            stale = after is not None and datetime.fromisoformat(after) < now
+            if entry.get("stale") != stale:
+                entry["stale"] = stale
+                changed = True
+            n_stale += stale
+        snapshot["_dirty"] = changed
+    return n_stale
+
+
+def rebuild_snapshot(*, root: Path = ROOT) -> int:
+    """Recreate the snapshot from content/latest/ and the configs."""
+    from tools.runner import _eval_status  # runner imports this module
+
+    entries: Dict[str, Optional[dict]] = {}
+    for path in sorted((root / "content" / "configs").glob("*.json")):
+        metric_id = path.stem
+        point = read_latest_file(metric_id, root=root)
+        if point is None:
+            continue
+        try:
+            config = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            config = {}
+        status = _eval_status(point.get("v"), config.get("alerts", []))
+        entries[metric_id] = make_entry(point, status=status, schedule=config.get("schedule"))
+    with _locked(root) as snapshot:
+        snapshot["metrics"] = entries
+    return len(entries)
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description="Maintain content/status/latest.json.")
+    ap.add_argument("--rebuild", action="store_true", help="Recreate the snapshot from content/latest/.")
+    return ap
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = _build_arg_parser().parse_args(argv)
+    if not args.rebuild:
+        _build_arg_parser().print_help()
+        return 2
+    try:
+        print(f"snapshot: {rebuild_snapshot(root=ROOT)} metrics")
+    except Exception as e:
+        print(f"Error: snapshot rebuild failed: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+tail.py
+
+Bounded "tail" artifact per metric with only its most recent points:
+
+  content/tail/<metric_id>.json   {"metric_id": "...", "size": 30, "points": [...]}
+
+Same shape as content/series/<metric_id>.json, so visuals that only look at
+the last nLatestPoints (number, counter, gauge, ...) can fetch a few
+kilobytes instead of the whole history. The version visual needs the first
+sighting of each version, so the metric page fetches the full series for it.
+
+The runner keeps the tail as a fixed-size ring buffer (deque with maxlen):
+each new point pushes out the oldest. Its size is the visual's nLatestPoints
+(or the frontend's default for that visual), plus the earlier point a
+counter compares against, at least DASH_TAIL_MIN_POINTS.
+A missing tail is seeded once from the series backend.
+
+Import:
+  from tools.tail import update_tail, tail_size
+"""
+import json
+import os
+from collections import deque
+from pathlib import Path
+from typing import Deque, Iterable
+
+from tools.artifacts import publish_json
+from tools.series_store import ROOT, get_backend, read_text
+
+TAIL_MIN_POINTS = int(os.environ.get("DASH_TAIL_MIN_POINTS", "50"))
+TAIL_MAX_POINTS = int(os.environ.get("DASH_TAIL_MAX_POINTS", "1000"))
+
+# Points a visual shows when nLatestPoints is not set (mirrors src/components/Visuals)
+VISUAL_DEFAULT_POINTS = {
+    "number": 30,
+    "counter": 1,
+}
+
+
+def tail_size(config: dict) -> int:
+    """Ring buffer size for a metric config."""
+    visual = (config.get("display") or {}).get("visual") or {}
+    n = visual.get("nLatestPoints", VISUAL_DEFAULT_POINTS.get(visual.get("type"), 1))
+    try:
+        n = int(n)
+    except (TypeError, ValueError):
+        n = 1
+    # a counter's delta is taken against the point nLatestPoints runs back
+    extra = 1 if visual.get("type") == "counter" else 0
+    return min(max(n, TAIL_MIN_POINTS), TAIL_MAX_POINTS) + extra
+
+
+def tail_path(metric_id: str, *, root: Path = ROOT) -> Path:
+    return root / "content" / "tail" / f"{metric_id}.json"
+
+
+def read_tail(metric_id: str, size: int, *, root: Path = ROOT) -> Deque[dict]:
+    """
+    The metric's ring buffer. Seeded from the series backend when no tail
+    file exists yet (streamed; only the last `size` points are kept).
+    """
+    try:
+        points = json.loads(read_text(tail_path(metric_id, root=root))).get("points", [])
+    except FileNotFoundError:
+        points = get_backend(root=root).read_points(metric_id)
+    except Exception:
+        points = []
+    return deque(points, maxlen=size)
+
+
+def update_tail(metric_id: str, points: Iterable[dict], *, size: int, root: Path = ROOT) -> None:
+    ring = read_tail(metric_id, size, root=root)
+    ring.extend(points)
+    publish_json(
+        tail_path(metric_id, root=root),
+        {"metric_id": metric_id, "size": size, "points": list(ring)},
+        root=root,
+    )
@@ -34,6 +34,10 @@ ALLOWED_TOP_KEYS = {
     "alerts",
     "display",
     "notify_whatsapp",
+    "retention",
+    "timeout",
+    "priority",
+    "catchup",
 }
 
 REQUIRED_TOP_KEYS = {
@@ -60,6 +64,11 @@ SCHEDULE_ENUM = {
 ALERT_PRIORITY_ENUM = {"info", "warning", "critical"}
 ALERT_DIRECTION_ENUM = {"above", "below"}
 
+RETENTION_TIER_ENUM = {"raw", "5m", "1h", "1d"}
+CATCHUP_ENUM = {"once", "skip"}
+
+DURATION_RE = re.compile(r"^\d+[hdwy]$")  # "12h", "7d", "4w", "1y"
+
 DISPLAY_ALLOWED_KEYS = {"tile_span", "visual", "charts"}
 VISUAL_TYPE_ENUM = {"gauge", "number", "counter", "state", "version", "text"}
 CHART_ENUM = {"line", "area", "bar", "pie"}
@@ -239,6 +248,32 @@ def validate_top_level(obj: Any, errors: List[str]) -> None:
                     "root.notify_whatsapp: cannot be true without at least one alert with priority 'critical'"
                 )
 
+    # retention
+    if "retention" in obj:
+        retention = obj["retention"]
+        if not isinstance(retention, dict):
+            errors.append("root.retention: must be an object")
+        else:
+            for k, v in retention.items():
+                if k not in RETENTION_TIER_ENUM:
+                    errors.append(f"root.retention: unsupported tier '{k}', must be one of {sorted(RETENTION_TIER_ENUM)}")
+                if not isinstance(v, str) or not DURATION_RE.match(v):
+                    errors.append(f"root.retention.{k}: must be a duration string like '12h', '7d', '4w' or '1y'")
+
+    # timeout
+    if "timeout" in obj:
+        if not is_number(obj["timeout"]) or obj["timeout"] <= 0:
+            errors.append("root.timeout: must be a positive number of seconds")
+
+    # priority
+    if "priority" in obj:
+        if not isinstance(obj["priority"], int) or isinstance(obj["priority"], bool):
+            errors.append("root.priority: must be an integer")
+
+    # catchup
+    if "catchup" in obj and (not isinstance(obj["catchup"], str) or obj["catchup"] not in CATCHUP_ENUM):
+        errors.append(f"root.catchup: must be one of {sorted(CATCHUP_ENUM)}")
+
     # display
     if "display" in obj:
         display = obj["display"]
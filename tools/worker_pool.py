@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+worker_pool.py
+
+Pre-forked runner workers for the scheduler. Each worker is a long-lived
+Python process with tools.runner already imported. For every job it forks a
+child, which runs the runner CLI in its own process group. The child's
+output goes to a pipe; the worker keeps the last output_bytes of it in a
+ring buffer and returns it with the exit code. The fork keeps jobs isolated
+from each other and from the worker, and the per-job exit code stays exact.
+
+Workers talk to the scheduler over pipes, one JSON object per line:
+
+  scheduler -> worker (stdin):   {"argv": ["--metric", "foo_bar_baz"], "output_bytes": 16384}
+  worker -> scheduler (stdout):  {"event": "ready", "pid": 123}
+                                 {"event": "started", "pid": 456}
+                                 {"event": "exit", "pid": 456, "rc": 0, "usage": {"cpu_ms": 120, ...}, "output": "..."}
+                                 {"event": "retire", "reason": "jobs"}
+
+A worker retires (exits after its current job) once it has run
+DASH_SCHED_POOL_MAX_JOBS jobs or its resident memory has grown by more than
+DASH_SCHED_POOL_MAX_RSS_GROWTH_MB since its first job. The pool starts a
+replacement on demand.
+
+Import:
+  from tools.worker_pool import WorkerPool
+  pool = WorkerPool(size=4)   # log_path: where the workers' own stderr goes (default: inherited)
+  job = pool.submit(["--metric", "foo_bar_baz"])   # Popen-like: .pid (once started), .poll(), .returncode (+ .usage, .output)
+  pool.fds()             # worker pipes to wait on; call pool.pump() when one is readable
+  pool.start_deadline()  # when pump() next needs a call to abandon a job that never started
+"""
+import json
+import os
+import select
+import signal
+import subprocess
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tools.run_log import JOB_OUTPUT_BYTES, OutputRing
+from tools.run_resources import usage_from_rusage
+
+ROOT = Path(__file__).resolve().parents[1]
+
+POOL_MAX_JOBS = int(os.environ.get("DASH_SCHED_POOL_MAX_JOBS", "500"))
+POOL_MAX_RSS_GROWTH_MB = float(os.environ.get("DASH_SCHED_POOL_MAX_RSS_GROWTH_MB", "64"))
+# How long a worker may take to confirm the job's child started (see pump())
+POOL_START_TIMEOUT_SECONDS = float(os.environ.get("DASH_SCHED_POOL_START_TIMEOUT_SECONDS", "10"))
+
+# Exit code reported for a job whose worker died before reporting it
+WORKER_LOST_EXIT = -1
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource  # noqa: PLC0415 - fallback only
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+# -----------------------------
+# Worker side
+# -----------------------------
+
+
+def _send(event: dict) -> None:
+    sys.stdout.write(json.dumps(event, separators=(",", ":")) + "\n")
+    sys.stdout.flush()
+
+
+def _run_child(argv: List[str], out: int) -> None:
+    """Body of the per-job fork, with stdout/stderr going to the out pipe; never returns."""
+    rc = 1
+    try:
+        os.setpgid(0, 0)  # own process group, so the whole job can be signalled
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        os.dup2(os.open(os.devnull, os.O_RDONLY), 0)
+        # fd 1 is the worker's protocol pipe: job output must never reach it
+        os.dup2(out, 1)
+        os.dup2(out, 2)
+        os.close(out)
+        sys.stdin = open(0, closefd=False)
+        sys.stdout = open(1, "w", closefd=False)
+        sys.stderr = open(2, "w", closefd=False)
+
+        from tools.runner import main  # noqa: PLC0415 - already imported by the worker
+
+        rc = main(argv)
+    except SystemExit as e:
+        rc = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except BaseException:
+        traceback.print_exc()
+        rc = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(rc if isinstance(rc, int) else 1)
+
+
+def _wait_with_output(pid: int, fd: int, ring: OutputRing):
+    """
+    Read the job's output into ring until it exits; returns wait4()'s
+    (status, rusage). A process the job left behind cannot hold the worker
+    by keeping the pipe open: the child's exit ends the wait.
+    """
+    os.set_blocking(fd, False)
+    try:
+        while True:
+            readable, _, _ = select.select([fd], [], [], 0.5)
+            if readable:
+                try:
+                    chunk = os.read(fd, 65536)
+                except BlockingIOError:
+                    continue
+                if chunk:
+                    ring.feed(chunk)
+                    continue
+                break  # EOF: the child and everything it started closed the pipe
+            wpid, status, rusage = os.wait4(pid, os.WNOHANG)
+            if wpid:
+                try:
+                    while chunk := os.read(fd, 65536):
+                        ring.feed(chunk)
+                except BlockingIOError:
+                    pass
+                return status, rusage
+    finally:
+        os.close(fd)
+    _, status, rusage = os.wait4(pid, 0)
+    return status, rusage
+
+
+def serve() -> int:
+    """Worker main loop: one job per stdin line until EOF or retirement."""
+    import tools.runner  # noqa: F401,PLC0415 - the point of a warm worker
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the scheduler decides when workers stop
+    _send({"event": "ready", "pid": os.getpid()})
+
+    jobs = 0
+    baseline_rss: Optional[int] = None
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+            argv = [str(a) for a in job["argv"]]
+        except Exception as e:
+            print(f"[worker {os.getpid()}] bad job {line!r}: {e}", file=sys.stderr)
+            _send({"event": "exit", "pid": None, "rc": 2})
+            continue
+
+        out_r, out_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(out_r)
+            _run_child(argv, out_w)
+        os.close(out_w)
+        try:
+            os.setpgid(pid, pid)  # also here, so the group exists before "started" is sent
+        except OSError:
+            pass  # the child got there first
+        _send({"event": "started", "pid": pid})
+        ring = OutputRing(int(job.get("output_bytes") or JOB_OUTPUT_BYTES))
+        status, rusage = _wait_with_output(pid, out_r, ring)
+        usage = usage_from_rusage(rusage)  # the job and the processes it waited for
+        _send({
+            "event": "exit",
+            "pid": pid,
+            "rc": os.waitstatus_to_exitcode(status),
+            "usage": usage,
+            "output": ring.text(),
+        })
+
+        jobs += 1
+        rss = _rss_bytes()
+        if baseline_rss is None:
+            baseline_rss = rss
+        if jobs >= POOL_MAX_JOBS:
+            _send({"event": "retire", "reason": "jobs"})
+            return 0
+        if rss - baseline_rss > POOL_MAX_RSS_GROWTH_MB * 1024 * 1024:
+            _send({"event": "retire", "reason": "rss"})
+            return 0
+    return 0
+
+
+# -----------------------------
+# Scheduler side
+# -----------------------------
+
+
+class PoolJob:
+    """Popen-like handle for a job running in a pool worker."""
+
+    def __init__(self, pool: "WorkerPool", worker: "Worker") -> None:
+        self._pool = pool
+        self.worker = worker
+        self.pid: Optional[int] = None
+        self.start_deadline = time.monotonic() + POOL_START_TIMEOUT_SECONDS  # for "started"
+        self.returncode: Optional[int] = None
+        self.usage: Optional[dict] = None  # resource usage (tools.run_resources), once exited
+        self.output: Optional[str] = None  # last output of the run, once exited
+
+    def poll(self) -> Optional[int]:
+        if self.returncode is None:
+            self._pool.pump()
+        return self.returncode
+
+
+class Worker:
+    def __init__(self, log_path: Optional[Path]) -> None:
+        log_f = log_path.open("a", encoding="utf-8") if log_path else None
+        try:
+            self.proc = subprocess.Popen(
+                [sys.executable, "-m", "tools.worker_pool"],
+                cwd=str(ROOT),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=log_f,
+                close_fds=True,
+            )
+        finally:
+            if log_f is not None:
+                log_f.close()
+        self.fd = self.proc.stdout.fileno()
+        os.set_blocking(self.fd, False)
+        self._buf = b""
+        self.job: Optional[PoolJob] = None
+        self.jobs_done = 0
+        self.retiring = False
+        self.dead = False
+
+    @property
+    def pid(self) -> int:
+        return self.proc.pid
+
+    @property
+    def idle(self) -> bool:
+        return self.job is None and not self.retiring and not self.dead
+
+    def send(self, msg: dict) -> None:
+        self.proc.stdin.write((json.dumps(msg, separators=(",", ":")) + "\n").encode("utf-8"))
+        self.proc.stdin.flush()
+
+    def read_events(self) -> List[dict]:
+        """Drain the pipe without blocking; marks the worker dead on EOF."""
+        while True:
+            try:
+                chunk = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            if not chunk:
+                self.dead = True
+                break
+            self._buf += chunk
+        *lines, self._buf = self._buf.split(b"\n")
+        events = []
+        for line in lines:
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+        return events
+
+    def close(self) -> None:
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+
+
+class WorkerPool:
+    def __init__(self, *, size: int, log_path: Optional[Path] = None) -> None:
+        self.size = max(1, size)
+        self.log_path = log_path
+        self.workers: List[Worker] = []
+
+    def fds(self) -> Dict[int, Worker]:
+        """Pipe fd -> worker, for callers that wait on worker events."""
+        return {w.fd: w for w in self.workers if not w.dead}
+
+    def _handle(self, worker: Worker, event: dict) -> None:
+        kind = event.get("event")
+        job = worker.job
+        if kind == "started" and job is not None:
+            job.pid = event.get("pid")
+        elif kind == "exit" and job is not None:
+            job.returncode = event.get("rc")
+            job.usage = event.get("usage")
+            job.output = event.get("output")
+            worker.job = None
+            worker.jobs_done += 1
+        elif kind == "retire":
+            worker.retiring = True
+
+    def pump(self) -> None:
+        """
+        Process all pending worker events and drop finished workers. A job
+        still without "started" after POOL_START_TIMEOUT_SECONDS is abandoned.
+        """
+        now = time.monotonic()
+        for worker in list(self.workers):
+            for event in worker.read_events():
+                self._handle(worker, event)
+            job = worker.job
+            if job is not None and job.pid is None and not worker.dead and now >= job.start_deadline:
+                self._kill(worker)
+            if worker.dead or (worker.retiring and worker.job is None):
+                if worker.job is not None:
+                    # The worker died mid-job; its child may or may not still run.
+                    worker.job.returncode = WORKER_LOST_EXIT
+                    worker.job = None
+                worker.close()
+                worker.proc.wait()
+                worker.proc.stdout.close()
+                self.workers.remove(worker)
+
+    def _idle_worker(self) -> Worker:
+        self.pump()
+        for worker in self.workers:
+            if worker.idle:
+                return worker
+        if len(self.workers) >= self.size:
+            raise RuntimeError(f"all {self.size} pool workers are busy")
+        worker = Worker(self.log_path)
+        self.workers.append(worker)
+        return worker
+
+    @staticmethod
+    def _kill(worker: Worker) -> None:
+        try:
+            worker.proc.kill()
+        except OSError:
+            pass
+        worker.dead = True
+
+    def abandon(self, job: PoolJob) -> None:
+        """
+        Give up on a job whose child never reported starting (no pid to
+        signal): kill its worker, so the job ends with WORKER_LOST_EXIT and
+        the slot is freed. The pool starts a replacement on demand.
+        """
+        if job.worker.job is job and not job.worker.dead:
+            self._kill(job.worker)
+        self.pump()
+
+    def start_deadline(self) -> Optional[float]:
+        """Earliest monotonic time at which pump() abandons a job that has not started."""
+        return min(
+            (w.job.start_deadline for w in self.workers if w.job is not None and w.job.pid is None and not w.dead),
+            default=None,
+        )
+
+    def submit(self, argv: List[str]) -> PoolJob:
+        """
+        Hand `python -m tools.runner <argv>` to an idle worker. Does not wait:
+        the job's pid arrives with the worker's "started" event (pump(), which
+        callers run when the worker's fd is readable). Raises when no worker
+        can take the job.
+        """
+        worker = self._idle_worker()
+        job = PoolJob(self, worker)
+        worker.job = job
+        try:
+            worker.send({"argv": argv, "output_bytes": JOB_OUTPUT_BYTES})
+        except OSError:
+            worker.dead = True
+            self.pump()
+            raise RuntimeError(f"pool worker {worker.pid} is gone")
+        return job
+
+    def close(self) -> None:
+        """Ask every worker to exit once its current job is done."""
+        for worker in self.workers:
+            worker.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(serve())